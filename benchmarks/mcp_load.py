@@ -0,0 +1,609 @@
+#!/usr/bin/env python3
+"""Load test for the MCP server under many concurrent clients.
+
+Starts a local fake Sentry API and drives the MCP server with N simulated
+clients calling view_sentry_issue and export_issues_tool at the same time,
+over STDIO (one server process per client, as when each assistant session
+launches its own, all sharing one OUTPUT_DIR) and over HTTP/SSE (one shared
+server process). Reports throughput, latency percentiles, peak server
+memory and output file collisions: calls answered with the same file name,
+and files whose content no longer matches the response of the call that
+wrote them. Exits non-zero when any budget is exceeded, so it can be used
+as a regression gate:
+
+    python benchmarks/mcp_load.py
+    python benchmarks/mcp_load.py --transport http --clients 50 --calls 10
+    python benchmarks/mcp_load.py --max-p95-ms 3000 --min-throughput 5 --max-collisions 0
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from startup import rpc
+
+TOOLS = ("view_sentry_issue", "export_issues_tool")
+CALL_TIMEOUT = 300
+
+
+def make_issue(i, rng):
+    """Return the issue details of fixture issue i"""
+    return {
+        "id": str(i),
+        "shortId": f"LOAD-{i}",
+        "title": f"ValueError: load test failure {i}",
+        "culprit": f"app.handlers.handler_{i % 7}",
+        "status": "unresolved",
+        "level": "error",
+        "count": str(rng.randint(1, 5000)),
+        "userCount": rng.randint(1, 300),
+        "firstSeen": "2025-01-01T00:00:00Z",
+        "lastSeen": "2025-01-02T00:00:00Z",
+        "permalink": f"https://sentry.example.com/organizations/load/issues/{i}/",
+        "metadata": {"type": "ValueError", "value": f"load test failure {i}"},
+        "stats": {
+            "24h": [[1735689600 + 3600 * h, rng.randint(0, 30)] for h in range(24)],
+            "30d": [[1735689600 + 86400 * d, rng.randint(0, 400)] for d in range(30)],
+        },
+    }
+
+
+def make_event(i, frames):
+    """Return the latest event of fixture issue i, with frames stack frames"""
+    return {
+        "eventID": f"{i:032x}",
+        "groupID": str(i),
+        "dateCreated": "2025-01-02T00:00:00Z",
+        "title": f"ValueError: load test failure {i}",
+        "user": {"id": str(i), "email": f"user{i}@example.com"},
+        "request": {"url": f"https://app.example.com/orders/{i}", "method": "POST", "headers": {"Accept": "*/*"}},
+        "entries": [
+            {"type": "breadcrumbs", "data": {"values": [
+                {"timestamp": "2025-01-02T00:00:00Z", "category": "query", "message": f"SELECT * FROM orders WHERE id = {n}",
+                 "level": "info", "type": "default"}
+                for n in range(20)
+            ]}},
+            {"type": "exception", "data": {"values": [{
+                "type": "ValueError",
+                "value": f"load test failure {i}",
+                "stacktrace": {"frames": [
+                    {"filename": f"app/module_{n % 5}.py", "function": f"step_{n}", "lineNo": 10 + n,
+                     "inApp": n % 2 == 0,
+                     "context": [[8 + n + k, f"    result = step_{n}(value_{k})"] for k in range(5)],
+                     "vars": {"value": f"'{i}-{n}'", "retries": str(n)}}
+                    for n in range(frames)
+                ]},
+            }]}},
+        ],
+        "tags": [{"key": "release", "value": f"app@1.{i % 3}.0"}, {"key": "environment", "value": "production"}],
+        "contexts": {"runtime": {"name": "CPython", "version": "3.12.1"}},
+        "sdk": {"name": "sentry.python", "version": "2.19.0"},
+    }
+
+
+class FakeSentry:
+    """Sentry API stand-in serving fixture issues after a fixed latency"""
+
+    def __init__(self, issues, latency, frames=20, seed=0):
+        rng = random.Random(seed)
+        self.issues = {str(i): json.dumps(make_issue(i, rng)).encode() for i in range(1, issues + 1)}
+        self.events = {str(i): json.dumps(make_event(i, frames)).encode() for i in range(1, issues + 1)}
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body, status=200):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                with fake._lock:
+                    fake.requests += 1
+                time.sleep(fake.latency)
+                match = re.match(r"/api/0/issues/(\d+)/(.*)$", urlsplit(self.path).path)
+                issue_id, rest = match.groups() if match else (None, None)
+                if issue_id not in fake.issues:
+                    self._send(b'{"detail": "Not found"}', 404)
+                elif rest == "":
+                    self._send(fake.issues[issue_id])
+                elif rest == "events/latest/":
+                    self._send(fake.events[issue_id])
+                elif rest == "events/":
+                    self._send(b"[" + fake.events[issue_id] + b"]")
+                else:
+                    self._send(b'{"detail": "Not found"}', 404)
+
+        return Handler
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/0/projects/load/app/issues/"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="fake-sentry", daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def make_home(directory, base_url):
+    """Write an export-sentry-issue configuration for base_url under directory"""
+    config_dir = Path(directory) / ".config" / "export-sentry-issue"
+    config_dir.mkdir(parents=True)
+    config_file = config_dir / "config.json"
+    config_file.write_text(json.dumps({"base_url": base_url, "token": "load-test-token"}))
+    config_file.chmod(0o600)
+
+
+def peak_rss_mb(pid):
+    """Return the peak resident memory of a running process in MB, or None where unavailable"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _initialize(send):
+    send({
+        "jsonrpc": "2.0",
+        "id": 0,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-06-18",
+            "capabilities": {},
+            "clientInfo": {"name": "load-test", "version": "0"},
+        },
+    })
+    send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+
+class StdioClient:
+    """One MCP session over STDIO, with a server process of its own"""
+
+    def __init__(self, env):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "export_sentry_issue_mcp"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            env=env,
+        )
+        self._id = 0
+        _initialize(lambda message: rpc(self.proc, message))
+
+    def call(self, name, arguments):
+        self._id += 1
+        return rpc(self.proc, {
+            "jsonrpc": "2.0",
+            "id": self._id,
+            "method": "tools/call",
+            "params": {"name": name, "arguments": arguments},
+        })
+
+    def peak_rss_mb(self):
+        return peak_rss_mb(self.proc.pid)
+
+    def close(self):
+        self.proc.terminate()
+        self.proc.wait()
+
+
+class SseClient:
+    """One MCP session over HTTP/SSE: requests are POSTed, responses arrive on the event stream"""
+
+    def __init__(self, host, port):
+        self._stream_conn = http.client.HTTPConnection(host, port, timeout=CALL_TIMEOUT)
+        self._stream_conn.request("GET", "/sse", headers={"Accept": "text/event-stream"})
+        self._stream = self._stream_conn.getresponse()
+        event, data = self._next_event()
+        if event != "endpoint":
+            raise RuntimeError(f"Expected the message endpoint, got {event!r}")
+        self._endpoint = data
+        self._post_conn = http.client.HTTPConnection(host, port, timeout=CALL_TIMEOUT)
+        self._id = 0
+        _initialize(self._send)
+
+    def _next_event(self):
+        event, data = "message", []
+        while True:
+            line = self._stream.readline()
+            if not line:
+                raise RuntimeError("MCP server closed the event stream")
+            line = line.decode("utf-8").rstrip("\r\n")
+            if not line:
+                if data:
+                    return event, "\n".join(data)
+                continue
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "event":
+                event = value
+            elif field == "data":
+                data.append(value)
+
+    def _send(self, message):
+        self._post_conn.request("POST", self._endpoint, json.dumps(message),
+                                {"Content-Type": "application/json"})
+        response = self._post_conn.getresponse()
+        response.read()
+        if response.status >= 400:
+            raise RuntimeError(f"POST {self._endpoint} failed with HTTP {response.status}")
+        if "id" not in message:
+            return None
+        while True:
+            event, data = self._next_event()
+            if event == "message":
+                reply = json.loads(data)
+                if reply.get("id") == message["id"]:
+                    return reply
+
+    def call(self, name, arguments):
+        self._id += 1
+        return self._send({
+            "jsonrpc": "2.0",
+            "id": self._id,
+            "method": "tools/call",
+            "params": {"name": name, "arguments": arguments},
+        })
+
+    def close(self):
+        self._post_conn.close()
+        self._stream_conn.close()
+
+
+class HttpServer:
+    """The shared MCP server process in HTTP/SSE mode"""
+
+    def __init__(self, env):
+        self.port = _free_port()
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "export_sentry_issue_mcp", "--http", "--port", str(self.port)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=env,
+        )
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=1).close()
+                break
+            except OSError:
+                if self.proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("MCP HTTP server did not start")
+                time.sleep(0.1)
+
+    def client(self):
+        return SseClient("127.0.0.1", self.port)
+
+    def peak_rss_mb(self):
+        return peak_rss_mb(self.proc.pid)
+
+    def close(self):
+        self.proc.terminate()
+        self.proc.wait()
+
+
+class CallResult:
+    """One tool call: timing, outcome and the output file it reported"""
+
+    __slots__ = ('client', 'tool', 'seconds', 'error', 'file', 'content')
+
+    def __init__(self, client, tool, seconds, error=None, file=None, content=None):
+        self.client = client
+        self.tool = tool
+        self.seconds = seconds
+        self.error = error
+        self.file = file
+        self.content = content
+
+
+def parse_response(response):
+    """Return (error, output file name, exported content) from a tools/call response"""
+    if "error" in response:
+        return response["error"].get("message", "JSON-RPC error"), None, None
+    result = response["result"]
+    text = "".join(item.get("text", "") for item in result.get("content", ()))
+    if result.get("isError") or text.startswith("❌"):
+        return text.splitlines()[0] if text else "tool error", None, None
+    match = re.search(r"^File saved: (.+)$", text, re.MULTILINE)
+    _, _, content = text.partition("=== Issue Content ===\n")
+    return None, match.group(1) if match else None, content
+
+
+def workload(client_number, calls, issues, hot, batch, seed):
+    """Return the (tool, arguments) calls of one simulated client
+
+    Clients alternate between viewing one of the hot issues, as when many
+    sessions look into the same incident, and exporting a batch of issues.
+    """
+    rng = random.Random(seed * 1000 + client_number)
+    plan = []
+    for i in range(calls):
+        if i % 2 == 0:
+            plan.append(("view_sentry_issue", {"issue_url_or_id": str(rng.randint(1, hot))}))
+        else:
+            ids = rng.sample(range(1, issues + 1), min(batch, issues))
+            plan.append(("export_issues_tool", {"issue_ids": ",".join(map(str, ids))}))
+    return plan
+
+
+def run_clients(connect, plans):
+    """Run each plan on its own connected client, all starting together
+
+    Returns (results, wall-clock seconds of the calls, clients).
+    """
+    clients = [None] * len(plans)
+    results = [[] for _ in plans]
+    failures = []
+    ready = threading.Barrier(len(plans) + 1)
+    done = threading.Barrier(len(plans) + 1)
+
+    def session(n):
+        try:
+            clients[n] = connect()
+        except Exception as e:
+            failures.append(e)
+        ready.wait()
+        if clients[n] is not None:
+            for tool, arguments in plans[n]:
+                start = time.perf_counter()
+                try:
+                    error, name, content = parse_response(clients[n].call(tool, arguments))
+                except Exception as e:
+                    error, name, content = str(e) or type(e).__name__, None, None
+                results[n].append(CallResult(n, tool, time.perf_counter() - start, error, name, content))
+        done.wait()
+
+    threads = [threading.Thread(target=session, args=(n,), daemon=True) for n in range(len(plans))]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    if failures:
+        raise RuntimeError(f"{len(failures)} client(s) could not connect: {failures[0]}")
+    start = time.perf_counter()
+    done.wait()
+    return [result for client_results in results for result in client_results], time.perf_counter() - start, clients
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of values"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def check_outputs(results, output_dir):
+    """Return (colliding calls, clobbered files)
+
+    Calls collide when another call reported the same output file name. A
+    file is clobbered when its content no longer matches the response of a
+    call that wrote it.
+    """
+    names = Counter(result.file for result in results if result.file)
+    colliding = sum(count for count in names.values() if count > 1)
+    clobbered = set()
+    for result in results:
+        if not result.file:
+            continue
+        path = Path(output_dir) / result.file
+        try:
+            on_disk = path.read_text(encoding="utf-8")
+        except OSError:
+            clobbered.add(result.file)
+            continue
+        if on_disk != result.content:
+            clobbered.add(result.file)
+    return colliding, len(clobbered)
+
+
+def run_transport(transport, fake, args):
+    """Load one transport; return its report as a dict"""
+    with tempfile.TemporaryDirectory() as home, tempfile.TemporaryDirectory() as output_dir:
+        make_home(home, fake.base_url)
+        env = dict(os.environ, HOME=home, OUTPUT_DIR=output_dir)
+        env.pop("SENTRY_TOKEN", None)
+        plans = [workload(n, args.calls, args.issues, args.hot, args.batch, args.seed) for n in range(args.clients)]
+        requests_before = fake.requests
+
+        server = None
+        if transport == "http":
+            server = HttpServer(env)
+            connect = server.client
+        else:
+            connect = lambda: StdioClient(env)  # noqa: E731
+
+        try:
+            results, elapsed, clients = run_clients(connect, plans)
+            if server is not None:
+                rss = [server.peak_rss_mb()]
+            else:
+                rss = [client.peak_rss_mb() for client in clients if client is not None]
+        finally:
+            for client in clients if 'clients' in locals() else ():
+                if client is not None:
+                    client.close()
+            if server is not None:
+                server.close()
+
+        colliding, clobbered = check_outputs(results, output_dir)
+        latencies = defaultdict(list)
+        for result in results:
+            latencies["all"].append(result.seconds)
+            latencies[result.tool].append(result.seconds)
+        errors = [result for result in results if result.error]
+        rss = [value for value in rss if value is not None]
+        return {
+            "transport": transport,
+            "clients": args.clients,
+            "calls": len(results),
+            "errors": len(errors),
+            "first_error": errors[0].error if errors else None,
+            "seconds": elapsed,
+            "throughput": len(results) / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": {
+                name: {
+                    "p50": percentile(values, 0.50) * 1000,
+                    "p90": percentile(values, 0.90) * 1000,
+                    "p95": percentile(values, 0.95) * 1000,
+                    "p99": percentile(values, 0.99) * 1000,
+                    "max": max(values) * 1000,
+                }
+                for name, values in latencies.items()
+            },
+            "peak_rss_mb": max(rss) if rss else None,
+            "total_rss_mb": sum(rss) if rss else None,
+            "sentry_requests": fake.requests - requests_before,
+            "colliding_calls": colliding,
+            "clobbered_files": clobbered,
+        }
+
+
+def print_report(report):
+    processes = "1 shared server" if report["transport"] == "http" else f"{report['clients']} servers"
+    print(f"=== {report['transport']}: {report['clients']} clients, {processes} ===")
+    print(f"  Calls: {report['calls']} in {report['seconds']:.2f}s ({report['throughput']:.1f} calls/s), "
+          f"{report['errors']} failed")
+    if report["first_error"]:
+        print(f"    first error: {report['first_error']}")
+    for name, stats in report["latency_ms"].items():
+        print(f"  Latency {name}: p50 {stats['p50']:.0f}ms  p90 {stats['p90']:.0f}ms  "
+              f"p95 {stats['p95']:.0f}ms  p99 {stats['p99']:.0f}ms  max {stats['max']:.0f}ms")
+    if report["peak_rss_mb"] is None:
+        print("  Peak server memory: n/a")
+    elif report["transport"] == "http":
+        print(f"  Peak server memory: {report['peak_rss_mb']:.1f}MB")
+    else:
+        print(f"  Peak server memory: {report['peak_rss_mb']:.1f}MB per process, "
+              f"{report['total_rss_mb']:.1f}MB in total")
+    print(f"  Sentry requests: {report['sentry_requests']}")
+    print(f"  Output file collisions: {report['colliding_calls']} call(s) shared a file name, "
+          f"{report['clobbered_files']} file(s) overwritten by another call")
+
+
+def check_budgets(report, args):
+    """Return the budgets a transport's report exceeds"""
+    failures = []
+    name = report["transport"]
+    p95_ms = report["latency_ms"].get("all", {}).get("p95", 0.0)
+    if report["errors"] > args.max_errors:
+        failures.append(f"{name}: {report['errors']} failed calls (budget {args.max_errors})")
+    if args.max_p95_ms is not None and p95_ms > args.max_p95_ms:
+        failures.append(f"{name}: p95 latency {p95_ms:.0f}ms (budget {args.max_p95_ms:.0f}ms)")
+    if args.min_throughput is not None and report["throughput"] < args.min_throughput:
+        failures.append(f"{name}: {report['throughput']:.1f} calls/s (budget {args.min_throughput:.1f})")
+    if args.max_rss_mb is not None and (report["peak_rss_mb"] or 0) > args.max_rss_mb:
+        failures.append(f"{name}: peak server memory {report['peak_rss_mb']:.1f}MB (budget {args.max_rss_mb:.0f}MB)")
+    collisions = report["colliding_calls"] + report["clobbered_files"]
+    if args.max_collisions is not None and collisions > args.max_collisions:
+        failures.append(f"{name}: {report['colliding_calls']} colliding calls, {report['clobbered_files']} "
+                        f"overwritten files (budget {args.max_collisions})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the export-sentry-issue MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=("stdio", "http", "both"),
+        default="both",
+        help="MCP transport to load (default: both)"
+    )
+    parser.add_argument("--clients", type=int, default=10, help="Concurrent clients (default: 10)")
+    parser.add_argument("--calls", type=int, default=4, help="Tool calls per client (default: 4)")
+    parser.add_argument("--issues", type=int, default=50, help="Issues served by the fake Sentry (default: 50)")
+    parser.add_argument(
+        "--hot",
+        type=int,
+        default=3,
+        help="Issues that view_sentry_issue calls pick from, shared by all clients (default: 3)"
+    )
+    parser.add_argument("--batch", type=int, default=5, help="Issues per export_issues_tool call (default: 5)")
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=50.0,
+        help="Response time of the fake Sentry API (default: 50)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the workload and fixtures (default: 0)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the reports as JSON to PATH")
+    parser.add_argument("--max-errors", type=int, default=0, help="Maximum failed calls (default: 0)")
+    parser.add_argument("--max-p95-ms", type=float, help="Maximum p95 latency of all calls (default: no limit)")
+    parser.add_argument("--min-throughput", type=float, help="Minimum calls per second (default: no limit)")
+    parser.add_argument("--max-rss-mb", type=float, help="Maximum peak memory of a server process (default: no limit)")
+    parser.add_argument(
+        "--max-collisions",
+        type=int,
+        help="Maximum colliding calls plus overwritten files (default: no limit)"
+    )
+    args = parser.parse_args()
+
+    fake = FakeSentry(args.issues, args.latency_ms / 1000, seed=args.seed)
+    fake.start()
+    reports = []
+    failures = []
+    try:
+        for transport in (("stdio", "http") if args.transport == "both" else (args.transport,)):
+            report = run_transport(transport, fake, args)
+            print_report(report)
+            reports.append(report)
+            failures.extend(check_budgets(report, args))
+    finally:
+        fake.stop()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+
+    if failures:
+        print("\nBudget exceeded:")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        sys.exit(1)
+
+    print("\n✓ All load budgets met")
+
+
+if __name__ == "__main__":
+    main()
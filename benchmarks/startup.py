@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Startup benchmark for the CLI and MCP server.
+
+Measures module import cost with `python -X importtime`, checks that heavy
+modules are not imported by the lightweight entry points, and times the
+first tool response of the MCP server over STDIO. Exits non-zero when any
+budget is exceeded, so it can be used as a regression gate:
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --import-budget-ms 150 --first-response-budget-ms 3000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Entry point module -> modules it must not import at startup
+ENTRY_POINTS = {
+    "export_sentry_issue.__main__": ["requests", "export_sentry_issue.core"],
+    "export_sentry_issue_mcp.__main__": ["fastmcp", "pydantic", "requests", "export_sentry_issue.core"],
+}
+
+
+def _importtime(code):
+    """Run code with -X importtime and return [(depth, cumulative_us, name), ...]"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        # One leading space for top-level imports, two more per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, int(cumulative_us), name.strip()))
+    return entries
+
+
+def measure_imports(module):
+    """Return (total_us, [(cumulative_us, name), ...]) for importing module
+
+    Modules already loaded by a bare interpreter start (site, encodings, any
+    .pth hooks) are excluded, so only the cost of the import itself counts.
+    """
+    baseline = {name for _, _, name in _importtime("pass")}
+    package = module.split(".")[0]
+    total_us = 0
+    modules = []
+    for depth, cumulative_us, name in _importtime(f"import {module}"):
+        if name in baseline:
+            continue
+        modules.append((cumulative_us, name))
+        # Top-level imports of the package carry the cost of their children
+        if depth == 0 and name.split(".")[0] == package:
+            total_us += cumulative_us
+    return total_us, modules
+
+
+def rpc(proc, message):
+    """Send a JSON-RPC message over STDIO and return the response, if any"""
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+    if "id" not in message:
+        return None
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("MCP server exited before responding")
+        response = json.loads(line)
+        if response.get("id") == message["id"]:
+            return response
+
+
+def measure_first_response(tool_name="list_config"):
+    """Return seconds from process start to the first tool call response"""
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home)
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "export_sentry_issue_mcp"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            env=env,
+        )
+        try:
+            rpc(proc, {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2025-06-18",
+                    "capabilities": {},
+                    "clientInfo": {"name": "startup-benchmark", "version": "0"},
+                },
+            })
+            rpc(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+            response = rpc(proc, {
+                "jsonrpc": "2.0",
+                "id": 2,
+                "method": "tools/call",
+                "params": {"name": tool_name, "arguments": {}},
+            })
+            elapsed = time.perf_counter() - start
+        finally:
+            proc.terminate()
+            proc.wait()
+    if "error" in response:
+        raise RuntimeError(f"Tool call failed: {response['error']}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup benchmark for export-sentry-issue")
+    parser.add_argument(
+        "--import-budget-ms",
+        type=float,
+        default=100.0,
+        help="Maximum import time of the CLI entry point (default: 100)"
+    )
+    parser.add_argument(
+        "--first-response-budget-ms",
+        type=float,
+        default=5000.0,
+        help="Maximum time to the first MCP tool response (default: 5000)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of slowest imports to show per entry point (default: 10)"
+    )
+    parser.add_argument(
+        "--skip-mcp",
+        action="store_true",
+        help="Skip the MCP server measurements"
+    )
+    args = parser.parse_args()
+
+    failures = []
+
+    for module, forbidden in ENTRY_POINTS.items():
+        if args.skip_mcp and module.startswith("export_sentry_issue_mcp"):
+            continue
+        total_us, modules = measure_imports(module)
+        imported = {name for _, name in modules}
+        print(f"=== {module}: {total_us / 1000:.1f}ms ===")
+        for cumulative_us, name in sorted(modules, reverse=True)[:args.top]:
+            print(f"  {cumulative_us / 1000:8.1f}ms  {name}")
+
+        for name in forbidden:
+            if name in imported:
+                failures.append(f"{module} imports {name} at startup")
+        if module == "export_sentry_issue.__main__" and total_us / 1000 > args.import_budget_ms:
+            failures.append(f"{module} import took {total_us / 1000:.1f}ms (budget {args.import_budget_ms:.0f}ms)")
+
+    if not args.skip_mcp:
+        elapsed_ms = measure_first_response() * 1000
+        print(f"=== MCP first tool response: {elapsed_ms:.1f}ms ===")
+        if elapsed_ms > args.first_response_budget_ms:
+            failures.append(f"First MCP tool response took {elapsed_ms:.1f}ms (budget {args.first_response_budget_ms:.0f}ms)")
+
+    if failures:
+        print("\nBudget exceeded:")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        sys.exit(1)
+
+    print("\n✓ All startup budgets met")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Keep the project's top issues rendered in memory for instant answers
+
+Enabled by setting PREFETCH_ISSUES to the number of issues to keep. A
+background thread lists the configured project's unresolved issues every
+PREFETCH_INTERVAL seconds and fetches and renders the latest event of each
+top issue that is new or has had new events. At most PREFETCH_BUDGET
+Sentry API requests are made per hour. PREFETCH_SORT picks the top
+issues ("date": most recently seen, "freq": most events) and
+PREFETCH_PROFILE the configuration profile.
+
+requests and the export_sentry_issue core modules are only imported by
+the background thread, so enabling prefetching does not slow down startup.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from export_sentry_issue import get_profile, read_config
+
+DEFAULT_INTERVAL = 300
+DEFAULT_BUDGET = 120
+DEFAULT_SORT = "date"
+QUERY = "is:unresolved"
+
+# Nothing is served once polls have failed for this many intervals
+MAX_AGE_INTERVALS = 2
+
+
+class RequestBudget:
+    """Allow at most limit requests in any window of seconds"""
+
+    def __init__(self, limit: int, window: float = 3600):
+        self.limit = limit
+        self.window = window
+        self._times: deque[float] = deque()
+
+    def take(self) -> bool:
+        """Use up one request, or return False if the budget is spent"""
+        now = time.monotonic()
+        while self._times and now - self._times[0] >= self.window:
+            self._times.popleft()
+        if len(self._times) >= self.limit:
+            return False
+        self._times.append(now)
+        return True
+
+
+class PrefetchedIssue:
+    """A rendered issue, valid while its last seen time is unchanged"""
+
+    __slots__ = ('text', 'issue', 'event', 'last_seen')
+
+    def __init__(self, text, issue, event, last_seen):
+        self.text = text
+        self.issue = issue
+        self.event = event
+        self.last_seen = last_seen
+
+
+class Prefetcher:
+    """Poll the project's top issues and keep them rendered
+
+    The issues list provides each issue's details, so an issue costs one
+    request for its latest event, and only when it is new to the top
+    issues or has been seen again since it was rendered.
+    """
+
+    def __init__(self, count: int, interval: float = DEFAULT_INTERVAL, budget: int = DEFAULT_BUDGET,
+                 sort: str = DEFAULT_SORT, profile: str | None = None):
+        self.count = count
+        self.interval = interval
+        self.budget = RequestBudget(budget)
+        self.sort = sort
+        self.profile = profile
+        self.base_url = None
+        self.entries: dict[str, PrefetchedIssue] = {}
+        self.polled = None
+        self.requests = 0
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _credentials(self):
+        """Return the configured (base_url, token), or None if not configured yet"""
+        data, insecure = read_config()
+        config = get_profile(data, self.profile) if data and not insecure else None
+        base_url = (config or {}).get('base_url')
+        token = (config or {}).get('token') or os.environ.get('SENTRY_TOKEN')
+        if not base_url or not token:
+            return None
+        return base_url, token
+
+    def _take(self) -> bool:
+        if not self.budget.take():
+            return False
+        self.requests += 1
+        return True
+
+    def refresh(self):
+        """Poll the issues list once and render the top issues that changed"""
+        from export_sentry_issue import (
+            fetch_latest_event,
+            format_issue_to_text,
+            get_project_issues,
+            get_scrubber,
+            get_session,
+            parse_base_url,
+            parse_event,
+            parse_issue,
+        )
+
+        credentials = self._credentials()
+        if credentials is None:
+            return
+        base_url, token = credentials
+        base_api_url = parse_base_url(base_url)
+        session = get_session(self.profile)
+        previous = self.entries if base_url == self.base_url else {}
+
+        top = []
+        cursor = None
+        while len(top) < self.count:
+            if not self._take():
+                return
+            issues, cursor, _ = get_project_issues(base_url, token, cursor, QUERY, session=session,
+                                                   sort=self.sort)
+            top.extend(issues or ())
+            if not cursor:
+                break
+
+        scrubber = get_scrubber()
+        entries: dict[str, PrefetchedIssue] = {}
+        for data in top[:self.count]:
+            issue_id = str(data.get('id'))
+            entry = previous.get(issue_id)
+            if entry is None or entry.last_seen != data.get('lastSeen'):
+                # Out of budget: changed issues wait for a later poll
+                if not self._take():
+                    continue
+                try:
+                    # Neither a hedged nor a fallback request: each issue costs exactly one request
+                    event = fetch_latest_event(base_api_url, token, issue_id, session, fallback=False)
+                except Exception as e:
+                    self.last_error = e
+                    continue
+                issue = parse_issue(data)
+                event = parse_event(event)
+                text = format_issue_to_text(issue, event, scrubber=scrubber)
+                entry = PrefetchedIssue(text, issue, event, data.get('lastSeen'))
+            entries[issue_id] = entry
+
+        self.entries = entries
+        self.polled = time.monotonic()
+        self.base_url = base_url
+
+    def get(self, base_url: str, issue_id: str) -> PrefetchedIssue | None:
+        """Return the rendered issue if it is prefetched from base_url and current"""
+        if base_url != self.base_url or time.monotonic() - self.polled > self.interval * MAX_AGE_INTERVALS:
+            return None
+        return self.entries.get(str(issue_id))
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.last_error = None
+                self.refresh()
+            except Exception as e:
+                # Keep serving what is cached; entries expire if polls keep failing
+                self.last_error = e
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sentry-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+_prefetcher = None
+
+
+def start_prefetch(environ=os.environ) -> Prefetcher | None:
+    """Start prefetching as configured by the PREFETCH_* environment variables
+
+    Returns the running Prefetcher, or None when PREFETCH_ISSUES is unset.
+    """
+    global _prefetcher
+    count = int(environ.get('PREFETCH_ISSUES') or 0)
+    if count <= 0:
+        return None
+    _prefetcher = Prefetcher(
+        count,
+        interval=float(environ.get('PREFETCH_INTERVAL') or DEFAULT_INTERVAL),
+        budget=int(environ.get('PREFETCH_BUDGET') or DEFAULT_BUDGET),
+        sort=environ.get('PREFETCH_SORT') or DEFAULT_SORT,
+        profile=environ.get('PREFETCH_PROFILE') or None,
+    )
+    _prefetcher.start()
+    return _prefetcher
+
+
+def get_prefetched(base_url: str, issue_id: str) -> PrefetchedIssue | None:
+    """Return the prefetched rendering of an issue, if prefetching has it"""
+    if _prefetcher is None:
+        return None
+    return _prefetcher.get(base_url, issue_id)
@@ -0,0 +1,714 @@
+"""MCP tool definitions for the Export Sentry Issue MCP Server
+
+Imported by __main__ only when the server actually starts. requests and the
+export_sentry_issue core modules are loaded on the first tool call that
+needs them, so the initial handshake does not wait for them.
+"""
+
+import os
+import re
+from datetime import datetime
+from typing import TYPE_CHECKING, Annotated, Literal
+
+from fastmcp import FastMCP
+from pydantic import Field
+
+# Config helpers are lightweight; the core API is imported lazily below
+from export_sentry_issue import (
+    CONFIG_FILE,
+    DEFAULT_PROFILE,
+    FETCH_PROFILES,
+    REQUEST_TIMEOUT,
+    SNIPPET_MODES,
+    read_config,
+    get_profile,
+    list_profiles,
+    load_profiles,
+    save_config,
+    delete_config,
+    parse_issue_urls,
+    route_issue_urls,
+)
+from export_sentry_issue.cluster import DEFAULT_THRESHOLD as CLUSTER_THRESHOLD
+
+from .prefetch import get_prefetched
+
+if TYPE_CHECKING:
+    from export_sentry_issue import ExportResult
+
+# Initialize FastMCP server
+mcp = FastMCP("Export Sentry Issue MCP Server")
+
+
+def load_config_safe(profile: str | None = None):
+    """Load config with MCP-specific error handling for insecure permissions
+
+    Uses the in-memory config cache, so repeated tool calls only stat the file.
+    """
+    data, insecure = read_config()
+    if data is None:
+        return None
+
+    # Check file permissions
+    if insecure:
+        return {
+            "error": "Config file has insecure permissions",
+            "suggestion": f"Run: chmod 600 {CONFIG_FILE}"
+        }
+
+    config = get_profile(data, profile)
+    if config is None and profile:
+        return {
+            "error": f"Profile '{profile}' not found",
+            "suggestion": f"Available profiles: {', '.join(list_profiles()) or 'none'}"
+        }
+    return config
+
+
+def _resolve_output_path(path: str) -> str:
+    """Resolve a relative path against the output directory (Docker volume)"""
+    output_dir = os.environ.get('OUTPUT_DIR', '/app')
+    if not os.path.isabs(path):
+        return os.path.join(output_dir, path)
+    return path
+
+
+def _exported(issue_id: str, text: str | None, issue, event=None) -> "ExportResult":
+    """Return an "exported" ExportResult for an issue rendered outside iter_export"""
+    from export_sentry_issue import ExportResult
+
+    result = ExportResult(issue_id)
+    result.text = text
+    result.issue = issue
+    result.event = event
+    return result
+
+
+def _export_issue_group(base_url: str, token: str, profile: str | None, issues: list[tuple[int, str]], debug_mode: bool, archive_dir: str | None = None, cluster_threshold: float | None = None, fetch: str = "full", snippets: str = "all", deadline: float | None = None, facets=None, stats: bool = False) -> dict[int, "ExportResult"]:
+    """Fetch and render one group of issues through the profile's session
+
+    Returns {position: ExportResult} for every issue in the group, as
+    exported by iter_export. With cluster_threshold, near-duplicate issues
+    are rendered once; folded members are exported without text. With the
+    default options, issues kept rendered by prefetching are answered from
+    memory; not with stats, since prefetched issues lack the 30-day event
+    series the trends need. With facets, a TagFacets, the tag distributions
+    of the exported issues are fetched and merged into it.
+    """
+    from collections import defaultdict, deque
+    from export_sentry_issue import ExportResult, get_session, iter_export
+
+    results: dict[int, ExportResult] = {}
+    if not (debug_mode or archive_dir) and cluster_threshold is None and fetch == "full" and snippets == "all" and facets is None and not stats:
+        for position, issue_id in issues:
+            prefetched = get_prefetched(base_url, issue_id)
+            if prefetched is not None:
+                results[position] = _exported(issue_id, prefetched.text, prefetched.issue, prefetched.event)
+        issues = [(position, issue_id) for position, issue_id in issues if position not in results]
+        if not issues:
+            return results
+
+    if cluster_threshold is not None:
+        # iter_export clusters each issue once, however often it is listed
+        first: dict[str, int] = {}
+        for position, issue_id in issues:
+            first.setdefault(issue_id, position)
+        issues = [(position, issue_id) for issue_id, position in first.items()]
+
+    positions: defaultdict[str, deque[int]] = defaultdict(deque)
+    for position, issue_id in issues:
+        positions[issue_id].append(position)
+
+    exported = iter_export(
+        base_url, token, [issue_id for _, issue_id in issues], get_session(profile), debug_mode, archive_dir,
+        cluster_threshold, fetch=fetch, snippets=snippets, deadline=deadline, tags=facets is not None,
+    )
+    for result in exported:
+        issue_id = result.issue_id
+        results[positions[issue_id].popleft()] = result
+        if result.status == "exported" and facets is not None:
+            for tagged_id, tags in (result.tags or {}).items():
+                facets.add(tagged_id, tags)
+
+        for member in result.similar or ():
+            member_id = str(member.id)
+            if result.status == "unfinished":
+                # Not exported either, since it was folded into this issue
+                member_result = ExportResult(member_id, "unfinished")
+            else:
+                member_result = _exported(member_id, None, member)
+            results[positions[member_id].popleft()] = member_result
+
+    return results
+
+
+def _write_results(results: dict[int, "ExportResult"], output_file: str | None = None, stats: bool = False, facets=None) -> dict:
+    """Write {position: ExportResult} to the output file in position order
+
+    Exported issues without text are issues folded into a cluster; they are
+    counted as exported but not written. Failed issues are written as an
+    error line, and unfinished ones (not exported before the deadline) are
+    listed at the end. When
+    SEARCH_INDEX is set, exported issues are also added to that search index.
+    With stats, the exported issues ranked by event trends follow the last
+    issue, and with facets (a TagFacets) the tag facet summary.
+    """
+    if not output_file:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file = f"sentry_issues_{timestamp}.txt"
+
+    # Get output directory from environment (for Docker volume mapping)
+    output_dir = os.environ.get('OUTPUT_DIR', '/app')
+    container_output_file = _resolve_output_path(output_file)
+
+    success_count = 0
+    failed_count = 0
+    folded_count = 0
+    unfinished = []
+    exported = []
+
+    # Map container path to host path for Docker volumes
+    host_output_dir = os.environ.get('HOST_OUTPUT_DIR')
+    if host_output_dir and output_dir:
+        # Replace container path prefix with host path prefix
+        final_path = container_output_file.replace(output_dir, host_output_dir, 1)
+    else:
+        final_path = os.path.abspath(container_output_file)
+
+    index = None
+    index_path = os.environ.get('SEARCH_INDEX')
+    if index_path:
+        from export_sentry_issue import SearchIndex, get_scrubber
+        index = SearchIndex(index_path, get_scrubber())
+
+    with open(container_output_file, "w", encoding="utf-8") as f:
+        for position in sorted(results):
+            result = results[position]
+            if result.status == "unfinished":
+                unfinished.append(result.issue_id)
+            elif result.status == "exported":
+                if result.text is None:
+                    folded_count += 1
+                else:
+                    f.write(result.text)
+                    f.write("\n\n" + "="*80 + "\n\n")
+                success_count += 1
+                if index:
+                    index.add_issue(result.issue, result.event, final_path)
+                if stats:
+                    exported.append(result.issue)
+            else:
+                f.write(f"\nError: Error processing Issue {result.issue_id}: {str(result.error)}\n\n")
+                failed_count += 1
+        if exported:
+            from export_sentry_issue.trends import compute_trends, format_trends_section
+            f.write("\n" + format_trends_section(compute_trends(exported)) + "\n")
+        if facets:
+            from export_sentry_issue import format_facets, get_scrubber
+            f.write("\n" + format_facets(facets, scrubber=get_scrubber()) + "\n")
+        if unfinished:
+            f.write(f"\nUnfinished (deadline reached): {', '.join(unfinished)}\n")
+
+    if index:
+        index.close()
+
+    return {
+        "success": success_count,
+        "failed": failed_count,
+        "folded": folded_count,
+        "unfinished": unfinished,
+        "output_file": final_path
+    }
+
+
+def export_routed_issues_impl(groups: list[tuple[str, str, str | None, list[tuple[int, str]]]], output_file: str | None = None, debug_mode: bool = False, failures: dict[int, "ExportResult"] | None = None, archive_dir: str | None = None, cluster_threshold: float | None = None, fetch: str = "full", snippets: str = "all", deadline: float | None = None, stats: bool = False, tags: bool = False) -> dict:
+    """Export issues from one or more Sentry instances to a single file
+
+    groups holds (base_url, token, profile, [(position, issue_id), ...]) per
+    instance. Groups are fetched concurrently, each through its profile's own
+    session (connection pool), and issues are written in position order.
+    failures maps positions of issues that could not be fetched at all to a
+    failed ExportResult. Clustering, when enabled, happens within each instance.
+    With deadline, the export stops after that many seconds and returns
+    the issues finished by then; the rest are listed as unfinished.
+    With stats, a table ranking the issues by event trends is appended,
+    and with tags a summary of the issues' tag distributions.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from export_sentry_issue import ExportResult, TagFacets
+
+    if archive_dir:
+        archive_dir = _resolve_output_path(archive_dir)
+
+    # Each group merges tags into its own TagFacets; they are combined below
+    group_facets = [TagFacets() if tags else None for _ in groups]
+    results: dict[int, ExportResult] = dict(failures or {})
+    if len(groups) == 1:
+        results.update(_export_issue_group(*groups[0], debug_mode, archive_dir, cluster_threshold, fetch, snippets, deadline, group_facets[0], stats))
+    elif groups:
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [executor.submit(_export_issue_group, *group, debug_mode, archive_dir, cluster_threshold, fetch, snippets, deadline, facets, stats) for group, facets in zip(groups, group_facets)]
+            for future in futures:
+                results.update(future.result())
+
+    facets = None
+    if tags:
+        facets = TagFacets()
+        for merged in group_facets:
+            facets.merge(merged)
+    return _write_results(results, output_file, stats, facets)
+
+
+def replay_archive_impl(archive_path: str, issue_ids: list[str] | None = None, output_file: str | None = None, debug_mode: bool = False) -> dict:
+    """Re-render archived issues to a single file without any HTTP calls"""
+    from export_sentry_issue import (
+        ExportResult,
+        list_archive,
+        load_archive_record,
+        format_issue_to_text,
+        get_scrubber,
+        parse_issue,
+        parse_event,
+    )
+
+    records = list_archive(_resolve_output_path(archive_path))
+    scrubber = get_scrubber()
+    results: dict[int, ExportResult] = {}
+
+    for position, issue_id in enumerate(issue_ids or records):
+        try:
+            if issue_id not in records:
+                raise ValueError(f"Issue {issue_id} not found in archive {archive_path}")
+            issue_detail, latest_event = load_archive_record(records[issue_id])
+            issue = parse_issue(issue_detail)
+            event = parse_event(latest_event)
+            issue_detail = latest_event = None
+            results[position] = _exported(issue_id, format_issue_to_text(issue, event, debug_mode, scrubber=scrubber), issue, event)
+        except Exception as e:
+            results[position] = ExportResult(issue_id, "failed", e)
+
+    return _write_results(results, output_file)
+
+
+def export_issues_impl(base_url: str, token: str, issue_ids: list[str], output_file: str | None = None, debug_mode: bool = False, profile: str | None = None, archive_dir: str | None = None, cluster_threshold: float | None = None, fetch: str = "full", snippets: str = "all", deadline: float | None = None, stats: bool = False, tags: bool = False) -> dict:
+    """Export specified issues to a single file"""
+    groups = [(base_url, token, profile, list(enumerate(issue_ids)))]
+    return export_routed_issues_impl(groups, output_file, debug_mode, archive_dir=archive_dir, cluster_threshold=cluster_threshold, fetch=fetch, snippets=snippets, deadline=deadline, stats=stats, tags=tags)
+
+
+def _format_export_result(result: dict) -> str:
+    """Build the tool response from an export result and its output file"""
+    # Read the file content to return to user
+    with open(result['output_file'], 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Return complete content with summary
+    output_msg = f"✅ Export completed!\n"
+    output_msg += f"Success: {result['success']}\n"
+    output_msg += f"Failed: {result['failed']}\n"
+    if result.get('folded'):
+        output_msg += f"Folded into similar issues: {result['folded']}\n"
+    if result.get('unfinished'):
+        output_msg += f"Unfinished (deadline reached): {len(result['unfinished'])} — {', '.join(result['unfinished'])}\n"
+    output_msg += f"File saved: {os.path.basename(result['output_file'])}\n\n"
+    output_msg += "=== Issue Content ===\n"
+    output_msg += content
+
+    return output_msg
+
+
+# MCP Tools
+@mcp.tool()
+def initialize_config(
+    base_url: Annotated[str, Field(description="Sentry API base URL (e.g., https://sentry.io/api/0/projects/{org}/{project}/issues/)")],
+    token: Annotated[str, Field(description="Sentry Auth Token")],
+    profile: Annotated[str | None, Field(description="Save as a named profile (optional, e.g. 'prod'); defaults to the default profile")] = None
+) -> str:
+    """Initialize and save Sentry configuration to ~/.config/export-sentry-issue/config.json
+
+    This tool securely stores your Sentry credentials for future use.
+    The configuration file is created with secure permissions (600 - owner read/write only).
+    """
+    import requests
+
+    try:
+        # Verify token by making a test API call
+        headers = {"Authorization": f"Bearer {token}"}
+        response = requests.get(base_url, headers=headers, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code == 401:
+            return "❌ Error: Invalid token (401 Unauthorized)"
+        elif response.status_code == 403:
+            return "❌ Error: Token lacks required permissions (403 Forbidden). Ensure 'event:read' permission is enabled."
+
+        response.raise_for_status()
+
+        # Save configuration
+        save_config(base_url, token, profile)
+
+        return f"✅ Configuration saved successfully to: {CONFIG_FILE} (profile: {profile or DEFAULT_PROFILE})\nFile permissions: 600 (owner read/write only)"
+
+    except requests.exceptions.RequestException as e:
+        return f"⚠️ Warning: Token verification failed: {e}\nConfiguration was NOT saved."
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
+
+
+def _do_export_issues(
+    issue_ids: str,
+    base_url: str | None = None,
+    token: str | None = None,
+    output_file: str | None = None,
+    debug: bool = False,
+    profile: str | None = None,
+    archive_dir: str | None = None,
+    cluster: bool = False,
+    fetch: str = "full",
+    snippets: str = "all",
+    deadline: float | None = None,
+    stats: bool = False,
+    tags: bool = False
+) -> str:
+    """Internal function to handle the actual export logic."""
+    try:
+        # Get token from environment or config if not provided
+        actual_token = token
+        actual_base_url = base_url
+
+        if profile:
+            # An explicitly selected profile takes precedence over SENTRY_TOKEN
+            config = load_config_safe(profile)
+            if not config:
+                return f"❌ No configuration found at {CONFIG_FILE}\nUse 'initialize_config' tool to set up your credentials."
+            if "error" in config:
+                return f"❌ {config['error']}\n{config['suggestion']}"
+            actual_token = actual_token or config.get('token')
+            actual_base_url = actual_base_url or config.get('base_url')
+
+        if not actual_token:
+            actual_token = os.environ.get('SENTRY_TOKEN')
+
+        if not actual_token or not actual_base_url:
+            config = load_config_safe()
+            if config:
+                if "error" in config:
+                    return f"❌ {config['error']}\n{config['suggestion']}"
+
+                if not actual_token:
+                    actual_token = config.get('token')
+                if not actual_base_url:
+                    actual_base_url = config.get('base_url')
+
+        if not actual_token:
+            return "❌ Error: No token provided.\nPlease either:\n  1. Use 'initialize_config' tool to save your token\n  2. Provide 'token' parameter\n  3. Set SENTRY_TOKEN environment variable"
+
+        if not actual_base_url:
+            return "❌ Error: No base URL provided.\nPlease either:\n  1. Use 'initialize_config' tool to save your configuration\n  2. Provide 'base_url' parameter"
+
+        # Parse issue IDs
+        ids_list = [id.strip() for id in issue_ids.split(',') if id.strip()]
+
+        if not ids_list:
+            return "❌ Error: No valid Issue IDs provided"
+
+        if fetch not in FETCH_PROFILES:
+            return f"❌ Error: Unknown fetch profile '{fetch}' (choose from {', '.join(FETCH_PROFILES)})"
+        if snippets not in SNIPPET_MODES:
+            return f"❌ Error: Unknown snippets mode '{snippets}' (choose from {', '.join(SNIPPET_MODES)})"
+        if deadline is not None and deadline <= 0:
+            return "❌ Error: deadline must be a positive number of seconds"
+
+        # Export issues
+        cluster_threshold = CLUSTER_THRESHOLD if cluster else None
+        result = export_issues_impl(actual_base_url, actual_token, ids_list, output_file, debug, profile, archive_dir, cluster_threshold, fetch, snippets, deadline, stats, tags)
+        return _format_export_result(result)
+
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
+
+
+def _do_export_routed(
+    urls: list[tuple[str, str, str]],
+    routed: dict[str, list[int]],
+    unrouted: list[int],
+    output_file: str | None = None,
+    debug: bool = False
+) -> str:
+    """Export issue URLs grouped by profile, one concurrent fetch group per instance"""
+    from export_sentry_issue import ExportResult
+
+    profiles = load_profiles()
+    groups: list[tuple[str, str, str | None, list[tuple[int, str]]]] = []
+    for name, indexes in routed.items():
+        settings = profiles[name]
+        if name == DEFAULT_PROFILE:
+            # As for an export without a profile, SENTRY_TOKEN comes first
+            token = os.environ.get('SENTRY_TOKEN') or settings.get('token', '')
+        else:
+            token = settings.get('token') or os.environ.get('SENTRY_TOKEN', '')
+        groups.append((settings['base_url'], token, name, [(i, urls[i][2]) for i in indexes]))
+
+    failures = {
+        i: ExportResult(urls[i][2], "failed", ValueError(f"No configured profile for {urls[i][0]} (org: {urls[i][1]})"))
+        for i in unrouted
+    }
+
+    result = export_routed_issues_impl(groups, output_file, debug, failures)
+    return _format_export_result(result)
+
+
+@mcp.tool()
+def view_sentry_issue(
+    issue_url_or_id: Annotated[str, Field(description="Sentry issue URL(s) or ID(s). Supports: single ID '12345', multiple IDs '12345, 67890, 11111', single URL, or multiple URLs separated by commas or spaces")],
+    output_file: Annotated[str | None, Field(description="Output file name (optional, defaults to sentry_issue(s)_TIMESTAMP.txt)")] = None,
+    debug: Annotated[bool, Field(description="Enable debug mode to save raw JSON files")] = False,
+    profile: Annotated[str | None, Field(description="Named configuration profile to use (optional, defaults to the default profile)")] = None
+) -> str:
+    """View and export Sentry issue(s) with complete error details.
+
+    **Use this tool when the user mentions:**
+    - "Check/view/show Sentry issue #123" or "Sentry issue 123"
+    - "Check issues #123, #456, #789" or "issues 123, 456, 789"
+    - A Sentry URL like "https://sentry.io/organizations/org/issues/123/"
+    - Multiple URLs: "https://sentry.io/.../issues/123/ https://sentry.io/.../issues/456/"
+    - "What's the error in issue 123?"
+    - "Show me the details of these Sentry errors: [URLs or IDs]"
+
+    This tool automatically extracts issue information and exports the complete error report(s)
+    including stack traces, breadcrumbs, spans, request info, and context data to a readable text file.
+    URLs are routed to the configured profile for their Sentry host and organization, so one
+    request may mix SaaS and self-hosted URLs.
+    """
+    try:
+        # Find all Sentry issue URLs in the input, with their host and org
+        urls = parse_issue_urls(issue_url_or_id)
+
+        # Extract issue IDs from URLs
+        issue_ids = []
+        base_url = None
+        routed = None
+
+        if urls:
+            # We have URLs - extract IDs from them
+            for domain, org, issue_id in urls:
+                issue_ids.append(issue_id)
+
+            if profile:
+                # An explicit profile serves every URL
+                config = load_config_safe(profile)
+                if config and not isinstance(config.get('error'), str):
+                    base_url = config.get('base_url')
+                else:
+                    return f"❌ Cannot extract project info from URL. Please run 'initialize_config' first or provide the full issue ID with configured base_url."
+            else:
+                config = load_config_safe()
+                if config and isinstance(config.get('error'), str):
+                    return f"❌ {config['error']}\n{config['suggestion']}"
+
+                # Send each URL to the profile configured for its host and org
+                routed, unrouted = route_issue_urls(urls, load_profiles(), DEFAULT_PROFILE)
+                if not routed:
+                    hosts = ', '.join(sorted({f"{urls[i][0]} (org: {urls[i][1]})" for i in unrouted}))
+                    return f"❌ Cannot extract project info from URL. No configured profile matches: {hosts}\nPlease run 'initialize_config' (with a 'profile' name for additional Sentry instances), or pass 'profile' to choose one explicitly."
+        else:
+            # No URLs found, treat as comma/space separated IDs
+            # Split by common separators: comma, space, newline, #
+            raw_ids = re.split(r'[,\s#]+', issue_url_or_id.strip())
+            # Extract only digits from each part
+            for raw_id in raw_ids:
+                extracted = re.sub(r'[^\d]', '', raw_id)
+                if extracted:
+                    issue_ids.append(extracted)
+
+        if not issue_ids:
+            return "❌ No valid issue IDs or URLs found"
+
+        # Generate output filename if not provided
+        if not output_file:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if len(issue_ids) == 1:
+                output_file = f"sentry_issue_{issue_ids[0]}_{timestamp}.txt"
+            else:
+                output_file = f"sentry_issues_{timestamp}.txt"
+
+        if routed is not None:
+            return _do_export_routed(urls, routed, unrouted, output_file, debug)
+
+        # Call internal export function
+        return _do_export_issues(
+            issue_ids=','.join(issue_ids),
+            base_url=base_url,
+            token=None,
+            output_file=output_file,
+            debug=debug,
+            profile=profile
+        )
+
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
+
+
+@mcp.tool()
+def export_issues_tool(
+    issue_ids: Annotated[str, Field(description="Comma-separated Issue IDs to export (e.g., '12345,67890,11111')")],
+    base_url: Annotated[str | None, Field(description="Sentry API base URL (optional if already configured)")] = None,
+    token: Annotated[str | None, Field(description="Sentry Auth Token (optional if already configured)")] = None,
+    output_file: Annotated[str | None, Field(description="Output file name (optional, defaults to sentry_issues_TIMESTAMP.txt)")] = None,
+    debug: Annotated[bool, Field(description="Enable debug mode to save raw JSON files")] = False,
+    profile: Annotated[str | None, Field(description="Named configuration profile to use (optional, defaults to the default profile)")] = None,
+    archive_dir: Annotated[str | None, Field(description="Directory to also save raw issue/event JSON into, for later use with replay_archive (optional)")] = None,
+    cluster: Annotated[bool, Field(description="Group near-duplicate issues and render each group once, listing the similar issues")] = False,
+    fetch: Annotated[Literal["header", "exception", "full"], Field(description="Event data to download per issue: 'header' (issue details only, no event request), 'exception' (exceptions and stack frames only) or 'full'")] = "full",
+    snippets: Annotated[Literal["all", "dedupe", "in-app"], Field(description="Source code around stack frames: 'all', 'dedupe' (each snippet printed once per file, referenced afterwards) or 'in-app' (deduplicated, application frames only)")] = "all",
+    deadline: Annotated[float | None, Field(description="Stop after this many seconds and return the issues exported so far; the rest are listed as unfinished (optional)")] = None,
+    stats: Annotated[bool, Field(description="Append a table ranking the issues by event trends: events in the last 24h, hourly rate, spikes in the last hour and week-over-week change")] = False,
+    tags: Annotated[bool, Field(description="Also fetch each issue's tag distributions and append a summary of the top releases, browsers, servers, etc. across all the issues (one extra request per issue)")] = False
+) -> str:
+    """Export multiple Sentry issues to a plain text file (batch export).
+
+    **Use this tool when the user wants to:**
+    - Export multiple issues at once (e.g., "Export issues 123, 456, 789")
+    - Batch download several error reports
+
+    This tool exports complete error messages, stack traces, breadcrumbs, and context data
+    for the specified Sentry issues. If base_url and token are not provided, it will use
+    the saved configuration from ~/.config/export-sentry-issue/config.json.
+    With cluster, issues that are really the same bug are exported once, which keeps
+    large batches short. fetch="header" or "exception" downloads and renders
+    less per issue, for quick triage of many issues, and snippets="dedupe"
+    keeps framework code repeated across issues from filling the file.
+    With deadline, a slow Sentry instance cannot hold up the answer: the
+    issues exported in time are returned and the rest listed as unfinished.
+    With stats, the issues are also ranked by event trends, which helps pick
+    which of many issues to look at first (fetch="header" makes that cheap).
+    With tags, a summary shows which releases, browsers or servers the
+    issues' events come from, rather than only the latest event's tags.
+    """
+    return _do_export_issues(issue_ids, base_url, token, output_file, debug, profile, archive_dir, cluster, fetch, snippets, deadline, stats, tags)
+
+
+@mcp.tool()
+def replay_archive(
+    archive_path: Annotated[str, Field(description="Archive directory (from archive_dir) or a single record/debug JSON file; relative paths are resolved against the output directory")],
+    issue_ids: Annotated[str | None, Field(description="Comma-separated Issue IDs to re-render (optional, defaults to every archived issue)")] = None,
+    output_file: Annotated[str | None, Field(description="Output file name (optional, defaults to sentry_issues_TIMESTAMP.txt)")] = None,
+    debug: Annotated[bool, Field(description="Show available fields and missing sections in the output")] = False
+) -> str:
+    """Re-render previously archived Sentry issues offline (no Sentry API calls).
+
+    **Use this tool when the user wants to:**
+    - Re-render or re-check issues that were exported earlier with an archive
+    - Inspect saved debug_issue_*.json files without network access
+
+    Archives are created by export_issues_tool with archive_dir, or by the CLI with --archive.
+    """
+    try:
+        ids_list = [id.strip() for id in (issue_ids or '').split(',') if id.strip()]
+        result = replay_archive_impl(archive_path, ids_list or None, output_file, debug)
+        return _format_export_result(result)
+
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
+
+
+@mcp.tool()
+def search_issues(
+    query: Annotated[str, Field(description="Words to look for in issue titles, exception messages, stack frames, breadcrumbs and tags")],
+    limit: Annotated[int, Field(description="Maximum number of results")] = 20,
+    raw: Annotated[bool, Field(description="Treat the query as SQLite FTS5 syntax, e.g. 'frames:views AND tags:prod'")] = False
+) -> str:
+    """Search previously exported Sentry issues (local index, no Sentry API calls).
+
+    **Use this tool when the user asks:**
+    - "Have we seen this error before?" or "Find issues mentioning X"
+    - Which exported issue contains a given exception, function or tag
+
+    Only issues exported while the SEARCH_INDEX environment variable was set are searchable.
+    Each result includes the file it was exported to.
+    """
+    from export_sentry_issue import INDEX_FILE, SearchIndex, format_search_results
+
+    try:
+        index_path = os.environ.get('SEARCH_INDEX') or INDEX_FILE
+        if not os.path.exists(index_path):
+            return f"❌ No search index found at {index_path}\nSet the SEARCH_INDEX environment variable so exports are indexed."
+
+        with SearchIndex(index_path) as index:
+            results = index.search(query, limit=limit, raw=raw)
+        return format_search_results(results)
+
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
+
+
+@mcp.tool()
+def list_config() -> str:
+    """Display the current saved Sentry configuration
+
+    Shows the configured base URL and a masked version of the token for
+    every profile. Returns an error if no configuration is found.
+    """
+    try:
+        config = load_config_safe()
+
+        if config is None and not list_profiles():
+            return f"❌ No configuration found at {CONFIG_FILE}\nUse 'initialize_config' tool to set up your credentials."
+
+        if config and "error" in config:
+            return f"❌ {config['error']}\n{config['suggestion']}"
+
+        output = f"Configuration file: {CONFIG_FILE}"
+        for name in list_profiles():
+            profile_config = load_config_safe(name)
+            token = profile_config.get('token', '')
+            masked_token = f"{token[:20]}..." if len(token) > 20 else "***"
+
+            output += f"\n\nProfile: {name}\n"
+            output += f"Base URL: {profile_config.get('base_url', 'N/A')}\n"
+            output += f"Token: {masked_token}"
+
+        return output
+
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
+
+
+@mcp.tool()
+def revoke_config(
+    profile: Annotated[str | None, Field(description="Only delete this named profile (optional, defaults to deleting the whole configuration)")] = None
+) -> str:
+    """Delete the saved Sentry configuration
+
+    Removes the configuration file from ~/.config/export-sentry-issue/config.json,
+    or only the given profile from it.
+    Note: You must manually revoke the token from Sentry:
+      1. Go to: Settings → Account → API → Auth Tokens
+      2. Find and delete the token
+    """
+    try:
+        config = load_config_safe(profile)
+
+        if not config:
+            return f"❌ No configuration found at {CONFIG_FILE}\nNothing to revoke."
+
+        if profile and "error" in config:
+            return f"❌ {config['error']}\n{config['suggestion']}"
+
+        if "error" not in config:
+            token = config.get('token', '')
+            masked_token = f"{token[:20]}..." if len(token) > 20 else "***"
+
+        if delete_config(profile):
+            if profile:
+                output = f"✅ Profile '{profile}' deleted from: {CONFIG_FILE}\n\n"
+            else:
+                output = f"✅ Configuration deleted from: {CONFIG_FILE}\n\n"
+            output += "⚠️ IMPORTANT: Please manually revoke the token from Sentry:\n"
+            output += "  1. Go to: Settings → Account → API → Auth Tokens\n"
+            output += "  2. Find and delete the token"
+            return output
+        else:
+            return "❌ Error: Could not delete configuration file"
+
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
@@ -1,46 +1,278 @@
 """Export Sentry issues to plain text files."""
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .config import (
     CONFIG_DIR,
     CONFIG_FILE,
+    INDEX_FILE,
+    DEFAULT_PROFILE,
+    FETCH_PROFILES,
+    SNIPPET_MODES,
+    REQUEST_TIMEOUT,
     parse_base_url,
     ensure_config_dir,
+    read_config,
+    get_profile,
+    list_profiles,
+    load_profiles,
     save_config,
     load_config,
     delete_config,
 )
 
-from .core import (
-    get_issue_details,
-    get_latest_event,
-    get_issue_events,
-    save_debug_json,
-    format_issue_to_text,
-    get_api_tokens,
-    revoke_token,
-    export_issues,
+from .routing import (
+    parse_issue_urls,
+    profile_location,
+    route_issue_urls,
 )
 
 from .__about__ import __version__
 
+# Modules that pull in requests or a JSON backend are imported on first use,
+# so commands like `init --help` start without loading them
+_LAZY_ATTRS = {
+    # Core
+    "get_session": ".core",
+    "get_issue_details": ".core",
+    "get_latest_event": ".core",
+    "get_issue_events": ".core",
+    "get_issue_tags": ".core",
+    "save_debug_json": ".core",
+    "format_issue_to_text": ".core",
+    "get_api_tokens": ".core",
+    "revoke_token": ".core",
+    "fetch_latest_event": ".core",
+    "fetch_event": ".core",
+    "fetch_issue": ".core",
+    "request_timeout": ".core",
+    "deadline_reached": ".core",
+    "get_exception_summary": ".core",
+    "get_project_issues": ".core",
+    "plan_clusters": ".core",
+    "export_issues": ".core",
+    "iter_export": ".core",
+    "export_issues_from_archive": ".core",
+    # Archive
+    "save_archive_record": ".archive",
+    "load_archive_record": ".archive",
+    "list_archive": ".archive",
+    # Search
+    "DEFAULT_INDEX_FILE": ".search",
+    "SearchIndex": ".search",
+    "format_search_results": ".search",
+    # Clustering
+    "cluster_issues": ".cluster",
+    "issue_features": ".cluster",
+    # Scrubbing
+    "Scrubber": ".scrub",
+    "get_scrubber": ".scrub",
+    # Snippets
+    "SnippetStore": ".snippets",
+    "get_snippet_store": ".snippets",
+    # Pipeline
+    "Pipeline": ".pipeline",
+    "Progress": ".pipeline",
+    "Stage": ".pipeline",
+    "issue_stages": ".pipeline",
+    "DeadlineExceeded": ".pipeline",
+    "ExportResult": ".pipeline",
+    # Watching
+    "IssueWatcher": ".watch",
+    "watch_issues": ".watch",
+    # Trends
+    "STATS_BACKEND": ".trends",
+    "Trend": ".trends",
+    "compute_trends": ".trends",
+    "rank_trends": ".trends",
+    "format_trend_table": ".trends",
+    # Tag facets
+    "TagFacets": ".facets",
+    "format_facets": ".facets",
+    # Decoding
+    "JSON_BACKEND": ".decoding",
+    "Issue": ".models",
+    "Event": ".models",
+    "parse_issue": ".models",
+    "parse_event": ".models",
+}
+
+if TYPE_CHECKING:
+    from .core import (
+        get_session,
+        get_issue_details,
+        get_latest_event,
+        get_issue_events,
+        get_issue_tags,
+        save_debug_json,
+        format_issue_to_text,
+        get_api_tokens,
+        revoke_token,
+        fetch_latest_event,
+        fetch_event,
+        fetch_issue,
+        request_timeout,
+        deadline_reached,
+        get_exception_summary,
+        get_project_issues,
+        plan_clusters,
+        export_issues,
+        iter_export,
+        export_issues_from_archive,
+    )
+    from .archive import (
+        save_archive_record,
+        load_archive_record,
+        list_archive,
+    )
+    from .search import (
+        DEFAULT_INDEX_FILE,
+        SearchIndex,
+        format_search_results,
+    )
+    from .cluster import (
+        cluster_issues,
+        issue_features,
+    )
+    from .scrub import (
+        Scrubber,
+        get_scrubber,
+    )
+    from .snippets import (
+        SnippetStore,
+        get_snippet_store,
+    )
+    from .pipeline import (
+        Pipeline,
+        Progress,
+        Stage,
+        issue_stages,
+        DeadlineExceeded,
+        ExportResult,
+    )
+    from .watch import (
+        IssueWatcher,
+        watch_issues,
+    )
+    from .trends import (
+        STATS_BACKEND,
+        Trend,
+        compute_trends,
+        rank_trends,
+        format_trend_table,
+    )
+    from .facets import (
+        TagFacets,
+        format_facets,
+    )
+    from .decoding import JSON_BACKEND
+    from .models import (
+        Issue,
+        Event,
+        parse_issue,
+        parse_event,
+    )
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
 __all__ = [
     # Version
     "__version__",
     # Config
     "CONFIG_DIR",
     "CONFIG_FILE",
+    "INDEX_FILE",
+    "DEFAULT_PROFILE",
+    "FETCH_PROFILES",
+    "SNIPPET_MODES",
+    "REQUEST_TIMEOUT",
     "parse_base_url",
     "ensure_config_dir",
+    "read_config",
+    "get_profile",
+    "list_profiles",
+    "load_profiles",
     "save_config",
     "load_config",
     "delete_config",
     # Core
+    "get_session",
     "get_issue_details",
     "get_latest_event",
     "get_issue_events",
+    "get_issue_tags",
     "save_debug_json",
     "format_issue_to_text",
     "get_api_tokens",
     "revoke_token",
+    "fetch_latest_event",
+    "fetch_event",
+    "fetch_issue",
+    "request_timeout",
+    "deadline_reached",
+    "get_exception_summary",
+    "get_project_issues",
+    "plan_clusters",
     "export_issues",
+    "iter_export",
+    "export_issues_from_archive",
+    # Archive
+    "save_archive_record",
+    "load_archive_record",
+    "list_archive",
+    # Search
+    "DEFAULT_INDEX_FILE",
+    "SearchIndex",
+    "format_search_results",
+    # Clustering
+    "cluster_issues",
+    "issue_features",
+    # Scrubbing
+    "Scrubber",
+    "get_scrubber",
+    # Snippets
+    "SnippetStore",
+    "get_snippet_store",
+    # Pipeline
+    "Pipeline",
+    "Progress",
+    "Stage",
+    "issue_stages",
+    "DeadlineExceeded",
+    "ExportResult",
+    # Watching
+    "IssueWatcher",
+    "watch_issues",
+    # Trends
+    "STATS_BACKEND",
+    "Trend",
+    "compute_trends",
+    "rank_trends",
+    "format_trend_table",
+    # Tag facets
+    "TagFacets",
+    "format_facets",
+    # Decoding
+    "JSON_BACKEND",
+    "Issue",
+    "Event",
+    "parse_issue",
+    "parse_event",
+    # Routing
+    "parse_issue_urls",
+    "profile_location",
+    "route_issue_urls",
 ]
@@ -6,25 +6,36 @@ import getpass
 import os
 import sys
 
-import requests
-
 from .config import (
     CONFIG_FILE,
+    DEFAULT_PROFILE,
+    FETCH_PROFILES,
+    SNIPPET_MODES,
+    INDEX_FILE,
+    REQUEST_TIMEOUT,
     parse_base_url,
+    get_profile,
+    read_config,
     save_config,
     load_config,
     delete_config,
 )
-from .core import export_issues, revoke_token
+
+# requests and .core are imported inside the commands that need them,
+# which keeps `--help`, `init` prompts and argument errors fast
 
 
 def cmd_init(args):
     """Initialize configuration by prompting for credentials"""
+    import requests
+
     print("=== Sentry Issue Export Tool - Initialization ===\n")
+    profile = args.profile or DEFAULT_PROFILE
 
-    # Check if config already exists
-    if CONFIG_FILE.exists():
-        print(f"⚠️  Configuration already exists at: {CONFIG_FILE}")
+    # Check if config (or the requested profile) already exists
+    data, _ = read_config()
+    if data is not None and get_profile(data, profile):
+        print(f"⚠️  Configuration for profile '{profile}' already exists at: {CONFIG_FILE}")
         response = input("Do you want to overwrite it? (yes/no): ").strip().lower()
         if response not in ['yes', 'y']:
             print("Initialization cancelled.")
@@ -62,7 +73,7 @@ def cmd_init(args):
         # This is what the script will actually use, so it's the best validation
         headers = {"Authorization": f"Bearer {token}"}
         # Try to list issues (this requires event:read permission)
-        response = requests.get(base_url, headers=headers)
+        response = requests.get(base_url, headers=headers, timeout=REQUEST_TIMEOUT)
 
         # Check for authentication/permission errors
         if response.status_code == 401:
@@ -81,24 +92,34 @@ def cmd_init(args):
             sys.exit(1)
 
     # Save configuration
-    save_config(base_url, token)
-    print(f"\n✓ Configuration saved to: {CONFIG_FILE}")
+    save_config(base_url, token, profile)
+    print(f"\n✓ Configuration saved to: {CONFIG_FILE} (profile: {profile})")
     print(f"  File permissions: 600 (owner read/write only)")
     print("\nYou can now use the export command without specifying --token:")
-    print(f"  export-sentry-issue export --ids \"12345,67890\"")
+    if profile == DEFAULT_PROFILE:
+        print(f"  export-sentry-issue export --ids \"12345,67890\"")
+    else:
+        print(f"  export-sentry-issue export --profile {profile} --ids \"12345,67890\"")
 
 
 def cmd_revoke(args):
     """Revoke token and delete configuration"""
+    from .core import revoke_token
+
     print("=== Revoke Sentry Token ===\n")
 
-    config = load_config()
+    config = load_config(args.profile)
     if not config:
-        print(f"Error: No configuration found at {CONFIG_FILE}")
+        if args.profile:
+            print(f"Error: No profile '{args.profile}' found in {CONFIG_FILE}")
+        else:
+            print(f"Error: No configuration found at {CONFIG_FILE}")
         print("Nothing to revoke.")
         sys.exit(1)
 
     print(f"Configuration file: {CONFIG_FILE}")
+    if args.profile:
+        print(f"Profile: {args.profile}")
     print(f"Base URL: {config.get('base_url', 'N/A')}")
     print(f"Token: {config.get('token', '')[:20]}..." if config.get('token') else "Token: N/A")
 
@@ -114,9 +135,12 @@ def cmd_revoke(args):
     except Exception as e:
         print(f"Warning: Could not revoke token via API: {e}")
 
-    # Delete config file
-    if delete_config():
-        print(f"\n✓ Configuration deleted from: {CONFIG_FILE}")
+    # Delete config file (or only the selected profile)
+    if delete_config(args.profile):
+        if args.profile:
+            print(f"\n✓ Profile '{args.profile}' deleted from: {CONFIG_FILE}")
+        else:
+            print(f"\n✓ Configuration deleted from: {CONFIG_FILE}")
         print("\nIMPORTANT: Please manually revoke the token from Sentry:")
         print("  1. Go to: Settings → Account → API → Auth Tokens")
         print("  2. Find and delete the token")
@@ -124,11 +148,39 @@ def cmd_revoke(args):
         print("Error: Could not delete configuration file")
 
 
-def cmd_export(args):
-    """Export issues (original functionality)"""
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600}
+
+
+def _parse_duration(value):
+    """argparse type for durations such as 90, 60s, 2m or 1h (returns seconds)"""
+    text = value.strip().lower()
+    scale = _DURATION_UNITS.get(text[-1:], None)
+    if scale is not None:
+        text = text[:-1]
+    try:
+        seconds = float(text) * (scale or 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid duration: {value!r} (e.g. 90, 60s, 2m, 1h)")
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f"duration must be positive: {value!r}")
+    return seconds
+
+
+def _resolve_credentials(args):
+    """Return the token and fill in args.base_url from args, environment or config"""
     # Get token from args, environment, or config file
     token = args.token
 
+    if args.profile:
+        # An explicitly selected profile takes precedence over SENTRY_TOKEN
+        config = load_config(args.profile)
+        if not config:
+            print(f"Error: No profile '{args.profile}' found in {CONFIG_FILE}")
+            sys.exit(1)
+        token = token or config.get('token')
+        if not args.base_url:
+            args.base_url = config.get('base_url')
+
     if not token:
         token = os.environ.get('SENTRY_TOKEN')
 
@@ -155,6 +207,48 @@ def cmd_export(args):
         print("  2. Use --base-url parameter")
         sys.exit(1)
 
+    return token
+
+
+def cmd_export(args):
+    """Export issues (original functionality)"""
+    from .core import export_issues, export_issues_from_archive, get_session
+    from .cluster import DEFAULT_THRESHOLD
+
+    if args.resume and not (args.output or args.output_dir):
+        print("Error: --resume requires the --output file or --output-dir of the interrupted export")
+        sys.exit(1)
+    if args.resume and args.output:
+        from .checkpoint import journal_path
+        if os.path.exists(args.output) and not os.path.exists(journal_path(args.output)):
+            print(f"Error: {args.output} exists but has no checkpoint journal, so there is nothing to resume; "
+                  "--resume would overwrite it")
+            sys.exit(1)
+
+    # --cluster without a value uses the default threshold
+    cluster_threshold = DEFAULT_THRESHOLD if args.cluster is True else args.cluster
+
+    if args.from_archive and args.tags:
+        print("Error: --tags fetches tag distributions from Sentry and cannot be used with --from-archive")
+        sys.exit(1)
+
+    if args.from_archive:
+        # Offline replay: no token, base URL or network access needed
+        issue_ids = [id.strip() for id in (args.ids or '').split(',') if id.strip()]
+        print(f"Re-rendering issues from archive: {args.from_archive}")
+        export_issues_from_archive(args.from_archive, issue_ids or None, args.output, args.debug,
+                                   index_path=args.index, cluster_threshold=cluster_threshold,
+                                   resume=args.resume, output_dir=args.output_dir,
+                                   scrub=args.scrub, fetch=args.fetch,
+                                   snippets=args.snippets, stats=args.stats)
+        return
+
+    if not args.ids:
+        print("Error: --ids is required (unless --from-archive is used)")
+        sys.exit(1)
+
+    token = _resolve_credentials(args)
+
     issue_ids = [id.strip() for id in args.ids.split(',') if id.strip()]
 
     if not issue_ids:
@@ -165,7 +259,46 @@ def cmd_export(args):
     if args.debug:
         print("🔍 Debug mode enabled")
 
-    export_issues(args.base_url, token, issue_ids, args.output, args.debug)
+    export_issues(args.base_url, token, issue_ids, args.output, args.debug,
+                  session=get_session(args.profile), archive_dir=args.archive,
+                  index_path=args.index, cluster_threshold=cluster_threshold, resume=args.resume,
+                  output_dir=args.output_dir, scrub=args.scrub, fetch=args.fetch,
+                  snippets=args.snippets, deadline=args.deadline, stats=args.stats, tags=args.tags)
+
+
+def cmd_watch(args):
+    """Stream new and regressed issues to a rolling output file"""
+    from .watch import watch_issues
+    from .core import get_session
+
+    token = _resolve_credentials(args)
+    if args.max_interval < args.interval:
+        args.max_interval = args.interval
+
+    watch_issues(args.base_url, token, args.output, query=args.query, interval=args.interval,
+                 max_interval=args.max_interval, max_bytes=args.max_bytes,
+                 session=get_session(args.profile), scrub=args.scrub,
+                 fetch=args.fetch)
+
+
+def cmd_search(args):
+    """Search the local index of exported issues"""
+    from .search import SearchIndex, format_search_results
+
+    if not os.path.exists(args.index):
+        print(f"Error: No search index found at {args.index}")
+        print("Export issues with --index first, e.g.:")
+        print("  export-sentry-issue export --ids \"12345,67890\" --index")
+        sys.exit(1)
+
+    with SearchIndex(args.index) as index:
+        try:
+            results = index.search(args.query, limit=args.limit, raw=args.raw)
+        except Exception as e:
+            print(f"Error: Invalid search query: {e}")
+            sys.exit(1)
+
+    print(format_search_results(results))
 
 
 def main():
@@ -180,9 +313,48 @@ Examples:
   # Export issues (using saved configuration)
   export-sentry-issue export --ids "12345,67890"
 
+  # Export issues using a named profile
+  export-sentry-issue init --profile prod
+  export-sentry-issue export --profile prod --ids "12345,67890"
+
   # Export issues (with explicit token)
   export-sentry-issue export --base-url "https://sentry.example.com/api/0/projects/my-org/my-project/issues/" --ids "12345,67890" --token "your_token"
 
+  # Archive raw JSON while exporting, then re-render offline later
+  export-sentry-issue export --ids "12345,67890" --archive ./sentry-archive
+  export-sentry-issue export --from-archive ./sentry-archive --output rerendered.txt
+
+  # Continue an interrupted export where it stopped
+  export-sentry-issue export --ids "12345,67890,11111" --output issues.txt --resume
+
+  # Write one file per issue plus manifest.json
+  export-sentry-issue export --ids "12345,67890,11111" --output-dir ./issues
+
+  # Quick triage: issue details and exceptions only
+  export-sentry-issue export --ids "12345,67890,11111" --fetch exception
+
+  # Print each code snippet once per file instead of in every issue
+  export-sentry-issue export --ids "12345,67890,11111" --snippets dedupe
+
+  # Stop after one minute, keeping the issues exported by then
+  export-sentry-issue export --ids "12345,67890,11111" --output issues.txt --deadline 60s
+
+  # Rank the exported issues by event rate, spikes and week-over-week change
+  export-sentry-issue export --ids "12345,67890,11111" --fetch header --stats
+
+  # Summarize the releases, browsers, servers, ... a batch of issues is spread over
+  export-sentry-issue export --ids "12345,67890,11111" --fetch header --tags
+
+  # Render near-duplicate issues once, with a list of similar issues
+  export-sentry-issue export --ids "12345,67890,11111" --cluster
+
+  # Stream new and regressed issues to a file as they appear
+  export-sentry-issue watch --output incidents.txt
+
+  # Index exported issues, then search them
+  export-sentry-issue export --ids "12345,67890" --index
+  export-sentry-issue search "orders_table timeout"
+
   # Revoke token and delete configuration
   export-sentry-issue revoke
         '''
@@ -193,6 +365,10 @@ Examples:
 
     # Init command
     parser_init = subparsers.add_parser('init', help='Initialize configuration')
+    parser_init.add_argument(
+        '--profile',
+        help='Save the configuration as a named profile (default: top-level default profile)'
+    )
     parser_init.set_defaults(func=cmd_init)
 
     # Export command
@@ -201,28 +377,196 @@ Examples:
         '--base-url',
         help='Sentry API base URL (optional if already configured)'
     )
+    parser_export.add_argument(
+        '--profile',
+        help='Use a named configuration profile (see init --profile)'
+    )
     parser_export.add_argument(
         '--ids',
-        required=True,
-        help='Issue IDs to export, comma-separated, e.g.: 12345,67890,11111'
+        help='Issue IDs to export, comma-separated, e.g.: 12345,67890,11111 '
+             '(optional with --from-archive, default: all archived issues)'
     )
     parser_export.add_argument(
         '--token',
         help='Sentry Auth Token (optional if already configured)'
     )
-    parser_export.add_argument(
+    output_group = parser_export.add_mutually_exclusive_group()
+    output_group.add_argument(
         '--output',
         help='Output file name (optional, default: sentry_issues_TIMESTAMP.txt)'
     )
+    output_group.add_argument(
+        '--output-dir',
+        metavar='DIR',
+        help='Write each issue to its own file in DIR, with a manifest.json of sizes and checksums'
+    )
     parser_export.add_argument(
         '--debug',
         action='store_true',
         help='Enable debug mode, shows available fields and saves raw JSON'
     )
+    parser_export.add_argument(
+        '--archive',
+        metavar='DIR',
+        help='Also save the raw issue and event JSON to DIR for offline re-rendering'
+    )
+    parser_export.add_argument(
+        '--from-archive',
+        metavar='PATH',
+        help='Re-render issues from an archive directory or file without network access'
+    )
+    parser_export.add_argument(
+        '--index',
+        nargs='?',
+        const=str(INDEX_FILE),
+        metavar='PATH',
+        help=f'Add exported issues to a local search index (default path: {INDEX_FILE})'
+    )
+    parser_export.add_argument(
+        '--cluster',
+        nargs='?',
+        type=float,
+        const=True,
+        metavar='THRESHOLD',
+        help='Group near-duplicate issues and render each group once; only the representative\'s '
+             'latest event is fetched (similarity threshold 0-1, default: 0.8)'
+    )
+    parser_export.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted export to the same --output file or --output-dir, '
+             'skipping issues already written'
+    )
+    parser_export.add_argument(
+        '--scrub',
+        action=argparse.BooleanOptionalAction,
+        help='Redact passwords, tokens, emails, card numbers and other sensitive values '
+             '(default: as configured under "scrub" in config.json, off unless enabled there)'
+    )
+    parser_export.add_argument(
+        '--fetch',
+        choices=FETCH_PROFILES,
+        default='full',
+        help='Event data to fetch and render: header (issue details only, no event request), '
+             'exception (exceptions and stack frames) or full (default: full)'
+    )
+    parser_export.add_argument(
+        '--snippets',
+        choices=SNIPPET_MODES,
+        default='all',
+        help='Source code around each stack frame: all, dedupe (each snippet once per output file, '
+             'referenced afterwards) or in-app (deduplicated, application frames only) (default: all)'
+    )
+    parser_export.add_argument(
+        '--deadline',
+        type=_parse_duration,
+        help='Stop the export after this long (e.g. 90, 60s, 2m): issues finished by then are '
+             'written and the rest listed as unfinished, to be completed with --resume'
+    )
+    parser_export.add_argument(
+        '--stats',
+        action='store_true',
+        help='Rank the exported issues by event trends (rate over 24h, spikes in the last hour, '
+             'week-over-week change) in a table after the last issue; no extra requests'
+    )
+    parser_export.add_argument(
+        '--tags',
+        action='store_true',
+        help='Also fetch each issue\'s tag distributions and summarize the top values of every tag '
+             '(release, browser, server, ...) across all exported issues; one extra request per issue'
+    )
     parser_export.set_defaults(func=cmd_export)
 
+    # Watch command
+    parser_watch = subparsers.add_parser('watch', help='Stream new and regressed issues as they appear')
+    parser_watch.add_argument(
+        '--base-url',
+        help='Sentry API base URL (optional if already configured)'
+    )
+    parser_watch.add_argument(
+        '--profile',
+        help='Use a named configuration profile (see init --profile)'
+    )
+    parser_watch.add_argument(
+        '--token',
+        help='Sentry Auth Token (optional if already configured)'
+    )
+    parser_watch.add_argument(
+        '--output',
+        default='sentry_watch.txt',
+        help='Output file, rotated to .1, .2, .3 when it grows too large (default: sentry_watch.txt)'
+    )
+    parser_watch.add_argument(
+        '--query',
+        default='is:unresolved',
+        help='Sentry search query for the issues list (default: "is:unresolved")'
+    )
+    parser_watch.add_argument(
+        '--interval',
+        type=float,
+        default=15,
+        metavar='SECONDS',
+        help='Polling interval after a change; quiet polls back off from here (default: 15)'
+    )
+    parser_watch.add_argument(
+        '--max-interval',
+        type=float,
+        default=300,
+        metavar='SECONDS',
+        help='Longest polling interval while nothing changes (default: 300)'
+    )
+    parser_watch.add_argument(
+        '--max-bytes',
+        type=int,
+        default=10 * 1024 * 1024,
+        metavar='BYTES',
+        help='Rotate the output file once it grows past this size (default: 10 MiB)'
+    )
+    parser_watch.add_argument(
+        '--scrub',
+        action=argparse.BooleanOptionalAction,
+        help='Redact passwords, tokens, emails, card numbers and other sensitive values '
+             '(default: as configured under "scrub" in config.json, off unless enabled there)'
+    )
+    parser_watch.add_argument(
+        '--fetch',
+        choices=FETCH_PROFILES,
+        default='full',
+        help='Event data to fetch and render for each reported issue (default: full)'
+    )
+    parser_watch.set_defaults(func=cmd_watch)
+
+    # Search command
+    parser_search = subparsers.add_parser('search', help='Search previously exported issues')
+    parser_search.add_argument(
+        'query',
+        help='Words to search for in titles, exceptions, frames, breadcrumbs and tags'
+    )
+    parser_search.add_argument(
+        '--index',
+        default=str(INDEX_FILE),
+        metavar='PATH',
+        help=f'Search index file (default: {INDEX_FILE})'
+    )
+    parser_search.add_argument(
+        '--limit',
+        type=int,
+        default=20,
+        help='Maximum number of results (default: 20)'
+    )
+    parser_search.add_argument(
+        '--raw',
+        action='store_true',
+        help='Treat the query as SQLite FTS5 syntax, e.g. "frames:views AND tags:prod"'
+    )
+    parser_search.set_defaults(func=cmd_search)
+
     # Revoke command
     parser_revoke = subparsers.add_parser('revoke', help='Revoke token and delete configuration')
+    parser_revoke.add_argument(
+        '--profile',
+        help='Only delete this named profile (default: delete the whole configuration file)'
+    )
     parser_revoke.set_defaults(func=cmd_revoke)
 
     args = parser.parse_args()
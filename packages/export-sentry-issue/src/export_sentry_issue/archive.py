@@ -0,0 +1,80 @@
+"""Save and replay raw issue/event JSON for offline re-rendering."""
+
+import json
+import os
+import re
+from pathlib import Path
+
+from .decoding import loads
+
+# issue_{id}.json holds {"issue": ..., "event": ...}; debug_issue_{id}.json
+# (written by --debug) holds only the event
+ARCHIVE_FILE_PATTERN = re.compile(r'^(debug_)?issue_(\w+)\.json$')
+
+
+def archive_record_path(directory, issue_id):
+    """Return the archive record path of an issue"""
+    return Path(directory) / f"issue_{issue_id}.json"
+
+
+def save_archive_record(directory, issue, event):
+    """Save the raw issue and latest event JSON for later replay"""
+    os.makedirs(directory, exist_ok=True)
+    path = archive_record_path(directory, issue['id'])
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"issue": issue, "event": event}, f, ensure_ascii=False)
+    return path
+
+
+def _issue_from_event(event):
+    """Build the issue header fields available from an event-only debug file"""
+    return {
+        "id": event.get('groupID', 'N/A'),
+        "title": event.get('title', 'N/A'),
+        "status": 'N/A',
+        "level": 'N/A',
+        "count": 'N/A',
+        "firstSeen": 'N/A',
+        "lastSeen": event.get('dateCreated', 'N/A'),
+        "permalink": 'N/A',
+        "metadata": event.get('metadata'),
+    }
+
+
+def load_archive_record(path):
+    """Load raw (issue, event) from an archive record or a debug JSON file"""
+    with open(path, 'rb') as f:
+        data = loads(f.read())
+    if 'issue' in data:
+        return data['issue'], data.get('event')
+    return _issue_from_event(data), data
+
+
+def list_archive(path):
+    """Return {issue_id: record path} for an archive directory or single file
+
+    Full archive records take precedence over debug files of the same issue.
+    Issues are ordered by numeric ID where possible.
+    """
+    path = Path(path)
+    if path.is_file():
+        match = ARCHIVE_FILE_PATTERN.match(path.name)
+        if match:
+            return {match.group(2): path}
+        issue, _ = load_archive_record(path)
+        return {str(issue['id']): path}
+
+    records = {}
+    for entry in os.scandir(path):
+        match = ARCHIVE_FILE_PATTERN.match(entry.name)
+        if not match:
+            continue
+        is_debug, issue_id = match.groups()
+        if is_debug and issue_id in records:
+            continue
+        records[issue_id] = Path(entry.path)
+
+    def sort_key(issue_id):
+        return (0, int(issue_id), '') if issue_id.isdigit() else (1, 0, issue_id)
+
+    return {issue_id: records[issue_id] for issue_id in sorted(records, key=sort_key)}
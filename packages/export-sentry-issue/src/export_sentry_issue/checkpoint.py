@@ -0,0 +1,132 @@
+"""Checkpoint journal for resuming interrupted exports."""
+
+import json
+import os
+
+
+def journal_path(output_file):
+    """Return the journal file kept next to an output file"""
+    return f"{output_file}.journal"
+
+
+def read_journal(path):
+    """Return the journal's entries: [(issue_id, output offset after its block, exported without error)]
+
+    Each journal line is written after its issue's block has reached the
+    disk, so the last complete line marks the end of the valid output. A
+    line cut off by a crash is ignored.
+    """
+    entries = []
+    if not os.path.exists(path):
+        return entries
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            entries.append((entry['id'], entry['offset'], entry['ok']))
+    return entries
+
+
+def _entry(issue_id, offset, ok):
+    return json.dumps({"id": issue_id, "offset": offset, "ok": ok}) + "\n"
+
+
+def _compaction_paths(output_file):
+    return f"{output_file}.compact", f"{journal_path(output_file)}.compact"
+
+
+def _finish_compaction(output_file):
+    """Complete or undo a compaction interrupted by a crash (see resume_output)"""
+    output_tmp, journal_tmp = _compaction_paths(output_file)
+    if os.path.exists(output_tmp):
+        # The output was not replaced yet, so the old output and journal still match
+        os.remove(output_tmp)
+        if os.path.exists(journal_tmp):
+            os.remove(journal_tmp)
+    elif os.path.exists(journal_tmp):
+        # The output was replaced; its journal was complete before that
+        os.replace(journal_tmp, journal_path(output_file))
+
+
+def resume_output(output_file):
+    """Prepare the output of an interrupted export for resuming
+
+    Returns the IDs of the issues already exported, which is empty when
+    there is nothing to resume. The output is cut
+    back to the last block recorded in the journal. Failed issues are
+    retried: when some failed, the blocks of the others are copied to a new
+    output and journal, which replace the old ones, and the export continues
+    after them. Raises FileExistsError when the output exists without a
+    journal, as it would be overwritten.
+    """
+    path = journal_path(output_file)
+    if not os.path.exists(path):
+        if os.path.exists(output_file):
+            raise FileExistsError(f"{output_file} exists but has no checkpoint journal ({path}); "
+                                  "it is complete or was not written by an export")
+        return set()
+    if not os.path.exists(output_file):
+        return set()
+
+    _finish_compaction(output_file)
+    entries = read_journal(path)
+    exported = {issue_id for issue_id, _, ok in entries if ok}
+    if not exported:
+        return exported
+    if all(ok for _, _, ok in entries):
+        # Drop anything written after the last committed block
+        with open(output_file, "r+b") as f:
+            f.truncate(entries[-1][1])
+        return exported
+
+    output_tmp, journal_tmp = _compaction_paths(output_file)
+    with open(output_file, "rb") as source, open(output_tmp, "wb") as output, \
+            open(journal_tmp, "w", encoding="utf-8") as journal:
+        start = 0
+        for issue_id, end, ok in entries:
+            if ok:
+                source.seek(start)
+                output.write(source.read(end - start))
+                journal.write(_entry(issue_id, output.tell(), True))
+            start = end
+        for f in (output, journal):
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(output_tmp, output_file)
+    os.replace(journal_tmp, path)
+    return exported
+
+
+class Journal:
+    """Append-only record of the issues committed to an output file"""
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def record(self, issue_id, offset, ok):
+        """Mark an issue as committed; offset is the output size after its block"""
+        self.file.write(_entry(issue_id, offset, ok))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+    def remove(self):
+        """Close and delete the journal once the export has completed"""
+        self.close()
+        os.remove(self.path)
+
+
+def commit_block(f, data):
+    """Append one issue's block to the output and force it to disk
+
+    Returns the output offset after the block.
+    """
+    f.write(data)
+    f.flush()
+    os.fsync(f.fileno())
+    return f.tell()
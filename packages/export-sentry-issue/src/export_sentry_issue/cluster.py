@@ -0,0 +1,152 @@
+"""Group near-duplicate issues with MinHash signatures."""
+
+import hashlib
+import re
+
+from .models import parse_issue, parse_event
+
+# Estimated Jaccard similarity above which two issues are the same bug
+DEFAULT_THRESHOLD = 0.8
+
+NUM_PERMUTATIONS = 64
+# 16 bands of 4 rows: pairs above ~0.6 similarity almost always share a band
+BANDS = 16
+_ROWS = NUM_PERMUTATIONS // BANDS
+
+_PRIME = (1 << 61) - 1
+# Fixed coefficients, so signatures are stable across runs
+_COEFFICIENTS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % (_PRIME - 1) + 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _PRIME,
+    )
+    for i in range(NUM_PERMUTATIONS)
+]
+
+# Hex addresses, hashes and UUIDs vary between otherwise identical issues;
+# messages additionally vary in every number they contain
+_HASH = re.compile(r"0x[0-9a-f]+|(?<![0-9a-z])(?=[0-9a-f-]*\d)[0-9a-f]{7,}(?:-[0-9a-f]{4,})*(?![0-9a-z])", re.IGNORECASE)
+_NUMBER = re.compile(r"\d+")
+_WORD = re.compile(r"[^\W\d]\w*|#")
+
+
+def normalize(text):
+    """Replace addresses and hashes (e.g. in bundled file names) with '#'"""
+    return _HASH.sub("#", str(text))
+
+
+def normalize_message(text):
+    """Replace addresses, hashes and numbers in an error message with '#'"""
+    return _NUMBER.sub("#", normalize(text))
+
+
+def issue_features(issue, event=None):
+    """Return the feature set compared between issues
+
+    Features are the exception types, the words of the error message and the
+    normalized in-app frames (filename and function, alone and as adjacent
+    pairs) of the event's exception entries. Without an event, the top in-app
+    frame recorded in the issue metadata stands in for the stack trace.
+    """
+    issue = parse_issue(issue)
+    event = parse_event(event)
+    metadata = issue.metadata or {}
+
+    features = set()
+    if metadata.get('type'):
+        features.add(f"type:{metadata['type']}")
+    for word in _WORD.findall(normalize_message(metadata.get('value', '')).lower()):
+        features.add(f"word:{word}")
+
+    frames = []
+    if event:
+        for entry in event.entries_of('exception'):
+            for exc in entry.values:
+                features.add(f"type:{exc.type}")
+                for frame in exc.frames or ():
+                    if frame.in_app:
+                        frames.append(f"{normalize(frame.filename)}:{normalize(frame.function)}")
+    elif metadata.get('filename') or metadata.get('function'):
+        frames.append(f"{normalize(metadata.get('filename', ''))}:{normalize(metadata.get('function', ''))}")
+
+    for frame in frames:
+        features.add(f"frame:{frame}")
+    for caller, callee in zip(frames, frames[1:]):
+        features.add(f"call:{caller}>{callee}")
+
+    if not features:
+        # Nothing to compare on; keep the issue in a cluster of its own
+        features.add(f"id:{issue.id}")
+    return features
+
+
+def minhash(features):
+    """Return the MinHash signature of a feature set"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for feature in features
+    ]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _COEFFICIENTS)
+
+
+def similarity(signature1, signature2):
+    """Estimate the Jaccard similarity of two feature sets from their signatures"""
+    return sum(x == y for x, y in zip(signature1, signature2)) / NUM_PERMUTATIONS
+
+
+def cluster_signatures(signatures, threshold=DEFAULT_THRESHOLD):
+    """Group signatures whose estimated similarity reaches the threshold
+
+    Candidates are found with locality-sensitive hashing (banding), and each
+    candidate is compared only with the first signature of its bucket, so the
+    pass is linear in the number of signatures. Returns lists of indexes in
+    input order, ordered by their first index.
+    """
+    parent = list(range(len(signatures)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    for i, signature in enumerate(signatures):
+        for band in range(BANDS):
+            key = (band, signature[band * _ROWS:(band + 1) * _ROWS])
+            first = buckets.setdefault(key, i)
+            if first != i and similarity(signatures[first], signature) >= threshold:
+                root_first, root_i = find(first), find(i)
+                if root_first != root_i:
+                    parent[max(root_first, root_i)] = min(root_first, root_i)
+
+    clusters = {}
+    for i in range(len(signatures)):
+        clusters.setdefault(find(i), []).append(i)
+    return list(clusters.values())
+
+
+def _event_count(issue):
+    try:
+        return int(issue.count)
+    except (TypeError, ValueError):
+        return 0
+
+
+def cluster_issues(issues, events=None, threshold=DEFAULT_THRESHOLD):
+    """Group near-duplicate issues
+
+    issues are raw dicts or Issue objects; events, when given, holds the
+    matching latest events (None where unavailable). Returns lists of indexes
+    into issues with the representative first: the member with the most
+    events, then the earliest in input order.
+    """
+    issues = [parse_issue(issue) for issue in issues]
+    events = events or [None] * len(issues)
+    signatures = [minhash(issue_features(issue, event)) for issue, event in zip(issues, events)]
+
+    clusters = []
+    for members in cluster_signatures(signatures, threshold):
+        representative = max(members, key=lambda i: (_event_count(issues[i]), -i))
+        clusters.append([representative] + [i for i in members if i != representative])
+    return clusters
@@ -5,10 +5,30 @@ import os
 import re
 import stat
 from pathlib import Path
+from typing import Any
 
 # Configuration paths
 CONFIG_DIR = Path.home() / ".config" / "export-sentry-issue"
 CONFIG_FILE = CONFIG_DIR / "config.json"
+# Search index, stored next to config.json in the owner-only directory
+INDEX_FILE = CONFIG_DIR / "index.sqlite3"
+
+# Name of the profile stored at the top level of config.json
+DEFAULT_PROFILE = "default"
+
+# Event data fetched per exported issue: none (issue details only), the
+# exception and stack frames, or the complete latest event
+FETCH_PROFILES = ("header", "exception", "full")
+
+# Source context printed per stack frame: every snippet, each snippet once
+# per output (later frames refer back to it), or application frames only
+SNIPPET_MODES = ("all", "dedupe", "in-app")
+
+# (connect, read) timeouts in seconds for every request to Sentry
+REQUEST_TIMEOUT = (10, 30)
+
+# Parsed config.json, reused until the file's mtime, size or mode changes
+_config_cache: dict[str, Any] = {}
 
 
 def parse_base_url(base_url):
@@ -27,41 +47,133 @@ def ensure_config_dir():
     os.chmod(CONFIG_DIR, stat.S_IRWXU)
 
 
-def save_config(base_url, token):
-    """Save configuration to file with secure permissions"""
+def read_config():
+    """Return (raw config, insecure permissions) without printing warnings
+
+    The raw config includes every profile. It is cached in memory and only
+    re-read when the file changes on disk. Returns (None, False) when no
+    configuration file exists.
+    """
+    try:
+        file_stat = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
+        _config_cache.clear()
+        return None, False
+
+    signature = (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_mode)
+    if _config_cache.get('signature') != signature:
+        with open(CONFIG_FILE, 'r') as f:
+            data = json.load(f)
+        _config_cache['signature'] = signature
+        _config_cache['data'] = data
+        _config_cache['insecure'] = bool(file_stat.st_mode & (stat.S_IRGRP | stat.S_IROTH))
+
+    return _config_cache['data'], _config_cache['insecure']
+
+
+def _write_config_file(data):
+    """Write the raw config with secure permissions"""
     ensure_config_dir()
 
+    # Write config file
+    with open(CONFIG_FILE, 'w') as f:
+        json.dump(data, f, indent=2)
+
+    # Set file permissions to 600 (owner read/write only)
+    os.chmod(CONFIG_FILE, stat.S_IRUSR | stat.S_IWUSR)
+    _config_cache.clear()
+
+
+def get_profile(data, profile=None):
+    """Return the base_url/token settings of a profile from a raw config"""
+    if not profile or profile == DEFAULT_PROFILE:
+        if 'base_url' not in data and 'token' not in data:
+            return None
+        return {key: value for key, value in data.items() if key != 'profiles'}
+    profiles = data.get('profiles') or {}
+    if profile not in profiles:
+        return None
+    return dict(profiles[profile])
+
+
+def list_profiles():
+    """Return the names of all configured profiles"""
+    data, _ = read_config()
+    if not data:
+        return []
+    names = [DEFAULT_PROFILE] if get_profile(data) else []
+    names.extend(data.get('profiles') or {})
+    return names
+
+
+def load_profiles():
+    """Return {profile name: settings} for every configured profile"""
+    data, _ = read_config()
+    if not data:
+        return {}
+    return {name: get_profile(data, name) for name in list_profiles()}
+
+
+def save_config(base_url, token, profile=None):
+    """Save configuration to file with secure permissions
+
+    Without a profile name the top-level (default) settings are replaced;
+    other profiles are kept.
+    """
+    data, _ = read_config()
+    data = dict(data or {})
+
     config = {
         "base_url": base_url,
         "token": token
     }
 
-    # Write config file
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    if not profile or profile == DEFAULT_PROFILE:
+        data.update(config)
+    else:
+        profiles = dict(data.get('profiles') or {})
+        profiles[profile] = config
+        data['profiles'] = profiles
+
+    _write_config_file(data)
 
-    # Set file permissions to 600 (owner read/write only)
-    os.chmod(CONFIG_FILE, stat.S_IRUSR | stat.S_IWUSR)
 
+def load_config(profile=None):
+    """Load configuration of a profile from file
 
-def load_config():
-    """Load configuration from file"""
-    if not CONFIG_FILE.exists():
+    The parsed file is cached in memory and only re-read when it changes
+    on disk.
+    """
+    data, insecure = read_config()
+    if data is None:
         return None
 
     # Check file permissions
-    file_stat = os.stat(CONFIG_FILE)
-    if file_stat.st_mode & (stat.S_IRGRP | stat.S_IROTH):
+    if insecure:
         print("⚠️  Warning: Config file has insecure permissions!")
         print(f"   Please run: chmod 600 {CONFIG_FILE}")
 
-    with open(CONFIG_FILE, 'r') as f:
-        return json.load(f)
-
+    return get_profile(data, profile)
+
+
+def delete_config(profile=None):
+    """Delete configuration file, or only a single named profile from it"""
+    if profile and profile != DEFAULT_PROFILE:
+        data, _ = read_config()
+        profiles = dict((data or {}).get('profiles') or {})
+        if profile not in profiles:
+            return False
+        del profiles[profile]
+        data = dict(data)
+        if profiles:
+            data['profiles'] = profiles
+        else:
+            data.pop('profiles', None)
+        _write_config_file(data)
+        return True
 
-def delete_config():
-    """Delete configuration file"""
     if CONFIG_FILE.exists():
         CONFIG_FILE.unlink()
+        _config_cache.clear()
         return True
     return False
@@ -2,37 +2,217 @@
 
 import json
 import os
+import threading
+import time
 import requests
 from datetime import datetime
-
-from .config import parse_base_url
-
-
-def get_issue_details(base_api_url, token, issue_id):
+from pathlib import Path
+
+from .config import DEFAULT_PROFILE, REQUEST_TIMEOUT, parse_base_url
+from .routing import profile_location
+from .archive import list_archive, load_archive_record, save_archive_record
+from .checkpoint import Journal, commit_block, journal_path, resume_output
+from .shards import (
+    TAGS_FILE,
+    TRENDS_FILE,
+    WRITER_THREADS,
+    describe_issue_file,
+    issue_file_path,
+    write_issue_file,
+    write_manifest,
+)
+from .cluster import cluster_issues
+from .decoding import decode_response
+from .models import parse_issue, parse_event
+from .search import SearchIndex
+from .scrub import NO_SCRUBBING, get_scrubber
+from .snippets import get_snippet_store
+from .facets import TagFacets, format_facets
+from .trends import compute_trends, format_trend_table, format_trends_section
+from .pipeline import (
+    STAGE_WORKERS, DeadlineExceeded, ExportResult, Pipeline, Progress, Stage, issue_stages, print_progress,
+)
+
+# One long-lived session (and connection pool) per configuration profile
+_sessions: dict[str, requests.Session] = {}
+
+# Discover fields holding an event's exceptions and stack frames
+_EXCEPTION_FIELDS = (
+    "id", "timestamp", "error.type", "error.value",
+    "stack.filename", "stack.function", "stack.lineno", "stack.in_app",
+)
+
+# (API URL, organization) pairs where the Discover events API was refused
+_discover_unavailable: set[tuple[str, str]] = set()
+
+# An issue's details and latest event are requested concurrently, on
+# threads shared by all exports in the process
+FETCH_THREADS = 8
+
+# The events list is requested as well when the latest event has not
+# arrived after this many seconds; the first complete event is used
+HEDGE_DELAY = 1.0
+
+# Rows of the event trend table printed after an export with stats
+TOP_TRENDS = 10
+
+_fetch_executor = None
+_fetch_executor_lock = threading.Lock()
+
+
+def get_session(profile=None):
+    """Return the long-lived requests.Session for a profile"""
+    name = profile or DEFAULT_PROFILE
+    session = _sessions.get(name)
+    if session is None:
+        session = _sessions[name] = requests.Session()
+    return session
+
+
+def request_timeout(deadline=None):
+    """Return the (connect, read) timeout for a request that must end by deadline
+
+    deadline is a time.monotonic() value, or None for REQUEST_TIMEOUT as is.
+    Raises DeadlineExceeded once the deadline has passed.
+    """
+    if deadline is None:
+        return REQUEST_TIMEOUT
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded()
+    return tuple(min(limit, remaining) for limit in REQUEST_TIMEOUT)
+
+
+def deadline_reached(error, deadline):
+    """Whether a request timed out because its timeout was cut short by the deadline"""
+    return (isinstance(error, requests.exceptions.Timeout)
+            and deadline is not None and time.monotonic() >= deadline)
+
+
+def _get_fetch_executor():
+    """Return the thread pool that runs per-issue requests, creating it on first use"""
+    global _fetch_executor
+    with _fetch_executor_lock:
+        if _fetch_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _fetch_executor = ThreadPoolExecutor(max_workers=FETCH_THREADS, thread_name_prefix="sentry-fetch")
+        return _fetch_executor
+
+
+def get_issue_details(base_api_url, token, issue_id, session=None, timeout=REQUEST_TIMEOUT):
     """Get complete details of a single issue"""
     url = f"{base_api_url}/issues/{issue_id}/"
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
+    response = (session or requests).get(url, headers=headers, timeout=timeout)
     response.raise_for_status()
-    return response.json()
+    return decode_response(response)
 
 
-def get_latest_event(base_api_url, token, issue_id):
+def get_latest_event(base_api_url, token, issue_id, session=None, timeout=REQUEST_TIMEOUT):
     """Get the latest event with complete data for the issue"""
     url = f"{base_api_url}/issues/{issue_id}/events/latest/"
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
+    response = (session or requests).get(url, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    return decode_response(response)
+
+
+def get_issue_tags(base_api_url, token, issue_id, session=None, timeout=REQUEST_TIMEOUT):
+    """Get the issue's tag keys with their event counts and top values"""
+    url = f"{base_api_url}/issues/{issue_id}/tags/"
+    headers = {"Authorization": f"Bearer {token}"}
+    response = (session or requests).get(url, headers=headers, timeout=timeout)
     response.raise_for_status()
-    return response.json()
+    return decode_response(response)
+
 
+def get_issue_events(base_api_url, token, issue_id, session=None, full=False, per_page=None,
+                     timeout=REQUEST_TIMEOUT):
+    """Get list of events for the issue
 
-def get_issue_events(base_api_url, token, issue_id):
-    """Get list of events for the issue"""
+    With full, each event includes its entries (stack traces, breadcrumbs,
+    ...) as returned by get_latest_event.
+    """
     url = f"{base_api_url}/issues/{issue_id}/events/"
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
+    params = {}
+    if full:
+        params["full"] = "true"
+    if per_page:
+        params["per_page"] = per_page
+    response = (session or requests).get(url, headers=headers, params=params or None, timeout=timeout)
+    response.raise_for_status()
+    return decode_response(response)
+
+
+def get_exception_summary(base_api_url, token, organization, issue_id, session=None, timeout=REQUEST_TIMEOUT):
+    """Get only the exceptions and stack frames of an issue's latest event
+
+    Uses the organization's Discover events API, whose response holds just
+    the requested fields, instead of the complete event. Returns an event
+    dict in the shape of get_latest_event's, or None if no event was found.
+    """
+    url = f"{base_api_url}/organizations/{organization}/events/"
+    headers = {"Authorization": f"Bearer {token}"}
+    params = [("field", field) for field in _EXCEPTION_FIELDS] + [
+        ("query", f"issue.id:{issue_id}"),
+        ("sort", "-timestamp"),
+        ("per_page", "1"),
+        ("statsPeriod", "90d"),
+    ]
+    response = (session or requests).get(url, headers=headers, params=params, timeout=timeout)
+    response.raise_for_status()
+    rows = decode_response(response).get('data') or []
+    if not rows:
+        return None
+    row = rows[0]
+
+    frames = [
+        {"filename": filename, "function": function, "lineNo": lineno, "inApp": bool(in_app)}
+        for filename, function, lineno, in_app in zip(
+            row.get('stack.filename') or [], row.get('stack.function') or [],
+            row.get('stack.lineno') or [], row.get('stack.in_app') or [],
+        )
+    ]
+    values = [
+        {"type": exc_type, "value": exc_value}
+        for exc_type, exc_value in zip(row.get('error.type') or [], row.get('error.value') or [])
+    ]
+    if values and frames:
+        # Discover flattens the frames of chained exceptions; they are shown
+        # under the last (outermost) exception
+        values[-1]["stacktrace"] = {"frames": frames}
+    return {
+        "eventID": row.get('id'),
+        "dateCreated": row.get('timestamp'),
+        "entries": [{"type": "exception", "data": {"values": values}}],
+    }
+
+
+def get_project_issues(base_url, token, cursor=None, query=None, etag=None, session=None,
+                       timeout=REQUEST_TIMEOUT, sort="date"):
+    """Get one page of a project's issues, most recently seen first
+
+    base_url is the project issues endpoint (the configured base URL).
+    sort="freq" lists the issues with the most events first instead.
+    Returns (issues, next page cursor, ETag); issues is None when the page
+    has not changed since etag.
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    if etag:
+        headers["If-None-Match"] = etag
+    params = {"sort": sort}
+    if query:
+        params["query"] = query
+    if cursor:
+        params["cursor"] = cursor
+    response = (session or requests).get(base_url, headers=headers, params=params, timeout=timeout)
+    if response.status_code == 304:
+        return None, None, etag
     response.raise_for_status()
-    return response.json()
+    next_page = response.links.get("next", {})
+    next_cursor = next_page.get("cursor") if next_page.get("results") == "true" else None
+    return decode_response(response), next_cursor, response.headers.get("ETag")
 
 
 def save_debug_json(data, filename):
@@ -41,298 +221,367 @@ def save_debug_json(data, filename):
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 
-def format_issue_to_text(issue, latest_event, debug_mode=False):
-    """Format issue data into readable plain text"""
-    output = []
-
-    # Basic information
+def _render_header(issue, output, scrubber=NO_SCRUBBING):
+    """Render basic issue information and error message"""
     output.append("=" * 80)
-    output.append(f"Issue ID: {issue['id']}")
-    output.append(f"Title: {issue['title']}")
-    output.append(f"Status: {issue['status']}")
-    output.append(f"Level: {issue['level']}")
-    output.append(f"Count: {issue['count']}")
-    output.append(f"First Seen: {issue['firstSeen']}")
-    output.append(f"Last Seen: {issue['lastSeen']}")
-    output.append(f"Permalink: {issue['permalink']}")
+    output.append(f"Issue ID: {issue.id}")
+    output.append(f"Title: {scrubber.scrub(issue.title)}")
+    output.append(f"Status: {issue.status}")
+    output.append(f"Level: {issue.level}")
+    output.append(f"Count: {issue.count}")
+    output.append(f"First Seen: {issue.first_seen}")
+    output.append(f"Last Seen: {issue.last_seen}")
+    output.append(f"Permalink: {issue.permalink}")
     output.append("=" * 80)
     output.append("")
 
     # Error message
-    if issue.get('metadata'):
+    if issue.metadata:
         output.append("【Error Message】")
-        output.append(issue['metadata'].get('value', 'N/A'))
-        if issue['metadata'].get('type'):
-            output.append(f"Type: {issue['metadata']['type']}")
+        output.append(scrubber.scrub(issue.metadata.get('value', 'N/A')))
+        if issue.metadata.get('type'):
+            output.append(f"Type: {issue.metadata['type']}")
         output.append("")
 
-    # Debug mode: show available fields
-    if debug_mode and latest_event:
-        output.append("【DEBUG: Available Fields】")
-        output.append(f"Event top-level fields: {', '.join(latest_event.keys())}")
-        if 'entries' in latest_event:
-            output.append(f"Entry types: {[e.get('type') for e in latest_event['entries']]}")
-        output.append("")
 
-    if not latest_event:
-        output.append("⚠️  Unable to retrieve event details")
-        return "\n".join(output)
+def _render_similar_issues(similar, output):
+    """Render the other members of this issue's cluster"""
+    output.append("【Similar Issues】")
+    output.append(f"{len(similar)} more issue(s) grouped with this one:")
+    for member in similar:
+        output.append(f"  - {member.id}: {member.title} (count: {member.count}, last seen: {member.last_seen})")
+        output.append(f"    {member.permalink}")
+    output.append("")
+
+
+def _render_debug_fields(event, output):
+    """Render the available fields of the raw event"""
+    output.append("【DEBUG: Available Fields】")
+    output.append(f"Event top-level fields: {', '.join(event.fields)}")
+    if event.entries is not None:
+        output.append(f"Entry types: {[e.type for e in event.entries]}")
+    output.append("")
 
-    # Event ID and timestamp
+
+def _render_event_info(event, output):
+    """Render event ID and timestamp"""
     output.append("【Event Information】")
-    if latest_event.get('eventID'):
-        output.append(f"Event ID: {latest_event['eventID']}")
-    if latest_event.get('dateCreated'):
-        output.append(f"Occurred at: {latest_event['dateCreated']}")
+    if event.event_id:
+        output.append(f"Event ID: {event.event_id}")
+    if event.date_created:
+        output.append(f"Occurred at: {event.date_created}")
     output.append("")
 
-    # User information
-    if latest_event.get('user'):
-        output.append("【User Information】")
-        user = latest_event['user']
-        if user.get('id'):
-            output.append(f"  ID: {user['id']}")
-        if user.get('email'):
-            output.append(f"  Email: {user['email']}")
-        if user.get('username'):
-            output.append(f"  Username: {user['username']}")
-        if user.get('ip_address'):
-            output.append(f"  IP: {user['ip_address']}")
-        output.append("")
 
-    # Request information
-    if latest_event.get('request'):
-        output.append("【Request Information】")
-        req = latest_event['request']
-        if req.get('url'):
-            output.append(f"  URL: {req['url']}")
-        if req.get('method'):
-            output.append(f"  Method: {req['method']}")
-        if req.get('query_string'):
-            output.append(f"  Query String: {req['query_string']}")
-        if req.get('data'):
-            output.append(f"  Request Data: {req['data']}")
-        if req.get('headers'):
-            output.append("  Headers:")
-            for key, value in req['headers'].items():
-                if key.lower() not in ['authorization', 'cookie', 'set-cookie']:
-                    output.append(f"    {key}: {value}")
-        output.append("")
-    elif debug_mode:
-        output.append("⚠️  Request information not found")
-        output.append("")
+def _render_user(event, output, scrubber=NO_SCRUBBING):
+    """Render user information"""
+    user = event.user
+    output.append("【User Information】")
+    if user.get('id'):
+        output.append(f"  ID: {scrubber.scrub(user['id'])}")
+    if user.get('email'):
+        output.append(f"  Email: {scrubber.scrub(user['email'])}")
+    if user.get('username'):
+        output.append(f"  Username: {scrubber.scrub(user['username'])}")
+    if user.get('ip_address'):
+        output.append(f"  IP: {user['ip_address']}")
+    output.append("")
+
+
+def _render_request(event, output, scrubber=NO_SCRUBBING):
+    """Render request information"""
+    req = event.request
+    output.append("【Request Information】")
+    if req.get('url'):
+        output.append(f"  URL: {scrubber.scrub(req['url'])}")
+    if req.get('method'):
+        output.append(f"  Method: {req['method']}")
+    if req.get('query_string'):
+        output.append(f"  Query String: {scrubber.scrub(req['query_string'])}")
+    if req.get('data'):
+        output.append(f"  Request Data: {scrubber.scrub(req['data'])}")
+    if req.get('headers'):
+        output.append("  Headers:")
+        for key, value in req['headers'].items():
+            if key.lower() not in ['authorization', 'cookie', 'set-cookie']:
+                output.append(f"    {key}: {scrubber.scrub_item(key, value)}")
+    output.append("")
+
 
-    # Breadcrumbs
-    breadcrumbs_found = False
-    if latest_event.get('entries'):
-        for entry in latest_event['entries']:
-            if entry['type'] == 'breadcrumbs':
-                breadcrumbs_found = True
-                output.append("【Breadcrumbs】")
-                breadcrumbs = entry['data'].get('values', [])
-
-                if not breadcrumbs:
-                    output.append("  (No breadcrumbs data)")
+def _render_breadcrumbs(entry, output, scrubber=NO_SCRUBBING):
+    """Render a breadcrumbs entry"""
+    output.append("【Breadcrumbs】")
+    breadcrumbs = entry.values
+
+    if not breadcrumbs:
+        output.append("  (No breadcrumbs data)")
+        return
+
+    # Show all breadcrumbs
+    for bc in breadcrumbs:
+        output.append(f"  [{bc.timestamp}] [{bc.level}] [{bc.category}] {bc.type}")
+        if bc.message:
+            output.append(f"    Message: {scrubber.scrub(bc.message)}")
+
+        # Show data (may include queries, duration, etc.)
+        if bc.data:
+            for key, value in bc.data.items():
+                if key == 'query':
+                    output.append(f"    Query: {scrubber.scrub(value)}")
+                elif key == 'duration':
+                    output.append(f"    Duration: {value}ms")
                 else:
-                    # Show all breadcrumbs
-                    for bc in breadcrumbs:
-                        timestamp = bc.get('timestamp', 'N/A')
-                        category = bc.get('category', 'N/A')
-                        message = bc.get('message', '')
-                        level = bc.get('level', 'info')
-                        bc_type = bc.get('type', 'default')
-
-                        output.append(f"  [{timestamp}] [{level}] [{category}] {bc_type}")
-                        if message:
-                            output.append(f"    Message: {message}")
-
-                        # Show data (may include queries, duration, etc.)
-                        if bc.get('data'):
-                            data = bc['data']
-                            for key, value in data.items():
-                                if key == 'query':
-                                    output.append(f"    Query: {value}")
-                                elif key == 'duration':
-                                    output.append(f"    Duration: {value}ms")
-                                else:
-                                    output.append(f"    {key}: {value}")
-                        output.append("")
-                break
-
-    if not breadcrumbs_found and debug_mode:
-        output.append("⚠️  Breadcrumbs not found")
+                    output.append(f"    {key}: {scrubber.scrub_item(key, value)}")
         output.append("")
 
-    # Spans (performance traces)
-    spans_found = False
-    if latest_event.get('entries'):
-        for entry in latest_event['entries']:
-            if entry['type'] == 'spans':
-                spans_found = True
-                output.append("【Spans (Performance Traces)】")
-                spans = entry.get('data', [])
-
-                if not spans:
-                    output.append("  (No spans data)")
-                else:
-                    # Show all spans with duration
-                    for span in spans:
-                        span_id = span.get('span_id', 'N/A')
-                        op = span.get('op', 'N/A')
-                        description = span.get('description', '')
-                        status = span.get('status', 'unknown')
-
-                        # Calculate duration from timestamps
-                        start_ts = span.get('start_timestamp')
-                        end_ts = span.get('timestamp')
-                        duration_ms = None
-                        if start_ts and end_ts:
-                            duration_ms = (end_ts - start_ts) * 1000  # Convert to milliseconds
-
-                        # Also check for exclusive_time (actual execution time excluding child spans)
-                        exclusive_time = span.get('exclusive_time')
-
-                        output.append(f"  Span ID: {span_id}")
-                        output.append(f"    Operation: {op}")
-                        output.append(f"    Status: {status}")
-
-                        if duration_ms is not None:
-                            output.append(f"    Duration: {duration_ms:.3f}ms")
-                        if exclusive_time is not None:
-                            output.append(f"    Exclusive Time: {exclusive_time:.3f}ms")
-
-                        if description:
-                            # Truncate long descriptions
-                            if len(description) > 200:
-                                description = description[:200] + "..."
-                            output.append(f"    Description: {description}")
-
-                        # Show parent span if exists
-                        if span.get('parent_span_id'):
-                            output.append(f"    Parent Span: {span['parent_span_id']}")
-
-                        # Show additional data
-                        if span.get('data'):
-                            data = span['data']
-                            output.append(f"    Data:")
-                            for key, value in data.items():
-                                str_value = str(value)
-                                if len(str_value) > 100:
-                                    str_value = str_value[:100] + "..."
-                                output.append(f"      {key}: {str_value}")
-
-                        output.append("")
-                break
-
-    if not spans_found and debug_mode:
-        output.append("⚠️  Spans not found")
+
+def _render_spans(entry, output, scrubber=NO_SCRUBBING):
+    """Render a spans entry"""
+    output.append("【Spans (Performance Traces)】")
+    spans = entry.values
+
+    if not spans:
+        output.append("  (No spans data)")
+        return
+
+    # Show all spans with duration
+    for span in spans:
+        description = span.description
+
+        # Calculate duration from timestamps
+        start_ts = span.start_timestamp
+        end_ts = span.timestamp
+        duration_ms = None
+        if start_ts and end_ts:
+            duration_ms = (end_ts - start_ts) * 1000  # Convert to milliseconds
+
+        # Also check for exclusive_time (actual execution time excluding child spans)
+        exclusive_time = span.exclusive_time
+
+        output.append(f"  Span ID: {span.span_id}")
+        output.append(f"    Operation: {span.op}")
+        output.append(f"    Status: {span.status}")
+
+        if duration_ms is not None:
+            output.append(f"    Duration: {duration_ms:.3f}ms")
+        if exclusive_time is not None:
+            output.append(f"    Exclusive Time: {exclusive_time:.3f}ms")
+
+        if description:
+            # Truncate long descriptions
+            description = scrubber.scrub(description, limit=200)
+            output.append(f"    Description: {description}")
+
+        # Show parent span if exists
+        if span.parent_span_id:
+            output.append(f"    Parent Span: {span.parent_span_id}")
+
+        # Show additional data
+        if span.data:
+            output.append(f"    Data:")
+            for key, value in span.data.items():
+                str_value = scrubber.scrub_item(key, value, limit=100)
+                output.append(f"      {key}: {str_value}")
+
         output.append("")
 
-    # Stack trace
+
+def _render_frame(frame, output, scrubber=NO_SCRUBBING, snippets=None):
+    """Render a single stack frame; snippets is the output's SnippetStore, if any"""
+    lineno = frame.lineno
+
+    app_marker = "[APP] " if frame.in_app else ""
+    output.append(f"  {app_marker}File: {frame.filename}:{lineno}")
+    output.append(f"  Function: {frame.function}")
+
+    # Show variables
+    if frame.vars:
+        output.append("  Variables:")
+        for var_name, var_value in frame.vars.items():
+            # Truncate long values
+            str_value = scrubber.scrub_item(var_name, var_value, limit=200)
+            output.append(f"    {var_name} = {str_value}")
+
+    # Code snippet
+    if frame.context:
+        label, first = snippets.add(frame) if snippets is not None else (None, True)
+        if first:
+            output.append(f"  Code [{label}]:" if label else "  Code:")
+            for line in frame.context:
+                line_no, code = line[0], line[1]
+                marker = ">>> " if line_no == lineno else "    "
+                output.append(f"  {marker}{line_no}: {code}")
+        elif label:
+            output.append(f"  Code: see snippet [{label}] above")
+    output.append("")
+
+
+def _render_exceptions(entries, output, scrubber=NO_SCRUBBING, snippets=None):
+    """Render the stack trace section from all exception entries"""
     output.append("【Stack Trace】")
-    if latest_event.get('entries'):
-        for entry in latest_event['entries']:
-            if entry['type'] == 'exception':
-                exceptions = entry['data'].get('values', [])
-                for exc in exceptions:
-                    output.append(f"\nException Type: {exc.get('type', 'Unknown')}")
-                    output.append(f"Exception Message: {exc.get('value', 'N/A')}")
-
-                    if exc.get('mechanism'):
-                        output.append(f"Mechanism: {exc['mechanism'].get('type', 'N/A')}")
-
-                    if exc.get('stacktrace'):
-                        output.append("\nCall Stack:")
-                        frames = exc['stacktrace'].get('frames', [])
-                        for frame in reversed(frames):
-                            filename = frame.get('filename', 'unknown')
-                            function = frame.get('function', 'unknown')
-                            lineno = frame.get('lineNo', '?')
-                            in_app = frame.get('inApp', False)
-
-                            app_marker = "[APP] " if in_app else ""
-                            output.append(f"  {app_marker}File: {filename}:{lineno}")
-                            output.append(f"  Function: {function}")
-
-                            # Show variables
-                            if frame.get('vars'):
-                                output.append("  Variables:")
-                                for var_name, var_value in frame['vars'].items():
-                                    # Truncate long values
-                                    str_value = str(var_value)
-                                    if len(str_value) > 200:
-                                        str_value = str_value[:200] + "..."
-                                    output.append(f"    {var_name} = {str_value}")
-
-                            # Code snippet
-                            if frame.get('context'):
-                                output.append("  Code:")
-                                for line in frame['context']:
-                                    line_no, code = line[0], line[1]
-                                    marker = ">>> " if line_no == lineno else "    "
-                                    output.append(f"  {marker}{line_no}: {code}")
-                            output.append("")
-
-    # Tags
-    if latest_event.get('tags'):
-        output.append("【Tags】")
-        for tag in latest_event['tags']:
-            output.append(f"  {tag['key']}: {tag['value']}")
-        output.append("")
+    for entry in entries:
+        for exc in entry.values:
+            output.append(f"\nException Type: {exc.type}")
+            output.append(f"Exception Message: {scrubber.scrub(exc.value)}")
 
-    # Environment/Context information
-    if latest_event.get('contexts'):
-        output.append("【Context Information】")
-        contexts = latest_event['contexts']
+            if exc.mechanism_type is not None:
+                output.append(f"Mechanism: {exc.mechanism_type}")
 
-        for context_name, context_data in contexts.items():
-            if not isinstance(context_data, dict):
-                continue
+            if exc.frames is not None:
+                output.append("\nCall Stack:")
+                for frame in reversed(exc.frames):
+                    _render_frame(frame, output, scrubber, snippets)
 
-            if context_name == 'runtime':
-                output.append(f"  Runtime: {context_data.get('name')} {context_data.get('version')}")
-            elif context_name == 'browser':
-                output.append(f"  Browser: {context_data.get('name')} {context_data.get('version')}")
-            elif context_name == 'os':
-                output.append(f"  OS: {context_data.get('name')} {context_data.get('version')}")
-            elif context_name == 'device':
-                output.append(f"  Device: {context_data.get('model', 'N/A')}")
-            else:
-                # Custom context
-                output.append(f"  {context_name}:")
-                for k, v in context_data.items():
-                    if k != 'type':  # Skip type field
-                        output.append(f"    {k}: {v}")
+
+def _render_tags(event, output, scrubber=NO_SCRUBBING):
+    """Render event tags"""
+    output.append("【Tags】")
+    for key, value in event.tags:
+        output.append(f"  {key}: {scrubber.scrub_item(key, value)}")
+    output.append("")
+
+
+def _render_contexts(event, output, scrubber=NO_SCRUBBING):
+    """Render environment/context information"""
+    output.append("【Context Information】")
+    for context_name, context_data in event.contexts.items():
+        if not isinstance(context_data, dict):
+            continue
+
+        if context_name == 'runtime':
+            output.append(f"  Runtime: {context_data.get('name')} {context_data.get('version')}")
+        elif context_name == 'browser':
+            output.append(f"  Browser: {context_data.get('name')} {context_data.get('version')}")
+        elif context_name == 'os':
+            output.append(f"  OS: {context_data.get('name')} {context_data.get('version')}")
+        elif context_name == 'device':
+            output.append(f"  Device: {context_data.get('model', 'N/A')}")
+        else:
+            # Custom context
+            output.append(f"  {context_name}:")
+            for k, v in context_data.items():
+                if k != 'type':  # Skip type field
+                    output.append(f"    {k}: {scrubber.scrub_item(k, v)}")
+    output.append("")
+
+
+def _render_extra(event, output, scrubber=NO_SCRUBBING):
+    """Render extra information"""
+    output.append("【Extra Information】")
+    for key, value in event.extra.items():
+        str_value = scrubber.scrub_item(key, value, limit=500)
+        output.append(f"  {key}: {str_value}")
+    output.append("")
+
+
+def _render_sdk(event, output):
+    """Render SDK information"""
+    sdk = event.sdk
+    output.append("【SDK Information】")
+    output.append(f"  Name: {sdk.get('name', 'N/A')}")
+    output.append(f"  Version: {sdk.get('version', 'N/A')}")
+    output.append("")
+
+
+def format_issue_to_text(issue, latest_event, debug_mode=False, similar=None, scrubber=None, fetch="full",
+                         snippets=None):
+    """Format issue data into readable plain text
+
+    Accepts raw API dicts or Issue/Event objects from parse_issue and
+    parse_event, so callers rendering the same event several times can
+    parse it once. similar lists the other Issue objects of the cluster
+    this issue represents. With a scrubber (see get_scrubber), sensitive
+    values in the rendered fields are redacted, all in one scan (see
+    ScrubBatch). fetch limits the output to
+    the issue header ("header") or the header and exceptions ("exception").
+    snippets is a SnippetStore shared by everything rendered into the same
+    output (see get_snippet_store); None prints every frame's code.
+    """
+    issue = parse_issue(issue)
+    latest_event = parse_event(latest_event)
+    scrubber = scrubber or NO_SCRUBBING
+    batch = scrubber.batch()
+    known_snippets = len(snippets.labels) if snippets is not None else 0
+
+    output = []
+    _render_sections(issue, latest_event, output, debug_mode, similar, batch, fetch, snippets)
+    text = batch.resolve("\n".join(output))
+    if text is None:
+        # The event itself contains NULs: render again, scrubbing each field on its own
+        if snippets is not None:
+            snippets.forget(known_snippets)
+        output = []
+        _render_sections(issue, latest_event, output, debug_mode, similar, scrubber, fetch, snippets)
+        text = "\n".join(output)
+    return text
+
+
+def _render_sections(issue, latest_event, output, debug_mode, similar, scrubber, fetch, snippets):
+    """Render the sections of format_issue_to_text into output"""
+    _render_header(issue, output, scrubber)
+
+    if similar:
+        _render_similar_issues(similar, output)
+
+    if fetch == "header":
+        return
+
+    # Debug mode: show available fields
+    if debug_mode and latest_event:
+        _render_debug_fields(latest_event, output)
+
+    if not latest_event:
+        output.append("⚠️  Unable to retrieve event details")
+        return
+
+    _render_event_info(latest_event, output)
+
+    if fetch == "exception":
+        _render_exceptions(latest_event.entries_of('exception'), output, scrubber, snippets)
+        return
+
+    if latest_event.user is not None:
+        _render_user(latest_event, output, scrubber)
+
+    if latest_event.request is not None:
+        _render_request(latest_event, output, scrubber)
+    elif debug_mode:
+        output.append("⚠️  Request information not found")
         output.append("")
 
-    # Extra information
-    if latest_event.get('extra'):
-        output.append("【Extra Information】")
-        for key, value in latest_event['extra'].items():
-            str_value = str(value)
-            if len(str_value) > 500:
-                str_value = str_value[:500] + "..."
-            output.append(f"  {key}: {str_value}")
+    breadcrumbs = latest_event.entry('breadcrumbs')
+    if breadcrumbs:
+        _render_breadcrumbs(breadcrumbs, output, scrubber)
+    elif debug_mode:
+        output.append("⚠️  Breadcrumbs not found")
         output.append("")
 
-    # SDK information
-    if latest_event.get('sdk'):
-        output.append("【SDK Information】")
-        sdk = latest_event['sdk']
-        output.append(f"  Name: {sdk.get('name', 'N/A')}")
-        output.append(f"  Version: {sdk.get('version', 'N/A')}")
+    spans = latest_event.entry('spans')
+    if spans:
+        _render_spans(spans, output, scrubber)
+    elif debug_mode:
+        output.append("⚠️  Spans not found")
         output.append("")
 
-    return "\n".join(output)
+    _render_exceptions(latest_event.entries_of('exception'), output, scrubber, snippets)
+
+    if latest_event.tags:
+        _render_tags(latest_event, output, scrubber)
+    if latest_event.contexts:
+        _render_contexts(latest_event, output, scrubber)
+    if latest_event.extra:
+        _render_extra(latest_event, output, scrubber)
+    if latest_event.sdk is not None:
+        _render_sdk(latest_event, output)
 
 
-def get_api_tokens(base_api_url, token):
+def get_api_tokens(base_api_url, token, session=None, timeout=REQUEST_TIMEOUT):
     """Get list of API tokens"""
     url = f"{base_api_url.rsplit('/api/', 1)[0]}/api/0/api-tokens/"
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
+    response = (session or requests).get(url, headers=headers, timeout=timeout)
     response.raise_for_status()
-    return response.json()
+    return decode_response(response)
 
 
 def revoke_token(base_api_url, token):
@@ -356,54 +605,655 @@ def revoke_token(base_api_url, token):
         return False
 
 
-def export_issues(base_url, token, issue_ids, output_file=None, debug_mode=False):
-    """Export specified issues to a single file"""
+def _first_event(base_api_url, token, issue_id, session=None, timeout=REQUEST_TIMEOUT):
+    """Get the newest complete event from the issue's events list (None if empty)"""
+    events = get_issue_events(base_api_url, token, issue_id, session, full=True, per_page=1, timeout=timeout)
+    return events[0] if events else None
+
+
+def fetch_latest_event(base_api_url, token, issue_id, session=None, hedge_delay=HEDGE_DELAY,
+                       timeout=REQUEST_TIMEOUT, fallback=True, deadline=None):
+    """Fetch the raw latest event of an issue (None if unavailable)
+
+    The events list is the fallback when the latest event request fails.
+    It is also requested when the latest event takes longer than
+    hedge_delay seconds from when it is sent, and whichever complete event
+    arrives first is returned. With fallback=False only the latest event
+    is requested, so the call costs exactly one request. With deadline (a
+    time.monotonic() value), raises DeadlineExceeded if the request is
+    still queued behind other fetches when it passes.
+    """
+    from concurrent.futures import as_completed, wait
+
+    if not fallback:
+        return get_latest_event(base_api_url, token, issue_id, session, timeout)
+
+    started = threading.Event()
+
+    def latest_event():
+        started.set()
+        return get_latest_event(base_api_url, token, issue_id, session, timeout)
+
+    executor = _get_fetch_executor()
+    latest = executor.submit(latest_event)
+    # The hedge delay counts from when the request is sent: while every
+    # worker is busy, time spent queued is not slowness a hedge could beat
+    if not started.wait(None if deadline is None else max(0, deadline - time.monotonic())):
+        latest.cancel()
+        raise DeadlineExceeded()
+    wait([latest], timeout=hedge_delay)
+    if latest.done() and not latest.exception():
+        return latest.result()
+
+    listed = executor.submit(_first_event, base_api_url, token, issue_id, session, timeout)
+    for future in as_completed([latest, listed]):
+        if not future.exception() and future.result():
+            return future.result()
+    # Neither returned an event: report the events list error, as the fallback's
+    if listed.exception():
+        raise listed.exception()
+    return None
+
+
+def fetch_event(base_api_url, token, issue_id, session=None, fetch="full", organization=None,
+                timeout=REQUEST_TIMEOUT, deadline=None):
+    """Fetch the raw latest event data a fetch profile renders (None if unavailable)
+
+    "header" fetches nothing and "full" the complete latest event.
+    "exception" asks Discover for the exception and stack frames only, and
+    falls back to the complete event where the organization is unknown or
+    Discover is refused (e.g. a token without org:read). timeout applies
+    to each request (see request_timeout); deadline works as in
+    fetch_latest_event.
+    """
+    if fetch == "header":
+        return None
+    if fetch == "exception" and organization and (base_api_url, organization) not in _discover_unavailable:
+        try:
+            summary = get_exception_summary(base_api_url, token, organization, issue_id, session, timeout)
+            if summary:
+                return summary
+        except requests.exceptions.HTTPError:
+            _discover_unavailable.add((base_api_url, organization))
+    return fetch_latest_event(base_api_url, token, issue_id, session, timeout=timeout, deadline=deadline)
+
+
+def fetch_issue(base_api_url, token, issue_id, session=None, fetch="full", organization=None,
+                timeout=REQUEST_TIMEOUT, deadline=None):
+    """Fetch raw issue details and its latest event (None if unavailable)
+
+    fetch, organization, timeout and deadline work as in fetch_event. Both requests
+    run concurrently.
+    """
+    if fetch == "header":
+        return get_issue_details(base_api_url, token, issue_id, session, timeout), None
+
+    # The details are requested while this thread fetches the event
+    details = _get_fetch_executor().submit(get_issue_details, base_api_url, token, issue_id, session, timeout)
+    try:
+        latest_event = fetch_event(base_api_url, token, issue_id, session, fetch, organization, timeout,
+                                   deadline)
+    except Exception:
+        # An issue that cannot be found is the clearer error
+        details.result()
+        raise
+    return details.result(), latest_event
+
+
+def plan_clusters(issue_ids, records, threshold):
+    """Fold near-duplicate issues into one representative per cluster
+
+    records maps issue IDs to raw (issue, event) pairs (event may be None);
+    IDs missing from records are kept so their errors are still reported.
+    Returns the IDs to render, in input order and without repeats, and
+    {representative ID: [member Issue, ...]}.
+    """
+    issue_ids = list(dict.fromkeys(issue_ids))
+    loaded = [issue_id for issue_id in issue_ids if issue_id in records]
+    issues = [parse_issue(records[issue_id][0]) for issue_id in loaded]
+    events = [records[issue_id][1] for issue_id in loaded]
+
+    similar = {}
+    for members in cluster_issues(issues, events, threshold):
+        representative = loaded[members[0]]
+        similar[representative] = [issues[i] for i in members[1:] if loaded[i] != representative]
+
+    render_ids = [issue_id for issue_id in issue_ids if issue_id in similar or issue_id not in records]
+    return render_ids, similar
+
+
+def _record_stages(load, debug_mode, similar, scrubber=None, fetch="full", snippets="all", workers=None,
+                   per_file=False, raw=False, load_tags=None):
+    """Return the pipeline stages loading and rendering issues; see issue_stages
+
+    The rendered issues share one SnippetStore, in input order, unless
+    per_file gives each issue its own. With load_tags(issue_id), the tags
+    of each issue and of the similar issues folded into it are fetched.
+    """
+    store = None if per_file else get_snippet_store(snippets)
+
+    def render(issue_id, issue, event):
+        return format_issue_to_text(issue, event, debug_mode, similar.get(issue_id), scrubber, fetch,
+                                    get_snippet_store(snippets) if per_file else store)
+
+    def tags(issue_id):
+        members = [str(member.id) for member in similar.get(issue_id) or ()]
+        if not members:
+            return {issue_id: load_tags(issue_id)}
+        # A cluster's tags are fetched concurrently
+        tag_ids = [issue_id, *members]
+        return dict(zip(tag_ids, _get_fetch_executor().map(load_tags, tag_ids)))
+
+    return issue_stages(load, render, workers, ordered=store is not None, raw=raw,
+                        tags=tags if load_tags else None)
+
+
+def _iter_records(issue_ids, load, similar=None, debug_mode=False, scrubber=None, fetch="full", snippets="all",
+                  workers=None, per_file=False, raw=False, skip=(), progress=None, deadline=None,
+                  load_tags=None):
+    """Yield an ExportResult per issue ID; load(issue_id) returns raw (issue, event)
+
+    Issues in skip are yielded first, as skipped, without loading them; the
+    others come out of a Pipeline in input order. deadline is a
+    time.monotonic() value. progress, a Progress, is given the totals.
+    load_tags(issue_id) returns an issue's tags, fetched in a stage of their
+    own when given.
+    """
+    similar = similar or {}
+    stages = _record_stages(load, debug_mode, similar, scrubber, fetch, snippets, workers, per_file, raw,
+                            load_tags)
+    pending = [issue_id for issue_id in issue_ids if issue_id not in skip]
+    if progress:
+        progress.total = len(issue_ids)
+        progress.done = len(issue_ids) - len(pending)
+
+    for issue_id in issue_ids:
+        if issue_id in skip:
+            yield ExportResult(issue_id, "skipped", similar=similar.get(issue_id))
+    for issue_id, result, error in Pipeline(stages, progress=progress).run(pending, deadline):
+        if error is not None:
+            status = "unfinished" if isinstance(error, DeadlineExceeded) else "failed"
+            result = ExportResult(issue_id, status, error)
+        result.similar = similar.get(issue_id)
+        yield result
+
+
+def iter_export(base_url, token, issue_ids, session=None, debug_mode=False, archive_dir=None,
+                cluster_threshold=None, scrub=None, fetch="full", snippets="all", workers=None,
+                deadline=None, raw=False, skip=(), per_file=False, progress=None, tags=False):
+    """Export issues, yielding an ExportResult per issue in input order
+
+    Nothing is printed or written except debug JSON (debug_mode) and
+    archive records (archive_dir). Issues are fetched concurrently, but an
+    issue finished early is held back until those before it are. With
+    cluster_threshold, only each cluster's representative is yielded, with
+    the others in its similar list. raw keeps the issue and event JSON on
+    each result. Issues in skip (e.g. exported by an interrupted run) are
+    yielded first, as skipped. per_file deduplicates snippets within each
+    issue's text instead of across the texts. progress, a Progress, counts
+    issues through the stages. With tags, each result's tags holds the tag
+    distributions of the issue and its similar issues, fetched by a
+    separate stage; an issue whose tags cannot be fetched is still
+    exported, with None as its tags. Other arguments work as in
+    export_issues; the deadline starts when iteration starts, and issues
+    not finished by then are yielded as unfinished.
+    """
+    deadline = None if deadline is None else time.monotonic() + deadline
     base_api_url = parse_base_url(base_url)
-
+    organization = profile_location(base_url)[1]
+    session = session or get_session()
+    scrubber = get_scrubber(scrub)
+    details = {}
+    errors = {}
+    similar = None
+
+    if cluster_threshold is not None:
+        # An issue clusters once, however often it is listed
+        issue_ids = list(dict.fromkeys(issue_ids))
+
+        def load_details(issue_id):
+            return get_issue_details(base_api_url, token, issue_id, session, request_timeout(deadline))
+
+        stages = [Stage("fetch", load_details, (workers or {}).get("fetch", STAGE_WORKERS["fetch"]))]
+        for issue_id, detail, error in Pipeline(stages).run(issue_ids, deadline):
+            if error is None:
+                details[issue_id] = detail
+            elif deadline_reached(error, deadline):
+                errors[issue_id] = DeadlineExceeded()
+            else:
+                errors[issue_id] = error
+        records = {issue_id: (detail, None) for issue_id, detail in details.items()}
+        issue_ids, similar = plan_clusters(issue_ids, records, cluster_threshold)
+
+    def load(issue_id):
+        if issue_id in errors:
+            raise errors[issue_id]
+        # Requests started close to the deadline get shorter timeouts
+        timeout = request_timeout(deadline)
+        # Details fetched for clustering are used once
+        issue_detail = details.pop(issue_id, None)
+        try:
+            if issue_detail is not None:
+                latest_event = fetch_event(base_api_url, token, issue_id, session, fetch, organization, timeout,
+                                           deadline)
+            else:
+                issue_detail, latest_event = fetch_issue(base_api_url, token, issue_id, session, fetch,
+                                                         organization, timeout, deadline)
+        except requests.exceptions.Timeout as e:
+            # Cut short by the deadline rather than a slow server: leave it for --resume
+            if deadline_reached(e, deadline):
+                raise DeadlineExceeded() from e
+            raise
+
+        if debug_mode and latest_event:
+            save_debug_json(latest_event, f"debug_issue_{issue_id}.json")
+
+        if archive_dir:
+            save_archive_record(archive_dir, issue_detail, latest_event)
+
+        return issue_detail, latest_event
+
+    def load_tags(issue_id):
+        try:
+            return get_issue_tags(base_api_url, token, issue_id, session, request_timeout(deadline))
+        except (requests.exceptions.RequestException, DeadlineExceeded):
+            # The facet summary notes the missing tags; the issue itself is still exported
+            return None
+
+    yield from _iter_records(issue_ids, load, similar, debug_mode, scrubber, fetch, snippets, workers,
+                             per_file, raw, skip, progress, deadline, load_tags if tags else None)
+
+
+def _print_top_trends(trends, limit=TOP_TRENDS):
+    """Print the top rows of the trend table after an export"""
+    print(f"Event trends (top {min(limit, len(trends))} of {len(trends)}):")
+    for line in format_trend_table(trends, limit).splitlines():
+        print(f"  {line}")
+
+
+def _export_records(records, output_file=None, index_path=None, resume=False, progress=print_progress,
+                    stats=False, facets=None, scrubber=None):
+    """Write exported issues into a single file
+
+    records(skip, tracker) returns the ExportResults to write (see
+    iter_export), skipping the issues in skip and counting the others in
+    tracker, a Progress. With index_path, every exported issue is also
+    added to the search index, scrubbed with scrubber. progress(Progress,
+    issue_id) is called as each issue comes in.
+
+    Each issue's block is written and synced in one piece, then recorded in
+    a journal next to the output file. With resume, the output is cut back
+    to the last recorded block, issues already exported are skipped and
+    failed ones retried (see resume_output). The journal is removed once the
+    export completes.
+
+    Unfinished issues (deadline reached) are listed after the last block,
+    and the journal is kept so that resume picks them up. Returns their IDs.
+
+    With stats, a table of the exported issues ranked by their event trends
+    (see export_sentry_issue.trends) follows the last block, and its top
+    rows are printed. With facets, a TagFacets, the tags on the results are
+    merged into it and summarized after the last block, scrubbed with
+    scrubber.
+    """
     if not output_file:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = f"sentry_issues_{timestamp}.txt"
 
     success_count = 0
     failed_count = 0
-
-    with open(output_file, "w", encoding="utf-8") as f:
-        for i, issue_id in enumerate(issue_ids, 1):
+    folded_count = 0
+    cluster_count = 0
+
+    done = set()
+    if resume:
+        done = resume_output(output_file)
+        if done:
+            print(f"Resuming: {len(done)} issue(s) already exported")
+        else:
+            print("No checkpoint found; starting a new export")
+
+    journal = Journal(journal_path(output_file), resume=bool(done))
+    index = SearchIndex(index_path, scrubber) if index_path else None
+    tracker = Progress()
+    unfinished = []
+    exported = []
+
+    with open(output_file, "ab" if done else "wb") as f:
+        for result in records(done, tracker):
+            issue_id = result.issue_id
+            members = result.similar or ()
+            if result.similar is not None:
+                cluster_count += 1
+            if result.status == "skipped":
+                success_count += 1 + len(members)
+                folded_count += len(members)
+                continue
+            if result.status == "unfinished":
+                # Similar issues folded into this one were not exported either
+                unfinished.append(issue_id)
+                unfinished.extend(str(member.id) for member in members)
+                continue
+            start = time.monotonic()
             try:
-                print(f"Processing {i}/{len(issue_ids)}: Issue ID {issue_id}")
-
-                # Get detailed information
-                issue_detail = get_issue_details(base_api_url, token, issue_id)
-
-                # Try to get complete data for the latest event
-                try:
-                    latest_event = get_latest_event(base_api_url, token, issue_id)
-                except:
-                    # If failed, try to get from event list
-                    events = get_issue_events(base_api_url, token, issue_id)
-                    latest_event = events[0] if events else None
-
-                # Debug mode: save raw JSON
-                if debug_mode and latest_event:
-                    debug_file = f"debug_issue_{issue_id}.json"
-                    save_debug_json(latest_event, debug_file)
-                    print(f"  Debug JSON saved: {debug_file}")
-
-                # Format and write
-                text = format_issue_to_text(issue_detail, latest_event, debug_mode)
-                f.write(text)
-                f.write("\n\n" + "="*80 + "\n\n")
+                if progress:
+                    progress(tracker, issue_id)
+                if result.error is not None:
+                    raise result.error
+
+                # Write the whole block at once
+                block = result.text + "\n\n" + "="*80 + "\n\n"
+                journal.record(issue_id, commit_block(f, block.encode("utf-8")), True)
+
+                if index:
+                    index.add_issue(result.issue, result.event, os.path.abspath(output_file))
+                    for member in members:
+                        index.add_issue(member, None, os.path.abspath(output_file))
+                if stats:
+                    exported.append(result.issue)
+                    exported.extend(members)
+                if facets is not None:
+                    for tagged_id, tags in (result.tags or {}).items():
+                        facets.add(tagged_id, tags)
 
                 success_count += 1
+                if members:
+                    print(f"  Folded {len(members)} similar issue(s) into this one")
+                    success_count += len(members)
+                    folded_count += len(members)
 
             except Exception as e:
                 error_msg = f"Error processing Issue {issue_id}: {str(e)}"
                 print(f"  ✗ {error_msg}")
-                f.write(f"\nError: {error_msg}\n\n")
+                block = f"\nError: {error_msg}\n\n"
+                journal.record(issue_id, commit_block(f, block.encode("utf-8")), False)
                 failed_count += 1
+            tracker.record("write", time.monotonic() - start)
+
+        trends = compute_trends(exported) if stats else None
+        # Not journaled: resuming cuts these off and exports the remaining issues
+        if trends:
+            f.write(("\n" + format_trends_section(trends) + "\n").encode("utf-8"))
+        if facets:
+            f.write(("\n" + format_facets(facets, scrubber=scrubber) + "\n").encode("utf-8"))
+        if unfinished:
+            f.write(f"\nUnfinished (deadline reached): {', '.join(unfinished)}\n".encode("utf-8"))
+
+    if unfinished:
+        journal.close()
+    else:
+        journal.remove()
+    if index:
+        index.close()
 
     print("\n" + "=" * 80)
     print(f"Export completed!")
     print(f"Success: {success_count}")
     print(f"Failed: {failed_count}")
+    if unfinished:
+        print(f"Unfinished: {len(unfinished)} (deadline reached; export again with --resume to finish)")
+        print(f"  {', '.join(unfinished)}")
+    if cluster_count:
+        print(f"Clusters: {cluster_count} ({folded_count} similar issues folded)")
     print(f"Output file: {os.path.abspath(output_file)}")
+    if index:
+        print(f"Search index: {index.path}")
+    if facets:
+        print(f"Tag facets: {len(facets.values)} tag(s) across {facets.issue_count} issue(s)")
+    if trends:
+        _print_top_trends(trends)
+    print("Stages:")
+    for line in tracker.summary():
+        print(line)
+    return unfinished
+
+
+def _export_records_to_dir(records, issue_ids, output_dir, index_path=None, resume=False,
+                           progress=print_progress, stats=False, facets=None, scrubber=None):
+    """Write each exported issue into its own file under output_dir, plus manifest.json
+
+    records works as in _export_records; issue_ids are the IDs being
+    exported. Files are written atomically by a pool of writer threads while
+    the next issues are fetched and rendered. With resume, issue files left
+    by an earlier run are kept and only the missing issues are exported.
+    Unfinished issues and failed writes are listed in the manifest, which
+    is written even when the export is interrupted. With stats, the trend
+    table goes to trends.txt, and with facets the tag summary to tags.txt.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    os.makedirs(output_dir, exist_ok=True)
+    index = SearchIndex(index_path, scrubber) if index_path else None
+    written = {}
+    similar = {}
+    failed = {}
+    unfinished = []
+    exported = []
+    tracker = Progress()
+    skip = set()
+    if resume:
+        skip = {issue_id for issue_id in issue_ids if issue_file_path(output_dir, issue_id).exists()}
+
+    try:
+        with ThreadPoolExecutor(max_workers=WRITER_THREADS) as writers:
+            for result in records(skip, tracker):
+                issue_id = result.issue_id
+                members = result.similar or ()
+                path = issue_file_path(output_dir, issue_id)
+                if result.similar is not None:
+                    similar[issue_id] = members
+                if result.status == "skipped":
+                    written[issue_id] = writers.submit(describe_issue_file, path)
+                    continue
+                if result.status == "unfinished":
+                    # Similar issues folded into this one were not exported either
+                    unfinished.append(issue_id)
+                    unfinished.extend(str(member.id) for member in members)
+                    continue
+                start = time.monotonic()
+                try:
+                    if progress:
+                        progress(tracker, issue_id)
+                    if result.error is not None:
+                        raise result.error
+                    written[issue_id] = writers.submit(write_issue_file, path, result.text + "\n")
+
+                    if index:
+                        index.add_issue(result.issue, result.event, os.path.abspath(path))
+                        for member in members:
+                            index.add_issue(member, None, os.path.abspath(path))
+                    if stats:
+                        exported.append(result.issue)
+                        exported.extend(members)
+                    if facets is not None:
+                        for tagged_id, tags in (result.tags or {}).items():
+                            facets.add(tagged_id, tags)
+
+                    if members:
+                        print(f"  Folded {len(members)} similar issue(s) into this one")
+
+                except Exception as e:
+                    error_msg = f"Error processing Issue {issue_id}: {str(e)}"
+                    print(f"  ✗ {error_msg}")
+                    failed[issue_id] = error_msg
+                tracker.record("write", time.monotonic() - start)
+    finally:
+        if index:
+            index.close()
+        entries = []
+        folded_count = 0
+        for issue_id, future in written.items():
+            try:
+                entry = {"id": issue_id, **future.result()}
+            except Exception as e:
+                error_msg = f"Error processing Issue {issue_id}: {str(e)}"
+                print(f"  ✗ {error_msg}")
+                failed[issue_id] = error_msg
+                continue
+            members = similar.get(issue_id)
+            if members:
+                entry["similar"] = [member.id for member in members]
+                folded_count += len(members)
+            entries.append(entry)
+        # Issues not reached, e.g. after an interruption, are left for resume
+        done = {*written, *failed, *unfinished}
+        done.update(str(member.id) for members in similar.values() for member in members)
+        unfinished.extend(issue_id for issue_id in issue_ids if issue_id not in done)
+        manifest = write_manifest(
+            output_dir,
+            entries,
+            [{"id": issue_id, "error": error_msg} for issue_id, error_msg in failed.items()],
+            unfinished,
+        )
+
+    trends = compute_trends(exported) if stats else None
+    if trends:
+        trends_path = Path(output_dir) / TRENDS_FILE
+        write_issue_file(trends_path, format_trends_section(trends) + "\n")
+    if facets:
+        tags_path = Path(output_dir) / TAGS_FILE
+        write_issue_file(tags_path, format_facets(facets, scrubber=scrubber) + "\n")
+
+    print("\n" + "=" * 80)
+    print(f"Export completed!")
+    print(f"Success: {len(entries) + folded_count}")
+    print(f"Failed: {len(failed)}")
+    if unfinished:
+        print(f"Unfinished: {len(unfinished)} (deadline reached; export again with --resume to finish)")
+        print(f"  {', '.join(unfinished)}")
+    if similar:
+        print(f"Clusters: {len(similar)} ({folded_count} similar issues folded)")
+    print(f"Output directory: {os.path.abspath(output_dir)}")
+    print(f"Manifest: {os.path.abspath(manifest)}")
+    if trends:
+        print(f"Trends: {os.path.abspath(trends_path)}")
+    if facets:
+        print(f"Tag facets: {os.path.abspath(tags_path)}")
+    if index:
+        print(f"Search index: {index.path}")
+    if trends:
+        _print_top_trends(trends)
+    print("Stages:")
+    for line in tracker.summary():
+        print(line)
+    return unfinished
+
+
+def export_issues(base_url, token, issue_ids, output_file=None, debug_mode=False, session=None,
+                  archive_dir=None, index_path=None, cluster_threshold=None, resume=False,
+                  output_dir=None, scrub=None, fetch="full", snippets="all", workers=None,
+                  progress=print_progress, deadline=None, stats=False, tags=False):
+    """Export specified issues to a single file
+
+    Pass a session from get_session() to reuse connections across calls.
+    With archive_dir, the raw issue and event JSON of every exported issue is
+    saved there so it can be re-rendered later with export_issues_from_archive.
+    With index_path, exported issues are added to that search index.
+    With cluster_threshold, near-duplicate issues are grouped using their
+    issue details only; just the representative of each cluster is rendered,
+    and only its latest event is fetched.
+    With resume, an interrupted export to the same output_file continues
+    after the last issue it completed.
+    With output_dir, each issue is written to its own file with a manifest
+    instead of to output_file.
+    Sensitive values are redacted as configured under "scrub" in config.json;
+    scrub=True/False overrides the configured switch; the search index gets
+    the scrubbed text too. Debug JSON and archives keep the raw data.
+    fetch selects the event data fetched and rendered per issue: "full",
+    "exception" (exceptions and stack frames only) or "header" (issue
+    details only, no event request).
+    snippets="dedupe" prints each frame's source context once per output
+    file and refers back to it afterwards; "in-app" also leaves it out for
+    frames outside the application.
+    Issues are fetched, decoded and rendered by concurrent pipeline stages
+    with bounded queues between them (see export_sentry_issue.pipeline);
+    workers overrides the threads per stage, e.g. {"fetch": 8}, and
+    progress(Progress, issue_id) replaces the per-issue progress lines.
+    Every request times out after REQUEST_TIMEOUT (connect, read) seconds.
+    With deadline, the whole export stops after that many seconds: issues
+    finished by then are written, and the IDs of the others are listed at
+    the end of the output and returned (an export with resume continues
+    with them). Returns the list of unfinished issue IDs.
+    With stats, the exported issues are ranked by their event trends (rate,
+    spikes, week-over-week change) from the stats buckets in their details,
+    in a table after the last issue (or in trends.txt with output_dir).
+    Issues skipped by resume are not included.
+    With tags, every issue's tag distributions (event counts of its top
+    releases, browsers, servers, ...) are fetched alongside it, one request
+    per issue, and merged into a tag facet summary after the last issue (or
+    in tags.txt with output_dir). This shows which values a whole batch is
+    spread over, where the 【Tags】 section only shows the latest event's.
+    To handle the exported issues yourself instead, use iter_export.
+    """
+    if cluster_threshold is not None:
+        print(f"Fetching details of {len(issue_ids)} issue(s)")
+
+    debug_files = set()
+    if output_dir:
+        # One file per issue: an issue listed twice is written once
+        issue_ids = list(dict.fromkeys(issue_ids))
+
+    def records(skip, tracker):
+        for result in iter_export(base_url, token, issue_ids, session, debug_mode, archive_dir,
+                                  cluster_threshold, scrub, fetch, snippets, workers, deadline,
+                                  skip=skip, per_file=bool(output_dir), progress=tracker, tags=tags):
+            if debug_mode and result.event is not None:
+                debug_files.add(result.issue_id)
+            yield result
+
+    def report(tracker, issue_id):
+        if progress:
+            progress(tracker, issue_id)
+        if issue_id in debug_files:
+            print(f"  Debug JSON saved: debug_issue_{issue_id}.json")
+
+    scrubber = get_scrubber(scrub)
+    facets = TagFacets() if tags else None
+    if output_dir:
+        return _export_records_to_dir(records, issue_ids, output_dir, index_path, resume, report, stats,
+                                      facets, scrubber)
+    return _export_records(records, output_file, index_path, resume, report, stats, facets, scrubber)
+
+
+def export_issues_from_archive(archive_path, issue_ids=None, output_file=None, debug_mode=False,
+                               index_path=None, cluster_threshold=None, resume=False, output_dir=None,
+                               scrub=None, fetch="full", snippets="all", workers=None,
+                               progress=print_progress, stats=False):
+    """Re-render previously archived issues without any HTTP calls
+
+    archive_path is a directory written with archive_dir (or --debug JSON
+    files) or a single record file. Without issue_ids every archived issue
+    is exported. With cluster_threshold, near-duplicate issues are grouped
+    by their archived stack traces and rendered once per cluster. scrub,
+    fetch (which here only limits the rendered sections), snippets, workers,
+    progress and stats work as in export_issues.
+    """
+    records = list_archive(archive_path)
+    scrubber = get_scrubber(scrub)
+    issue_ids = list(issue_ids or records)
+    if output_dir:
+        # One file per issue: an issue listed twice is written once
+        issue_ids = list(dict.fromkeys(issue_ids))
+    similar = None
+
+    if cluster_threshold is not None:
+        loaded = {
+            issue_id: load_archive_record(records[issue_id])
+            for issue_id in issue_ids if issue_id in records
+        }
+        issue_ids, similar = plan_clusters(issue_ids, loaded, cluster_threshold)
+
+    def load(issue_id):
+        if issue_id not in records:
+            raise ValueError(f"Issue {issue_id} not found in archive {archive_path}")
+        return load_archive_record(records[issue_id])
+
+    def archived(skip, tracker):
+        return _iter_records(issue_ids, load, similar, debug_mode, scrubber, fetch, snippets, workers,
+                             per_file=bool(output_dir), skip=skip, progress=tracker)
+
+    if output_dir:
+        _export_records_to_dir(archived, issue_ids, output_dir, index_path, resume, progress, stats,
+                               scrubber=scrubber)
+    else:
+        _export_records(archived, output_file, index_path, resume, progress, stats, scrubber=scrubber)
@@ -0,0 +1,32 @@
+"""Pluggable JSON decoding for Sentry API responses."""
+
+import json
+from typing import Any, Callable
+
+# Pick the fastest available backend: orjson, then msgspec, then stdlib json
+_loads: Callable[..., Any]
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import msgspec
+
+        JSON_BACKEND = "msgspec"
+        _loads = msgspec.json.Decoder().decode
+    except ImportError:
+        JSON_BACKEND = "json"
+        _loads = json.loads
+
+
+def loads(data):
+    """Decode JSON bytes or str with the selected backend"""
+    return _loads(data)
+
+
+def decode_response(response):
+    """Decode a requests response body without going through response.json()"""
+    # response.content skips requests' charset detection on large bodies
+    return _loads(response.content)
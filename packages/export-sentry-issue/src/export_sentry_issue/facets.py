@@ -0,0 +1,96 @@
+"""Tag value distributions merged across a batch of issues.
+
+Sentry's issue tags endpoint returns, per tag key, the number of events
+tagged with it (totalValues) and the most common values with their event
+counts (topValues). TagFacets adds these up over many issues, giving the
+releases, browsers, servers, ... a batch is spread over without fetching
+more than one event per issue.
+"""
+
+from collections import Counter, defaultdict
+
+from .scrub import NO_SCRUBBING
+
+# Values shown per tag key in the facet summary
+TOP_VALUES = 5
+
+
+class TagFacets:
+    """Event counts per tag value, merged from issue tag distributions
+
+    values[key] counts the events per value and issues[key] the issues the
+    value is among the top values of. totals[key] counts every event
+    tagged with key, including those with values outside the top values.
+    missing lists the issues whose tags could not be fetched. Values are
+    counted as they are, so that redacting some of them (see format_facets)
+    cannot fold distinct values into one.
+    """
+
+    def __init__(self):
+        self.values = defaultdict(Counter)
+        self.issues = defaultdict(Counter)
+        self.totals = Counter()
+        self.issue_count = 0
+        self.missing = []
+
+    def add(self, issue_id, tags):
+        """Merge one issue's tag distributions, or record them as missing if tags is None"""
+        if tags is None:
+            self.missing.append(str(issue_id))
+            return
+        self.issue_count += 1
+        for tag in tags:
+            key = tag.get('key')
+            if not key:
+                continue
+            self.totals[key] += tag.get('totalValues') or 0
+            for top in tag.get('topValues') or ():
+                value = top.get('value')
+                self.values[key][value] += top.get('count') or 0
+                self.issues[key][value] += 1
+
+    def merge(self, other):
+        """Add the counts of another TagFacets into this one"""
+        for key, counts in other.values.items():
+            self.values[key].update(counts)
+        for key, counts in other.issues.items():
+            self.issues[key].update(counts)
+        self.totals.update(other.totals)
+        self.issue_count += other.issue_count
+        self.missing.extend(other.missing)
+
+    def top(self, key, limit=TOP_VALUES):
+        """Return [(value, events, share of the key's events, issues), ...] for the top values of key"""
+        counts = self.values[key]
+        total = max(self.totals[key], sum(counts.values())) or 1
+        # Ties are ordered by value, so the summary does not depend on merge order
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))[:limit]
+        return [(value, count, count / total, self.issues[key][value]) for value, count in ranked]
+
+    def __bool__(self):
+        return bool(self.issue_count or self.missing)
+
+
+def format_facets(facets, limit=TOP_VALUES, scrubber=None):
+    """Render the 【Tag Facets】 summary: one line per tag key, with its top values
+
+    Each value is followed by its share of the events tagged with the key
+    and, in brackets, the number of issues it appears in. With a scrubber
+    (see get_scrubber), the values shown are redacted like the tags of a
+    rendered event.
+    """
+    scrubber = scrubber or NO_SCRUBBING
+    output = ["【Tag Facets】"]
+    output.append(f"Top tag values across {facets.issue_count} issue(s): share of events [issues]")
+    for key in sorted(facets.values):
+        parts = [
+            f"{scrubber.scrub_item(key, value)} {share:.0%} [{issues}]"
+            for value, _, share, issues in facets.top(key, limit)
+        ]
+        more = len(facets.values[key]) - len(parts)
+        if more > 0:
+            parts.append(f"+{more} more")
+        output.append(f"  {key}: {', '.join(parts)}")
+    if facets.missing:
+        output.append(f"  (tags unavailable for {len(facets.missing)} issue(s): {', '.join(facets.missing)})")
+    return "\n".join(output)
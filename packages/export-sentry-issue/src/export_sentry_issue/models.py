@@ -0,0 +1,261 @@
+"""Compact representations of the Sentry payload fields that get rendered.
+
+Only the fields used by the formatter and the trend rollups are kept, so
+the large raw dicts returned by the API can be released as soon as an
+issue is converted.
+"""
+
+USER_FIELDS = ('id', 'email', 'username', 'ip_address')
+REQUEST_FIELDS = ('url', 'method', 'query_string', 'data', 'headers')
+
+
+def _pick(data, keys):
+    """Copy only the given keys from a dict"""
+    return {key: data[key] for key in keys if key in data}
+
+
+class Issue:
+    """Issue header fields"""
+
+    __slots__ = (
+        'id', 'title', 'status', 'level', 'count',
+        'first_seen', 'last_seen', 'permalink', 'metadata', 'stats',
+    )
+
+    def __init__(self, id, title, status, level, count, first_seen, last_seen, permalink, metadata=None,
+                 stats=None):
+        self.id = id
+        self.title = title
+        self.status = status
+        self.level = level
+        self.count = count
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.permalink = permalink
+        self.metadata = metadata
+        self.stats = stats
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            id=data['id'],
+            title=data['title'],
+            status=data['status'],
+            level=data['level'],
+            count=data['count'],
+            first_seen=data['firstSeen'],
+            last_seen=data['lastSeen'],
+            permalink=data['permalink'],
+            metadata=data.get('metadata'),
+            stats=data.get('stats'),
+        )
+
+
+class Breadcrumb:
+    """Single breadcrumb with render defaults applied"""
+
+    __slots__ = ('timestamp', 'category', 'message', 'level', 'type', 'data')
+
+    def __init__(self, timestamp, category, message, level, type, data):
+        self.timestamp = timestamp
+        self.category = category
+        self.message = message
+        self.level = level
+        self.type = type
+        self.data = data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            timestamp=data.get('timestamp', 'N/A'),
+            category=data.get('category', 'N/A'),
+            message=data.get('message', ''),
+            level=data.get('level', 'info'),
+            type=data.get('type', 'default'),
+            data=data.get('data'),
+        )
+
+
+class Span:
+    """Single performance span"""
+
+    __slots__ = (
+        'span_id', 'op', 'description', 'status', 'start_timestamp',
+        'timestamp', 'exclusive_time', 'parent_span_id', 'data',
+    )
+
+    def __init__(self, span_id, op, description, status, start_timestamp, timestamp,
+                 exclusive_time, parent_span_id, data):
+        self.span_id = span_id
+        self.op = op
+        self.description = description
+        self.status = status
+        self.start_timestamp = start_timestamp
+        self.timestamp = timestamp
+        self.exclusive_time = exclusive_time
+        self.parent_span_id = parent_span_id
+        self.data = data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            span_id=data.get('span_id', 'N/A'),
+            op=data.get('op', 'N/A'),
+            description=data.get('description', ''),
+            status=data.get('status', 'unknown'),
+            start_timestamp=data.get('start_timestamp'),
+            timestamp=data.get('timestamp'),
+            exclusive_time=data.get('exclusive_time'),
+            parent_span_id=data.get('parent_span_id'),
+            data=data.get('data'),
+        )
+
+
+class Frame:
+    """Single stack frame"""
+
+    __slots__ = ('filename', 'function', 'lineno', 'in_app', 'vars', 'context')
+
+    def __init__(self, filename, function, lineno, in_app, vars, context):
+        self.filename = filename
+        self.function = function
+        self.lineno = lineno
+        self.in_app = in_app
+        self.vars = vars
+        self.context = context
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            filename=data.get('filename', 'unknown'),
+            function=data.get('function', 'unknown'),
+            lineno=data.get('lineNo', '?'),
+            in_app=data.get('inApp', False),
+            vars=data.get('vars'),
+            context=data.get('context'),
+        )
+
+
+class ExceptionValue:
+    """Single exception from an exception entry"""
+
+    __slots__ = ('type', 'value', 'mechanism_type', 'frames')
+
+    def __init__(self, type, value, mechanism_type=None, frames=None):
+        self.type = type
+        self.value = value
+        # None when the exception has no mechanism
+        self.mechanism_type = mechanism_type
+        # None when the exception has no stacktrace
+        self.frames = frames
+
+    @classmethod
+    def from_dict(cls, data):
+        mechanism = data.get('mechanism')
+        stacktrace = data.get('stacktrace')
+        frames = None
+        if stacktrace:
+            frames = [Frame.from_dict(frame) for frame in stacktrace.get('frames', [])]
+        return cls(
+            type=data.get('type', 'Unknown'),
+            value=data.get('value', 'N/A'),
+            mechanism_type=mechanism.get('type', 'N/A') if mechanism else None,
+            frames=frames,
+        )
+
+
+class Entry:
+    """Event entry; values is None for entry types that are not rendered"""
+
+    __slots__ = ('type', 'values')
+
+    def __init__(self, type, values=None):
+        self.type = type
+        self.values = values
+
+    @classmethod
+    def from_dict(cls, data):
+        entry_type = data.get('type')
+        if entry_type == 'breadcrumbs':
+            values = [Breadcrumb.from_dict(bc) for bc in data['data'].get('values', [])]
+        elif entry_type == 'spans':
+            values = [Span.from_dict(span) for span in data.get('data', [])]
+        elif entry_type == 'exception':
+            values = [ExceptionValue.from_dict(exc) for exc in data['data'].get('values', [])]
+        else:
+            values = None
+        return cls(entry_type, values)
+
+
+class Event:
+    """Latest event fields used by the formatter"""
+
+    __slots__ = (
+        'fields', 'event_id', 'date_created', 'user', 'request',
+        'entries', 'entries_by_type', 'tags', 'contexts', 'extra', 'sdk',
+    )
+
+    def __init__(self, fields=(), event_id=None, date_created=None, user=None, request=None,
+                 entries=None, tags=None, contexts=None, extra=None, sdk=None):
+        # Top-level keys of the raw event, kept for debug output
+        self.fields = fields
+        # Optional sections are None when missing or empty in the raw event
+        self.event_id = event_id
+        self.date_created = date_created
+        self.user = user
+        self.request = request
+        # None when the raw event has no 'entries' key
+        self.entries = entries
+        # Entries grouped by type, in event order
+        self.entries_by_type = {}
+        for entry in entries or ():
+            self.entries_by_type.setdefault(entry.type, []).append(entry)
+        self.tags = tags
+        self.contexts = contexts
+        self.extra = extra
+        self.sdk = sdk
+
+    def entry(self, entry_type):
+        """Return the first entry of the given type, or None"""
+        entries = self.entries_by_type.get(entry_type)
+        return entries[0] if entries else None
+
+    def entries_of(self, entry_type):
+        """Return all entries of the given type"""
+        return self.entries_by_type.get(entry_type, [])
+
+    @classmethod
+    def from_dict(cls, data):
+        entries = data.get('entries')
+        if entries is not None:
+            entries = [Entry.from_dict(entry) for entry in entries]
+        user = data.get('user')
+        request = data.get('request')
+        sdk = data.get('sdk')
+        tags = data.get('tags')
+        return cls(
+            fields=tuple(data.keys()),
+            event_id=data.get('eventID'),
+            date_created=data.get('dateCreated'),
+            user=_pick(user, USER_FIELDS) if user else None,
+            request=_pick(request, REQUEST_FIELDS) if request else None,
+            entries=entries,
+            tags=[(tag['key'], tag['value']) for tag in tags] if tags else None,
+            contexts=data.get('contexts') or None,
+            extra=data.get('extra') or None,
+            sdk=_pick(sdk, ('name', 'version')) if sdk else None,
+        )
+
+
+def parse_event(data):
+    """Convert a raw event dict into an indexed Event, once per event"""
+    if isinstance(data, Event):
+        return data
+    return Event.from_dict(data) if data else None
+
+
+def parse_issue(data):
+    """Convert a raw issue dict into an Issue"""
+    if isinstance(data, Issue):
+        return data
+    return Issue.from_dict(data)
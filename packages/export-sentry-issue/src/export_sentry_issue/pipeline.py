@@ -0,0 +1,344 @@
+"""Staged export pipeline: fetch, decode and render issues concurrently."""
+
+import queue
+import threading
+import time
+
+from .models import parse_event, parse_issue
+
+# Items waiting between two stages. Together with the workers this caps the
+# issues held in memory at once, however many are exported.
+QUEUE_SIZE = 8
+
+# Worker threads per stage. Fetching waits on the network; decoding and
+# rendering hold the GIL, so more threads there would not help.
+STAGE_WORKERS = {"fetch": 4, "tags": 4, "decode": 1, "render": 1}
+
+# Seconds between checks for a stopped pipeline while blocked on a queue
+_POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+class _Stopped(Exception):
+    """Raised in pipeline threads once the consumer has gone away"""
+
+
+class DeadlineExceeded(TimeoutError):
+    """An issue could not be exported before the batch's deadline"""
+
+    def __init__(self, message="deadline reached before the issue was exported"):
+        super().__init__(message)
+
+
+class ExportResult:
+    """One issue coming out of an export (see iter_export)
+
+    status is "exported", "failed" (error holds the exception), "unfinished"
+    (not done before the deadline) or "skipped" (exported by an earlier
+    run). issue and event are the parsed Issue and Event and text their
+    rendering; raw_issue and raw_event are the JSON they were parsed from,
+    when kept. similar lists the Issues folded into this one, and timings
+    the seconds spent in each stage. tags, when fetched, maps the ID of the
+    issue and of each similar issue to its tag distributions (see
+    get_issue_tags), or to None where they could not be fetched.
+    """
+
+    __slots__ = ('issue_id', 'status', 'issue', 'event', 'text', 'raw_issue', 'raw_event',
+                 'similar', 'error', 'timings', 'tags')
+
+    def __init__(self, issue_id, status="exported", error=None, similar=None):
+        self.issue_id = issue_id
+        self.status = status
+        self.issue = None
+        self.event = None
+        self.text = None
+        self.raw_issue = None
+        self.raw_event = None
+        self.similar = similar
+        self.error = error
+        self.timings = {}
+        self.tags = None
+
+    def __repr__(self):
+        return f"<ExportResult {self.issue_id} {self.status}>"
+
+
+class Stage:
+    """One pipeline step: fn(value) returns the value for the next stage
+
+    An ordered stage takes items in input order, one at a time; use it when
+    each result depends on the ones before (e.g. snippet references).
+    """
+
+    def __init__(self, name, fn, workers=1, ordered=False):
+        self.name = name
+        self.fn = fn
+        self.workers = 1 if ordered else max(1, workers)
+        self.ordered = ordered
+
+
+class StageStats:
+    """Items handled by a stage and the time its workers spent on them"""
+
+    __slots__ = ('workers', 'count', 'busy')
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.count = 0
+        self.busy = 0.0
+
+
+class Progress:
+    """Per-stage counts and throughput of a running export
+
+    done counts the issues that have left the pipeline, starting from the
+    ones an earlier run already exported. The consumer's own work (writing)
+    is recorded as the last stage.
+    """
+
+    def __init__(self, stages=(), total=0, done=0, sink="write"):
+        self.total = total
+        self.done = done
+        self.started = time.monotonic()
+        self.stats = {stage.name: StageStats(stage.workers) for stage in stages}
+        self.stats[sink] = StageStats(1)
+        self._lock = threading.Lock()
+
+    def add_stages(self, stages):
+        """Track stages not known when the Progress was created, ahead of the sink"""
+        with self._lock:
+            added = {stage.name: StageStats(stage.workers) for stage in stages if stage.name not in self.stats}
+            self.stats = {**added, **self.stats}
+
+    def record(self, name, seconds):
+        """Count one item through a stage that took the given time"""
+        with self._lock:
+            stats = self.stats[name]
+            stats.count += 1
+            stats.busy += seconds
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def throughput(self, name):
+        """Items per second through a stage since the export started"""
+        elapsed = self.elapsed()
+        return self.stats[name].count / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        """Return one line per stage: items, throughput and worker utilization"""
+        elapsed = self.elapsed()
+        lines = []
+        for name, stats in self.stats.items():
+            busy = stats.busy / (elapsed * stats.workers) if elapsed > 0 else 0.0
+            lines.append(
+                f"  {name}: {stats.count} issues, {self.throughput(name):.1f}/s "
+                f"({stats.workers} worker{'s' if stats.workers > 1 else ''}, {busy:.0%} busy)"
+            )
+        return lines
+
+
+def print_progress(progress, issue_id):
+    """Default progress callback: one line per exported issue"""
+    print(f"[{progress.done}/{progress.total}] Issue ID {issue_id}")
+
+
+class Pipeline:
+    """Run items through stages on worker threads, connected by bounded queues
+
+    A full queue blocks the stage feeding it, so a slow stage holds back the
+    ones before it instead of letting items pile up in memory. Results are
+    yielded in input order.
+    """
+
+    def __init__(self, stages, queue_size=QUEUE_SIZE, progress=None):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.progress = progress
+        self._stopped = threading.Event()
+        if progress:
+            progress.add_stages(stages)
+
+    def _put(self, q, item):
+        while True:
+            try:
+                q.put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                if self._stopped.is_set():
+                    raise _Stopped()
+
+    def _get(self, q):
+        while True:
+            try:
+                return q.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if self._stopped.is_set():
+                    raise _Stopped()
+
+    def _feed(self, items, first, slots, workers):
+        try:
+            for seq, item in enumerate(items):
+                while not slots.acquire(timeout=_POLL_INTERVAL):
+                    if self._stopped.is_set():
+                        return
+                self._put(first, (seq, item, item, None))
+            for _ in range(workers):
+                self._put(first, _DONE)
+        except _Stopped:
+            pass
+
+    def _process(self, stage, envelope):
+        seq, item, value, error = envelope
+        if error is None:
+            start = time.monotonic()
+            try:
+                value = stage.fn(value)
+            except Exception as e:
+                value, error = None, e
+            if self.progress:
+                self.progress.record(stage.name, time.monotonic() - start)
+        return seq, item, value, error
+
+    def _work(self, stage, source, sink, finished, next_workers):
+        pending = {}
+        next_seq = 0
+        try:
+            while True:
+                envelope = self._get(source)
+                if envelope is _DONE:
+                    break
+                if not stage.ordered:
+                    self._put(sink, self._process(stage, envelope))
+                    continue
+                pending[envelope[0]] = envelope
+                while next_seq in pending:
+                    self._put(sink, self._process(stage, pending.pop(next_seq)))
+                    next_seq += 1
+            # The last worker of a stage to finish tells the next stage
+            with finished["lock"]:
+                finished["count"] += 1
+                last = finished["count"] == stage.workers
+            if last:
+                for _ in range(next_workers):
+                    self._put(sink, _DONE)
+        except _Stopped:
+            pass
+
+    def run(self, items, deadline=None):
+        """Yield (item, result, exception) for each item, in input order
+
+        exception is None unless a stage raised for the item, in which case
+        the item skipped the remaining stages. Closing the generator early
+        stops the pipeline threads. At deadline (a time.monotonic() value),
+        the pipeline stops: the items finished by then are yielded, and the
+        rest with DeadlineExceeded.
+        """
+        items = list(items)
+        queues = [queue.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        # Bounds the items in flight, including those waiting to be reordered
+        slots = threading.Semaphore(self.queue_size * len(queues) + sum(s.workers for s in self.stages))
+        threads = [threading.Thread(
+            target=self._feed, args=(items, queues[0], slots, self.stages[0].workers), daemon=True,
+        )]
+        for i, stage in enumerate(self.stages):
+            next_workers = self.stages[i + 1].workers if i + 1 < len(self.stages) else 1
+            finished = {"lock": threading.Lock(), "count": 0}
+            for _ in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work, args=(stage, queues[i], queues[i + 1], finished, next_workers),
+                    name=f"export-{stage.name}", daemon=True,
+                ))
+        for thread in threads:
+            thread.start()
+
+        pending = {}
+        next_seq = 0
+        try:
+            while next_seq < len(items):
+                try:
+                    if deadline is None:
+                        envelope = queues[-1].get()
+                    else:
+                        envelope = queues[-1].get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if envelope is _DONE:
+                    break
+                pending[envelope[0]] = envelope
+                while next_seq in pending:
+                    _, item, value, error = pending.pop(next_seq)
+                    next_seq += 1
+                    slots.release()
+                    if self.progress:
+                        self.progress.done += 1
+                    yield item, value, error
+
+            # Deadline reached: stop the stages, keeping what already came out
+            self._stopped.set()
+            while True:
+                try:
+                    envelope = queues[-1].get_nowait()
+                except queue.Empty:
+                    break
+                if envelope is not _DONE:
+                    pending[envelope[0]] = envelope
+            for seq in range(next_seq, len(items)):
+                if seq in pending:
+                    _, item, value, error = pending.pop(seq)
+                    if self.progress:
+                        self.progress.done += 1
+                    yield item, value, error
+                else:
+                    yield items[seq], None, DeadlineExceeded()
+        finally:
+            self._stopped.set()
+
+
+def issue_stages(load, render, workers=None, ordered=False, raw=False, tags=None):
+    """Return the fetch, decode and render stages of an issue export
+
+    load(issue_id) returns the raw (issue, event) dicts, and
+    render(issue_id, issue, event) the text of the parsed issue; the
+    pipeline yields an ExportResult per issue ID. workers overrides
+    STAGE_WORKERS per stage. ordered renders issues in input order. The
+    raw dicts are dropped once parsed, unless raw is set. With tags, a
+    tags stage after fetch stores tags(issue_id) on each result.
+    """
+    workers = {**STAGE_WORKERS, **(workers or {})}
+
+    def fetch(issue_id):
+        start = time.monotonic()
+        result = ExportResult(issue_id)
+        result.raw_issue, result.raw_event = load(issue_id)
+        result.timings["fetch"] = time.monotonic() - start
+        return result
+
+    def fetch_tags(result):
+        start = time.monotonic()
+        result.tags = tags(result.issue_id)
+        result.timings["tags"] = time.monotonic() - start
+        return result
+
+    def decode(result):
+        start = time.monotonic()
+        result.issue = parse_issue(result.raw_issue)
+        result.event = parse_event(result.raw_event)
+        if not raw:
+            result.raw_issue = result.raw_event = None
+        result.timings["decode"] = time.monotonic() - start
+        return result
+
+    def render_issue(result):
+        start = time.monotonic()
+        result.text = render(result.issue_id, result.issue, result.event)
+        result.timings["render"] = time.monotonic() - start
+        return result
+
+    stages = [Stage("fetch", fetch, workers["fetch"])]
+    if tags:
+        stages.append(Stage("tags", fetch_tags, workers["tags"]))
+    stages.append(Stage("decode", decode, workers["decode"]))
+    stages.append(Stage("render", render_issue, workers["render"], ordered=ordered))
+    return stages
@@ -0,0 +1,77 @@
+"""Route pasted Sentry issue URLs to the configured profile for their host."""
+
+import re
+
+# https://sentry.example.com/organizations/{org}/issues/{id}/
+ISSUE_URL_PATTERN = re.compile(r'https?://([^/\s]+)/organizations/([^/\s]+)/issues/(\d+)')
+# https://{org}.sentry.io/issues/{id}/ (SaaS organization subdomains)
+SAAS_ISSUE_URL_PATTERN = re.compile(r'https?://([^/.\s]+)\.sentry\.io/issues/(\d+)')
+
+BASE_URL_PATTERN = re.compile(r'https?://([^/]+)/api/\d+/(?:projects|organizations)/([^/]+)')
+
+
+def normalize_host(host):
+    """Lowercase a host and fold SaaS subdomains (org or region) into sentry.io"""
+    host = host.lower()
+    if host.endswith('.sentry.io'):
+        return 'sentry.io'
+    return host
+
+
+def parse_issue_urls(text):
+    """Return (host, org, issue_id) for every Sentry issue URL in text, in order"""
+    matches = []
+    for match in ISSUE_URL_PATTERN.finditer(text):
+        host, org, issue_id = match.groups()
+        matches.append((match.start(), normalize_host(host), org, issue_id))
+    for match in SAAS_ISSUE_URL_PATTERN.finditer(text):
+        org, issue_id = match.groups()
+        matches.append((match.start(), 'sentry.io', org, issue_id))
+    matches.sort()
+    return [(host, org, issue_id) for _, host, org, issue_id in matches]
+
+
+def profile_location(base_url):
+    """Return (host, org) served by a configured base_url; org may be None"""
+    match = BASE_URL_PATTERN.match(base_url or '')
+    if match:
+        return normalize_host(match.group(1)), match.group(2)
+    match = re.match(r'https?://([^/]+)', base_url or '')
+    return (normalize_host(match.group(1)) if match else None), None
+
+
+def route_issue_urls(urls, profiles, default=None):
+    """Group parsed issue URLs by the profile that serves their host and org
+
+    urls comes from parse_issue_urls and profiles maps profile name to its
+    settings (see load_profiles). A profile for the same host and org wins;
+    otherwise any profile on the same host is used, since issue endpoints
+    are not scoped by organization. With default, the name of the default
+    profile, URLs no profile matches go to it when it is the only profile
+    or when no URL matched any profile, as before URLs were routed.
+
+    Returns ({profile name: [index, ...]}, [index, ...]) with indexes into
+    urls, so callers can keep the original order; the second item lists
+    URLs no profile could serve.
+    """
+    by_location = {}
+    by_host = {}
+    for name, settings in profiles.items():
+        host, org = profile_location(settings.get('base_url'))
+        if host is None:
+            continue
+        by_location.setdefault((host, org), name)
+        by_host.setdefault(host, name)
+
+    routed = {}
+    unrouted = []
+    for index, (host, org, _) in enumerate(urls):
+        name = by_location.get((host, org)) or by_host.get(host)
+        if name is None:
+            unrouted.append(index)
+        else:
+            routed.setdefault(name, []).append(index)
+    if unrouted and default in profiles and (len(profiles) == 1 or not routed):
+        routed[default] = sorted(routed.get(default, []) + unrouted)
+        unrouted = []
+    return routed, unrouted
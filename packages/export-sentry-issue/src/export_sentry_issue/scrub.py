@@ -0,0 +1,362 @@
+"""Redact sensitive values from rendered issue fields."""
+
+import json
+import re
+
+from .config import read_config
+
+REPLACEMENT = "[Filtered]"
+
+# Values stored under key names ending with one of these are redacted. Key
+# names are compared without case and separators, so access_token,
+# X-Api-Key and sessionId match, but token_count and tokenizer do not.
+DEFAULT_KEYS = (
+    'password', 'passwd', 'pwd', 'secret', 'secret_key', 'token', 'api_key',
+    'access_key', 'private_key', 'authorization', 'cookie', 'session',
+    'session_id', 'csrf', 'credit_card', 'card_number', 'cvv', 'ssn',
+)
+
+# Values under these key names are never redacted: releases such as
+# "app@1.2.3" identify a build, not a person
+PRESERVED_KEYS = ('release',)
+
+# Values redacted wherever they appear, matched case-insensitively
+DEFAULT_PATTERNS = {
+    'email': r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}\b",
+    'card': r"\d(?<!\w\d)(?:[ -]?\d){12,18}\b",
+    'bearer': r"bearer\s+[\w.~+/-]+=*",
+    'jwt': r"eyj[\w-]+\.[\w-]+\.[\w-]+",
+    'aws_key': r"akia[0-9a-z]{16}\b",
+}
+
+# The built-in patterns as they are compiled into the combined regex:
+# (trigger characters, pattern after the trigger, rule). Rules are "email"
+# (extend back over the local part), "card" (check the Luhn sum), or how
+# many characters before the trigger the redacted span starts.
+#
+# Each alternative of the combined regex starts with one trigger character,
+# so the regex engine skips straight from one candidate position to the
+# next, and at a candidate tries only the alternatives for its character;
+# a lookbehind then checks what comes before the trigger. An email is found
+# from its "@domain" part, then extended back over the local part (at most
+# 64 characters).
+_TRIGGERED = {
+    'email': ("@", r"[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}\b", 'email'),
+    'card': ("0123456789", r"(?<!\w\d)(?:[ -]?\d){12,18}\b", 'card'),
+    'bearer': ("b", r"earer\s+[\w.~+/-]+=*", 0),
+    'jwt': ("j", r"(?<=eyj)[\w-]+\.[\w-]+\.[\w-]+", 2),
+    'aws_key': ("k", r"(?<=ak)ia[0-9a-z]{16}\b", 1),
+}
+
+# Inline "key=value", "key: value" and "'key': 'value'" pairs, as found in
+# query strings and dict reprs, found from the ":" or "=". Only the value
+# is redacted.
+_KEY_VALUE = r"{keys}\s*(?P<{value}>'[^'\n\0]*'|\"[^\"\n\0]*\"|(?:bearer\s+)?[^\s,;&}}()\]\0]+)"
+_KEY_QUOTES = ("", "'", '"', " ")
+
+_EMAIL_LOCAL = re.compile(r"[\w.+-]+\Z")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+# The values of one rendering are scanned as one string, joined with NUL,
+# which no built-in rule matches across. Until then, a NUL marks where each
+# value goes in the rendered text (see ScrubBatch).
+_JOIN = "\0"
+
+# What scrub_item does with the values of a key name
+_KEEP, _REDACT, _SCAN = "keep", "redact", "scan"
+
+# Lowercases ASCII letters only, so offsets in the result match the original
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# Scrub results of short values are cached, up to this many values
+_CACHED_LENGTH = 256
+_CACHED_VALUES = 10000
+
+
+def _truncate(text, limit):
+    """Cut text to limit characters, marking the cut with "..." """
+    if limit is not None and len(text) > limit:
+        return text[:limit] + "..."
+    return text
+
+
+def _luhn_valid(digits):
+    """Check the Luhn checksum, so long numeric IDs are not taken for card numbers"""
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        n = int(digit)
+        if i % 2:
+            n = n * 2 - 9 if n > 4 else n * 2
+        total += n
+    return total % 10 == 0
+
+
+def _trie_pattern(words):
+    """Return a regex matching any of the words, as a trie of alternatives
+
+    passwd|password|pwd becomes p(?:assw(?:d|ord)|wd): the engine tests one
+    branch per character instead of every word.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A word that ends here makes the rest optional
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return build(trie)
+
+
+def _key_lookbehind(keys):
+    """Return lookbehinds matching a key name, as written inline, before a ":" or "="
+
+    api_key is written as api_key, api-key or apikey, and may be quoted or
+    followed by a space. A lookbehind needs a fixed width, so there is one
+    per length.
+    """
+    names = set()
+    for key in keys:
+        parts = key.lower().split('_')
+        for spelling in {''.join(parts), '_'.join(parts), '-'.join(parts)}:
+            names.update(spelling + quote for quote in _KEY_QUOTES)
+    by_length = {}
+    for name in names:
+        by_length.setdefault(len(name), []).append(name)
+    last_chars = re.escape(''.join(sorted({name[-1] for name in names})))
+    lookbehinds = "|".join(f"(?<={_trie_pattern(by_length[length])}[:=])" for length in sorted(by_length))
+    # Most separators follow none of the keys' last characters
+    return f"(?<=[{last_chars}][:=])(?:{lookbehinds})"
+
+
+def _lower(text):
+    # lower() keeps the length of ASCII strings and is much faster
+    return text.lower() if text.isascii() else text.translate(_ASCII_LOWER)
+
+
+class Scrubber:
+    """Scrubbing rules for values and key names, compiled once
+
+    All rules are alternatives of one regex, and each value is scanned
+    once. The regex runs case-sensitively over the lowercased value, with
+    the built-in rules starting at trigger characters (see _TRIGGERED).
+    Patterns added in config.json have no trigger: with any of them, every
+    position of a value is a candidate, which makes scrubbing slower.
+    """
+
+    def __init__(self, keys=DEFAULT_KEYS, patterns=None, replacement=REPLACEMENT, preserved_keys=PRESERVED_KEYS):
+        self.replacement = replacement
+        patterns = DEFAULT_PATTERNS if patterns is None else patterns
+
+        # Every alternative ends with an empty group, which names its rule
+        # in self._rules once it matched. A rule is as in _TRIGGERED, or the
+        # name of the group holding the value of a key=value pair.
+        self._rules = {}
+        alternatives = []
+
+        def add(pattern, rule):
+            group = f"_{len(self._rules)}"
+            self._rules[group] = rule
+            alternatives.append(f"{pattern}(?P<{group}>)")
+
+        if keys:
+            lookbehind = _key_lookbehind(keys)
+            for trigger in ":=":
+                value = f"_{len(self._rules)}_value"
+                add(trigger + _KEY_VALUE.format(keys=lookbehind, value=value), value)
+        for name, pattern in patterns.items():
+            if pattern == DEFAULT_PATTERNS.get(name):
+                triggers, after, rule = _TRIGGERED[name]
+                for trigger in triggers:
+                    add(re.escape(trigger) + after, rule)
+            else:
+                add(f"(?i:{pattern})", 0)
+        self.regex = re.compile("|".join(alternatives)) if alternatives else None
+
+        self._key_suffixes = tuple(_SEPARATORS.sub("", key.lower()) for key in keys)
+        self._preserved_keys = frozenset(key.lower() for key in preserved_keys)
+        self._key_actions = {}
+        self._scrubbed = {}
+
+    def scrub(self, value, limit=None):
+        """Return the value as a string with every sensitive part replaced
+
+        With limit, the result is cut to that many characters (see
+        _truncate), after scrubbing, so a cut cannot split a secret.
+        """
+        text = str(value)
+        # Short values such as variable reprs repeat across frames and events
+        scrubbed = self._scrubbed.get(text)
+        if scrubbed is None:
+            scrubbed = self._scrub_text(text)
+            if len(text) <= _CACHED_LENGTH and len(self._scrubbed) < _CACHED_VALUES:
+                self._scrubbed[text] = scrubbed
+        return _truncate(scrubbed, limit)
+
+    def _scrub_text(self, text):
+        if self.regex is None:
+            return text
+        lowered = _lower(text)
+        parts = []
+        position = 0
+        for match in self.regex.finditer(lowered):
+            rule = self._rules[match.lastgroup]
+            start, end = match.span()
+            if rule == 'email':
+                local = _EMAIL_LOCAL.search(lowered, max(position, start - 64), start)
+                if not local:
+                    continue
+                start = local.start()
+            elif rule == 'card':
+                if not _luhn_valid(re.sub(r"\D", "", match.group())):
+                    continue
+            elif isinstance(rule, str):
+                start, end = match.span(rule)
+                if lowered[start] in "'\"":
+                    # Keep the quotes around the redacted value
+                    start, end = start + 1, end - 1
+            else:
+                start = max(position, start - rule)
+            parts.append(text[position:start])
+            parts.append(self.replacement)
+            position = end
+        if not parts:
+            return text
+        parts.append(text[position:])
+        return "".join(parts)
+
+    def is_sensitive_key(self, key):
+        """Whether values stored under this key name are redacted entirely"""
+        return self._key_action(key) is _REDACT
+
+    def _key_action(self, key):
+        """Return _KEEP, _REDACT or _SCAN for the values stored under a key name"""
+        # Key names repeat across frames and breadcrumbs; check each one once
+        action = self._key_actions.get(key)
+        if action is None:
+            name = str(key).lower()
+            if name in self._preserved_keys:
+                action = _KEEP
+            elif _SEPARATORS.sub("", name).endswith(self._key_suffixes):
+                action = _REDACT
+            else:
+                action = _SCAN
+            self._key_actions[key] = action
+        return action
+
+    def scrub_item(self, key, value, limit=None):
+        """Scrub a value from a mapping, taking its key name into account"""
+        action = self._key_action(key)
+        if action is _SCAN:
+            return self.scrub(value, limit)
+        if action is _REDACT:
+            return self.replacement
+        return _truncate(str(value), limit)
+
+    def batch(self):
+        """Return a ScrubBatch scrubbing the values of one rendering in a single scan"""
+        return ScrubBatch(self)
+
+
+class ScrubBatch:
+    """Scrub the values rendered into one text with one scan of the regex
+
+    scrub and scrub_item work as on the Scrubber, but leave a NUL in place
+    of each value to be scanned. resolve then scans all the values at once,
+    joined into one string, and puts the results in place of the NULs. This
+    saves a regex call per value, which is most of the cost when an event
+    has thousands of short fields.
+    """
+
+    def __init__(self, scrubber):
+        self.scrubber = scrubber
+        self._values = []
+        self._limits = {}
+
+    def scrub(self, value, limit=None):
+        if limit is not None:
+            self._limits[len(self._values)] = limit
+        self._values.append(str(value))
+        return _JOIN
+
+    def scrub_item(self, key, value, limit=None):
+        scrubber = self.scrubber
+        action = scrubber._key_action(key)
+        if action is _SCAN:
+            return self.scrub(value, limit)
+        if action is _REDACT:
+            return scrubber.replacement
+        return _truncate(str(value), limit)
+
+    def resolve(self, text):
+        """Return text with the scrubbed values in place, or None if it has NULs of its own"""
+        values = self._values
+        pieces = text.split(_JOIN)
+        if len(pieces) != len(values) + 1:
+            return None
+        if not values:
+            return text
+        scrubbed = self.scrubber._scrub_text(_JOIN.join(values)).split(_JOIN)
+        if len(scrubbed) != len(values):
+            # A pattern from config.json matched across two values
+            scrubbed = [self.scrubber.scrub(value) for value in values]
+        for index, limit in self._limits.items():
+            scrubbed[index] = _truncate(scrubbed[index], limit)
+        parts = [None] * (2 * len(values) + 1)
+        parts[::2] = pieces
+        parts[1::2] = scrubbed
+        return "".join(parts)
+
+
+class NullScrubber:
+    """Stand-in used when scrubbing is disabled; values pass through unchanged"""
+
+    def scrub(self, value, limit=None):
+        return value if limit is None else _truncate(str(value), limit)
+
+    def scrub_item(self, key, value, limit=None):
+        return self.scrub(value, limit)
+
+    def batch(self):
+        return self
+
+    def resolve(self, text):
+        return text
+
+
+NO_SCRUBBING = NullScrubber()
+
+_scrubber_cache: dict[str, Scrubber] = {}
+
+
+def get_scrubber(enabled=None):
+    """Return the Scrubber configured under "scrub" in config.json, or None
+
+    Settings extend the defaults: {"enabled": true, "keys": [...],
+    "patterns": {"name": "regex"}, "replacement": "..."}. Scrubbing is off
+    unless enabled there; enabled overrides the configured on/off switch.
+    Compiled scrubbers are cached per settings.
+    """
+    data, _ = read_config()
+    settings = (data or {}).get('scrub') or {}
+    if enabled is None:
+        enabled = settings.get('enabled', False)
+    if not enabled:
+        return None
+
+    cache_key = json.dumps(settings, sort_keys=True)
+    scrubber = _scrubber_cache.get(cache_key)
+    if scrubber is None:
+        scrubber = _scrubber_cache[cache_key] = Scrubber(
+            keys=DEFAULT_KEYS + tuple(settings.get('keys', ())),
+            patterns={**DEFAULT_PATTERNS, **settings.get('patterns', {})},
+            replacement=settings.get('replacement', REPLACEMENT),
+        )
+    return scrubber
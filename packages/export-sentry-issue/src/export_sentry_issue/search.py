@@ -0,0 +1,162 @@
+"""Local full-text search index over exported issues (SQLite FTS5)."""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from .config import INDEX_FILE, ensure_config_dir
+from .models import parse_issue, parse_event
+from .scrub import NO_SCRUBBING
+
+DEFAULT_INDEX_FILE = INDEX_FILE
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_key TEXT NOT NULL UNIQUE
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS issues USING fts5(
+    title, message, exceptions, frames, breadcrumbs, tags,
+    issue_id UNINDEXED, permalink UNINDEXED, output_file UNINDEXED, exported_at UNINDEXED
+);
+"""
+
+
+def quote_query(query):
+    """Turn free text into an FTS5 query matching all terms literally"""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+class SearchIndex:
+    """Full-text index of issue titles, exceptions, frames, breadcrumbs and tags
+
+    With a scrubber (see get_scrubber), text is scrubbed before it is
+    indexed, as in the exported files, so search snippets never show values
+    the export redacted.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_FILE, scrubber=None):
+        self.path = Path(path)
+        self.scrubber = scrubber or NO_SCRUBBING
+        if self.path == DEFAULT_INDEX_FILE:
+            ensure_config_dir()
+        self.conn = sqlite3.connect(str(path))
+        try:
+            self.conn.executescript(_SCHEMA)
+        except sqlite3.OperationalError as e:
+            self.conn.close()
+            if "fts5" in str(e):
+                raise RuntimeError("The search index requires SQLite with FTS5 support") from e
+            raise
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_issue(self, issue, event, output_file=None):
+        """Index (or re-index) an issue and its latest event
+
+        Accepts raw dicts or the Issue/Event objects used by the formatter.
+        Issues are keyed by permalink, so the same ID on different Sentry
+        instances does not collide.
+        """
+        issue = parse_issue(issue)
+        event = parse_event(event)
+        scrubber = self.scrubber
+
+        exceptions = []
+        frames = []
+        breadcrumbs = []
+        tags = []
+        if event:
+            for entry in event.entries_of('exception'):
+                for exc in entry.values:
+                    exceptions.append(f"{exc.type} {scrubber.scrub(exc.value)}")
+                    for frame in exc.frames or ():
+                        frames.append(f"{frame.filename} {frame.function}")
+            entry = event.entry('breadcrumbs')
+            if entry:
+                for bc in entry.values:
+                    breadcrumbs.append(f"{bc.category} {scrubber.scrub(bc.message)}")
+            for key, value in event.tags or ():
+                tags.append(f"{key} {scrubber.scrub_item(key, value)}")
+
+        metadata = issue.metadata or {}
+        message = f"{metadata.get('type', '')} {scrubber.scrub(metadata.get('value', ''))}".strip()
+
+        doc_key = issue.permalink if issue.permalink not in (None, 'N/A') else f"id:{issue.id}"
+        cursor = self.conn.execute("SELECT id FROM documents WHERE doc_key = ?", (doc_key,))
+        row = cursor.fetchone()
+        if row:
+            doc_id = row[0]
+            self.conn.execute("DELETE FROM issues WHERE rowid = ?", (doc_id,))
+        else:
+            doc_id = self.conn.execute("INSERT INTO documents (doc_key) VALUES (?)", (doc_key,)).lastrowid
+
+        self.conn.execute(
+            "INSERT INTO issues (rowid, title, message, exceptions, frames, breadcrumbs, tags,"
+            " issue_id, permalink, output_file, exported_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                doc_id,
+                scrubber.scrub(issue.title),
+                message,
+                "\n".join(exceptions),
+                "\n".join(frames),
+                "\n".join(breadcrumbs),
+                "\n".join(tags),
+                str(issue.id),
+                issue.permalink,
+                str(output_file) if output_file else None,
+                datetime.now().isoformat(timespec='seconds'),
+            ),
+        )
+
+    def search(self, query, limit=20, raw=False):
+        """Return matching issues, best match first
+
+        Free text matches all terms; pass raw=True to use FTS5 query syntax
+        (e.g. 'frames:views.py AND tags:prod').
+        """
+        match = query if raw else quote_query(query)
+        if not match:
+            return []
+        cursor = self.conn.execute(
+            "SELECT issue_id, title, permalink, output_file, exported_at,"
+            " snippet(issues, -1, '[', ']', '...', 12)"
+            " FROM issues WHERE issues MATCH ? ORDER BY rank LIMIT ?",
+            (match, limit),
+        )
+        return [
+            {
+                "issue_id": issue_id,
+                "title": title,
+                "permalink": permalink,
+                "output_file": output_file,
+                "exported_at": exported_at,
+                "snippet": snippet,
+            }
+            for issue_id, title, permalink, output_file, exported_at, snippet in cursor
+        ]
+
+
+def format_search_results(results):
+    """Format search results as plain text"""
+    if not results:
+        return "No matching issues found."
+    output = []
+    for result in results:
+        output.append(f"Issue {result['issue_id']}: {result['title']}")
+        output.append(f"  Match: {result['snippet']}")
+        if result['output_file']:
+            output.append(f"  File: {result['output_file']}")
+        output.append(f"  Permalink: {result['permalink']}")
+        output.append("")
+    return "\n".join(output)
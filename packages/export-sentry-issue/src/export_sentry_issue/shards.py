@@ -0,0 +1,56 @@
+"""One-file-per-issue output with a manifest of sizes and checksums."""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+MANIFEST_FILE = "manifest.json"
+TRENDS_FILE = "trends.txt"
+TAGS_FILE = "tags.txt"
+
+# Writes overlap with fetching and rendering the next issues
+WRITER_THREADS = 4
+
+
+def issue_file_path(directory, issue_id):
+    """Return the output file of a single issue"""
+    return Path(directory) / f"issue_{issue_id}.txt"
+
+
+def describe_issue_file(path):
+    """Return the manifest fields (file, bytes, sha256) of an issue file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return {"file": path.name, "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def write_issue_file(path, text):
+    """Write an issue file atomically and return its manifest fields
+
+    The content goes to a temporary file that is renamed into place, so a
+    reader never sees a partially written issue.
+    """
+    data = text.encode("utf-8")
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return {"file": path.name, "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def write_manifest(directory, issues, failed, unfinished=()):
+    """Write manifest.json listing the issue files, failed and unfinished issue IDs"""
+    manifest = {
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "issues": issues,
+        "failed": failed,
+        "unfinished": list(unfinished),
+    }
+    path = Path(directory) / MANIFEST_FILE
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,46 @@
+"""Print each frame's source context once per output."""
+
+import hashlib
+
+
+class SnippetStore:
+    """Source context snippets already written to one output
+
+    Frames passing through the same framework and library code repeat the
+    same snippet in issue after issue. A snippet seen before (same file,
+    line and code) is replaced by a reference to its first occurrence. With
+    in_app_only, frames outside the application get no snippet at all.
+    """
+
+    def __init__(self, in_app_only=False):
+        self.in_app_only = in_app_only
+        self.labels = {}
+
+    def add(self, frame):
+        """Return (label, first occurrence) for a frame's snippet
+
+        The label is None when the snippet is omitted. Labels are derived
+        from the snippet itself, so they stay the same when an interrupted
+        export is resumed with a new store.
+        """
+        if self.in_app_only and not frame.in_app:
+            return None, False
+        key = (frame.filename, frame.lineno, tuple(line[1] for line in frame.context))
+        label = self.labels.get(key)
+        if label is not None:
+            return label, False
+        # 64 bits: labels only ever need to tell apart the snippets of one output
+        label = self.labels[key] = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=8).hexdigest()
+        return label, True
+
+    def forget(self, count):
+        """Forget every snippet but the first count added, e.g. those of a discarded rendering"""
+        for key in list(self.labels)[count:]:
+            del self.labels[key]
+
+
+def get_snippet_store(mode="all"):
+    """Return a SnippetStore for a snippet mode (see SNIPPET_MODES), or None for "all" """
+    if mode == "all":
+        return None
+    return SnippetStore(in_app_only=(mode == "in-app"))
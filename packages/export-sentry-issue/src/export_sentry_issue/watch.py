@@ -0,0 +1,226 @@
+"""Poll a project's issues list and stream new and regressed issues to a file."""
+
+import os
+import time
+from datetime import datetime, timezone
+
+import requests
+
+from .config import parse_base_url
+from .routing import profile_location
+from .core import fetch_event, format_issue_to_text, get_project_issues, get_session
+from .scrub import get_scrubber
+
+DEFAULT_QUERY = "is:unresolved"
+
+# Seconds between polls: back to MIN_INTERVAL after a change, growing by
+# BACKOFF per quiet poll up to MAX_INTERVAL
+MIN_INTERVAL = 15
+MAX_INTERVAL = 300
+BACKOFF = 1.5
+
+# Pages followed per poll; only issues seen since the previous poll are read
+MAX_PAGES = 5
+
+# The output file is rotated to .1, .2, ... once it grows past MAX_BYTES
+MAX_BYTES = 10 * 1024 * 1024
+BACKUPS = 3
+
+
+def parse_timestamp(value):
+    """Parse a Sentry ISO 8601 timestamp (None if missing or invalid)"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def next_interval(interval, changed, minimum=MIN_INTERVAL, maximum=MAX_INTERVAL):
+    """Poll again soon after a change, and back off while nothing happens"""
+    if changed:
+        return minimum
+    return min(maximum, interval * BACKOFF)
+
+
+class RollingOutput:
+    """Text file appended to as issues arrive, rotated when it grows too large"""
+
+    def __init__(self, path, max_bytes=MAX_BYTES, backups=BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def write(self, text):
+        data = text.encode("utf-8")
+        if os.path.exists(self.path) and os.path.getsize(self.path) + len(data) > self.max_bytes:
+            self._rotate()
+        with open(self.path, "ab") as f:
+            f.write(data)
+
+
+class IssueWatcher:
+    """Find issues that are new or regressed since the previous poll
+
+    The issues list is requested sorted by last seen, so each poll only
+    reads until the first issue not seen since the previous poll, and the
+    first page is requested with the ETag of the previous response.
+    """
+
+    def __init__(self, base_url, token, query=DEFAULT_QUERY, session=None, since=None):
+        self.base_url = base_url
+        self.token = token
+        self.query = query
+        self.session = session
+        # Issues first seen after this are new
+        self.started = since or datetime.now(timezone.utc)
+        self.high_water = self.started
+        self.etag = None
+        self.last_seen = {}
+        self.statuses = {}
+        self.regressed = set()
+        self.requests = 0
+        self.unchanged = 0
+        self.reported = 0
+
+    def _classify(self, issue):
+        issue_id = str(issue.get('id'))
+        previous_status = self.statuses.get(issue_id)
+        self.statuses[issue_id] = issue.get('status')
+
+        regressed = issue.get('substatus') == 'regressed' or (
+            previous_status == 'resolved' and issue.get('status') == 'unresolved'
+        )
+        if not regressed:
+            self.regressed.discard(issue_id)
+        elif issue_id not in self.regressed:
+            # Report each regression once, however many events follow
+            self.regressed.add(issue_id)
+            return "Regression"
+
+        first_seen = parse_timestamp(issue.get('firstSeen'))
+        if first_seen and first_seen >= self.started and issue_id not in self.last_seen:
+            return "New issue"
+        return None
+
+    def poll(self):
+        """Return [(issue, reason)] for issues new or regressed since the last poll"""
+        candidates = []
+        newest = self.high_water
+        cursor = None
+        for page in range(MAX_PAGES):
+            issues, cursor, etag = get_project_issues(
+                self.base_url, self.token, cursor, self.query,
+                None if page else self.etag, self.session,
+            )
+            self.requests += 1
+            if issues is None:
+                self.unchanged += 1
+                break
+            if not page:
+                self.etag = etag
+
+            reached_seen = False
+            for issue in issues:
+                last_seen = parse_timestamp(issue.get('lastSeen'))
+                if last_seen is None:
+                    continue
+                if last_seen < self.high_water:
+                    reached_seen = True
+                    break
+                newest = max(newest, last_seen)
+                candidates.append(issue)
+            if reached_seen or not cursor:
+                break
+
+        changed = []
+        for issue in candidates:
+            issue_id = str(issue.get('id'))
+            if self.last_seen.get(issue_id) == issue.get('lastSeen'):
+                continue
+            reason = self._classify(issue)
+            self.last_seen[issue_id] = issue.get('lastSeen')
+            if reason:
+                changed.append((issue, reason))
+        self.high_water = newest
+        return changed
+
+
+def _retry_after(error):
+    """Seconds requested by a 429 response, or None for other errors"""
+    response = getattr(error, 'response', None)
+    if response is None or response.status_code != 429:
+        return None
+    try:
+        return float(response.headers.get('Retry-After', MAX_INTERVAL))
+    except ValueError:
+        return MAX_INTERVAL
+
+
+def watch_issues(base_url, token, output_file, query=DEFAULT_QUERY, interval=MIN_INTERVAL,
+                 max_interval=MAX_INTERVAL, max_bytes=MAX_BYTES, session=None, scrub=None,
+                 polls=None, fetch="full"):
+    """Poll the project issues list and append new and regressed issues to output_file
+
+    Only issues that changed are rendered, from the list entry plus one
+    request for their latest event (none with fetch="header"; see
+    fetch_event). Runs until interrupted, or for the given number of polls.
+    Returns the IssueWatcher with request counts.
+    """
+    base_api_url = parse_base_url(base_url)
+    organization = profile_location(base_url)[1]
+    session = session or get_session()
+    scrubber = get_scrubber(scrub)
+    watcher = IssueWatcher(base_url, token, query, session)
+    output = RollingOutput(output_file, max_bytes)
+    delay = interval
+    count = 0
+
+    print(f"Watching {base_url} (query: {query or 'all issues'})")
+    print(f"Output file: {os.path.abspath(output_file)}")
+    try:
+        while polls is None or count < polls:
+            count += 1
+            try:
+                changed = watcher.poll()
+            except requests.exceptions.RequestException as e:
+                retry_after = _retry_after(e)
+                delay = retry_after if retry_after is not None else min(max_interval, delay * 2)
+                print(f"  ✗ Poll failed: {e}; retrying in {delay:.0f}s")
+                changed = None
+
+            for issue, reason in changed or ():
+                issue_id = issue.get('id')
+                print(f"[{datetime.now():%H:%M:%S}] {reason}: {issue_id} {issue.get('title', '')}")
+                try:
+                    event = fetch_event(base_api_url, token, issue_id, session, fetch, organization)
+                    if fetch != "header":
+                        watcher.requests += 1
+                    text = format_issue_to_text(issue, event, scrubber=scrubber, fetch=fetch)
+                except Exception as e:
+                    text = f"Error processing Issue {issue_id}: {str(e)}"
+                output.write(f"{reason} at {datetime.now().isoformat(timespec='seconds')}\n"
+                             f"{text}\n\n" + "=" * 80 + "\n\n")
+                watcher.reported += 1
+
+            if changed is not None:
+                delay = next_interval(delay, bool(changed), interval, max_interval)
+            if polls is None or count < polls:
+                time.sleep(delay)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+    print(f"Polls: {count} ({watcher.unchanged} unchanged)")
+    print(f"API requests: {watcher.requests}")
+    print(f"Issues reported: {watcher.reported}")
+    return watcher
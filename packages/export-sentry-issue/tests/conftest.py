@@ -0,0 +1,55 @@
+"""Issue and event payloads shaped like Sentry API responses, shared by the tests"""
+
+import pytest
+
+from export_sentry_issue.archive import save_archive_record
+
+# Issues written to the archive fixture
+ARCHIVED_IDS = [str(i) for i in range(1, 7)]
+
+
+def make_issue(issue_id, value=None, error_type='ValueError', **fields):
+    """Return raw issue details; value is the error message, fields override the rest"""
+    value = f'bad input {issue_id}' if value is None else value
+    issue = {
+        'id': str(issue_id),
+        'title': f'{error_type}: {value}',
+        'status': 'unresolved',
+        'level': 'error',
+        'count': '1',
+        'firstSeen': '2026-10-01T00:00:00Z',
+        'lastSeen': '2026-10-19T00:00:00Z',
+        'permalink': f'https://sentry.example.com/issues/{issue_id}/',
+        'metadata': {'type': error_type, 'value': value},
+    }
+    issue.update(fields)
+    return issue
+
+
+def make_event(issue_id, value=None, error_type='ValueError', frames=None, **fields):
+    """Return a raw latest event with one exception; fields override the rest"""
+    value = f'bad input {issue_id}' if value is None else value
+    if frames is None:
+        frames = [{
+            'filename': 'app/views.py', 'function': f'view_{issue_id}', 'lineNo': 10, 'inApp': True,
+            'context': [[10, f'    handle({issue_id!r})']],
+        }]
+    event = {
+        'eventID': f'event{issue_id}',
+        'entries': [{'type': 'exception', 'data': {'values': [
+            {'type': error_type, 'value': value, 'stacktrace': {'frames': frames}},
+        ]}}],
+        'tags': [{'key': 'release', 'value': 'app@1.2.3'}],
+    }
+    event.update(fields)
+    return event
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """An archive directory holding the issues and events of ARCHIVED_IDS"""
+    directory = tmp_path / "archive"
+    directory.mkdir()
+    for issue_id in ARCHIVED_IDS:
+        save_archive_record(directory, make_issue(issue_id), make_event(issue_id))
+    return directory
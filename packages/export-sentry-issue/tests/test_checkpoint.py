@@ -0,0 +1,82 @@
+import pytest
+
+from export_sentry_issue.checkpoint import journal_path, read_journal
+from export_sentry_issue.core import export_issues_from_archive
+
+from conftest import ARCHIVED_IDS as IDS
+
+
+def _export(archive, output, resume=False, progress=None, ids=IDS):
+    return export_issues_from_archive(str(archive), ids, str(output), resume=resume, progress=progress)
+
+
+def _interrupt_at(stop_id):
+    def progress(tracker, issue_id):
+        if issue_id == stop_id:
+            raise KeyboardInterrupt
+    return progress
+
+
+def test_interrupted_export_resumes_to_identical_output(archive, tmp_path):
+    _export(archive, tmp_path / "full.txt")
+
+    output = tmp_path / "resumed.txt"
+    with pytest.raises(KeyboardInterrupt):
+        _export(archive, output, progress=_interrupt_at('4'))
+    assert [issue_id for issue_id, _, _ in read_journal(journal_path(output))] == ['1', '2', '3']
+    # A block cut off by the crash
+    with open(output, "ab") as f:
+        f.write(b"Issue ID: 4\nTitle: Value")
+
+    _export(archive, output, resume=True)
+    assert output.read_bytes() == (tmp_path / "full.txt").read_bytes()
+    assert not (tmp_path / "resumed.txt.journal").exists()
+
+
+def test_resume_retries_failed_issues(archive, tmp_path):
+    output = tmp_path / "out.txt"
+    (archive / "issue_3.json").rename(tmp_path / "issue_3.json")
+    with pytest.raises(KeyboardInterrupt):
+        _export(archive, output, progress=_interrupt_at('5'))
+    assert "Error: Error processing Issue 3" in output.read_text()
+    assert [(issue_id, ok) for issue_id, _, ok in read_journal(journal_path(output))] == [
+        ('1', True), ('2', True), ('3', False), ('4', True)]
+
+    # The issue is available again: it is exported, and its error block is gone
+    (tmp_path / "issue_3.json").rename(archive / "issue_3.json")
+    _export(archive, output, resume=True)
+    text = output.read_text()
+    assert "Error processing" not in text
+    for issue_id in IDS:
+        assert text.count(f"Issue ID: {issue_id}\n") == 1
+    assert not (tmp_path / "out.txt.compact").exists()
+
+
+def test_resume_refuses_to_overwrite_output_without_journal(archive, tmp_path):
+    output = tmp_path / "done.txt"
+    _export(archive, output)
+    before = output.read_bytes()
+
+    with pytest.raises(FileExistsError):
+        _export(archive, output, resume=True)
+    assert output.read_bytes() == before
+
+
+def test_resume_without_output_starts_a_new_export(archive, tmp_path):
+    _export(archive, tmp_path / "full.txt")
+    _export(archive, tmp_path / "new.txt", resume=True)
+    assert (tmp_path / "new.txt").read_bytes() == (tmp_path / "full.txt").read_bytes()
+
+
+def test_interrupted_compaction_is_undone(archive, tmp_path):
+    output = tmp_path / "out.txt"
+    (archive / "issue_3.json").rename(tmp_path / "issue_3.json")
+    with pytest.raises(KeyboardInterrupt):
+        _export(archive, output, progress=_interrupt_at('5'))
+    # A crash while writing the compacted copy leaves the original untouched
+    (tmp_path / "out.txt.compact").write_bytes(b"partial")
+
+    (tmp_path / "issue_3.json").rename(archive / "issue_3.json")
+    _export(archive, output, resume=True)
+    assert "Error processing" not in output.read_text()
+    assert not (tmp_path / "out.txt.compact").exists()
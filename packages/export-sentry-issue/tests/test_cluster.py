@@ -0,0 +1,79 @@
+from export_sentry_issue.archive import save_archive_record
+from export_sentry_issue.cluster import (
+    DEFAULT_THRESHOLD, cluster_issues, cluster_signatures, issue_features, minhash, normalize_message, similarity,
+)
+from export_sentry_issue.core import export_issues_from_archive
+
+from conftest import make_event, make_issue
+
+
+def _issue(issue_id, value, error_type='KeyError', count=1, filename='app/views.py', function='handle'):
+    issue = make_issue(issue_id, value, error_type, count=str(count))
+    issue['metadata'].update(filename=filename, function=function)
+    return issue
+
+
+def test_normalize_message_ignores_numbers_addresses_and_hashes():
+    assert normalize_message("user 1234 at 0x7fff12ab in main.3f9a2c1d.js") == "user # at # in main.#.js"
+
+
+def test_messages_differing_in_numbers_cluster():
+    issues = [
+        _issue('1', "'user_id' missing in request 1234 at 0x7fff12ab", count=2),
+        _issue('2', "'user_id' missing in request 98 at 0x7ff0aa01", count=9),
+        _issue('3', "database timed out", error_type='TimeoutError', filename='app/db.py', function='query'),
+    ]
+    # The most frequent issue represents its cluster
+    assert cluster_issues(issues) == [[1, 0], [2]]
+
+
+def test_threshold():
+    issues = [
+        _issue('1', "'user_id' missing in request 1234"),
+        _issue('2', "'user_id' missing in request 1234 from cache"),
+    ]
+    signatures = [minhash(issue_features(issue)) for issue in issues]
+    assert 0.6 < similarity(*signatures) < DEFAULT_THRESHOLD
+
+    assert cluster_issues(issues) == [[0], [1]]
+    assert cluster_issues(issues, threshold=0.6) == [[0, 1]]
+    assert cluster_signatures(signatures, threshold=1.0) == [[0], [1]]
+
+
+def test_identical_issues_cluster_at_any_threshold():
+    issues = [_issue('1', "boom"), _issue('2', "boom")]
+    assert cluster_issues(issues, threshold=1.0) == [[0, 1]]
+
+
+def test_same_message_from_different_code_stays_apart():
+    issues = [
+        _issue('1', "'user_id' missing in request 1234"),
+        _issue('2', "'user_id' missing in request 1234", error_type='ValueError', filename='app/api.py',
+               function='create'),
+    ]
+    assert cluster_issues(issues) == [[0], [1]]
+
+
+def test_issues_without_features_stay_apart():
+    issues = [_issue('1', ''), _issue('2', '')]
+    for issue in issues:
+        issue['metadata'] = {}
+    assert issue_features(issues[0]) == {'id:1'}
+    assert cluster_issues(issues, threshold=0.0) == [[0], [1]]
+
+
+def test_repeated_ids_are_exported_once(tmp_path, capsys):
+    frames = [{'filename': 'app/views.py', 'function': 'handle', 'lineNo': 10, 'inApp': True}]
+    for issue_id in ('1', '2'):
+        save_archive_record(tmp_path, make_issue(issue_id, "boom", count=str(issue_id)),
+                            make_event(issue_id, "boom", frames=frames))
+    output = tmp_path / "out.txt"
+    export_issues_from_archive(str(tmp_path), ['1', '1', '2'], str(output), cluster_threshold=0.8, progress=None)
+
+    text = output.read_text()
+    assert text.count("Issue ID: ") == 1 and "Issue ID: 2\n" in text
+    # Issue 1 is listed once, as similar to issue 2, never to itself
+    assert text.count("  - 1: ") == 1 and "  - 2: " not in text
+    printed = capsys.readouterr().out
+    assert printed.count("Folded 1 similar issue(s)") == 1
+    assert "Success: 2\n" in printed
@@ -0,0 +1,51 @@
+from export_sentry_issue.facets import TagFacets, format_facets
+from export_sentry_issue.scrub import REPLACEMENT, Scrubber
+
+
+def _tags(releases, users=()):
+    return [
+        {'key': 'release', 'totalValues': sum(count for _, count in releases),
+         'topValues': [{'value': value, 'count': count} for value, count in releases]},
+        {'key': 'user', 'totalValues': sum(count for _, count in users),
+         'topValues': [{'value': value, 'count': count} for value, count in users]},
+    ]
+
+
+def test_release_distribution_survives_scrubbing():
+    facets = TagFacets()
+    facets.add('1', _tags([('app@1.2.3', 60), ('app@1.2.2', 20)]))
+    facets.add('2', _tags([('app@1.2.3', 15), ('my-service@2024.01.15', 5)]))
+
+    assert facets.top('release') == [
+        ('app@1.2.3', 75, 0.75, 2),
+        ('app@1.2.2', 20, 0.2, 1),
+        ('my-service@2024.01.15', 5, 0.05, 1),
+    ]
+    summary = format_facets(facets, scrubber=Scrubber())
+    assert "release: app@1.2.3 75% [2], app@1.2.2 20% [1], my-service@2024.01.15 5% [1]" in summary
+
+
+def test_values_are_counted_raw_and_scrubbed_when_formatted():
+    facets = TagFacets()
+    facets.add('1', _tags([('app@1.0', 4)], users=[('email:bob@example.com', 3), ('email:amy@example.com', 1)]))
+
+    # Redacted values are not folded into one bucket
+    assert len(facets.values['user']) == 2
+    summary = format_facets(facets, scrubber=Scrubber())
+    assert "bob@example.com" not in summary
+    assert f"user: email:{REPLACEMENT} 75% [1], email:{REPLACEMENT} 25% [1]" in summary
+    assert "bob@example.com" in format_facets(facets)
+
+
+def test_merge_and_missing():
+    first, second = TagFacets(), TagFacets()
+    first.add('1', _tags([('a', 2)]))
+    second.add('2', _tags([('b', 2)]))
+    second.add('3', None)
+    first.merge(second)
+
+    assert first.issue_count == 2
+    assert first.missing == ['3']
+    # Ties are ordered by value, whatever the merge order
+    assert [value for value, *_ in first.top('release')] == ['a', 'b']
+    assert "(tags unavailable for 1 issue(s): 3)" in format_facets(first)
@@ -0,0 +1,82 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from export_sentry_issue import core
+
+EVENT = b'{"eventID": "latest"}'
+WORKERS = 2
+
+
+class Session:
+    """Answer the latest event after delay seconds, recording the URLs requested"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        if url.endswith("/events/latest/"):
+            time.sleep(self.delay)
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = EVENT if url.endswith("/events/latest/") else b'[{"eventID": "listed"}]'
+        return response
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=WORKERS)
+    monkeypatch.setattr(core, "_fetch_executor", executor)
+    yield executor
+    executor.shutdown()
+
+
+def _lists(session):
+    return [url for url in session.urls if not url.endswith("/events/latest/")]
+
+
+def test_no_hedge_while_queued_behind_other_fetches(executor):
+    release = threading.Event()
+    for _ in range(WORKERS):
+        executor.submit(release.wait)
+    threading.Timer(0.3, release.set).start()
+
+    session = Session()
+    event = core.fetch_latest_event("http://sentry.test/api/0", "t", "1", session, hedge_delay=0.05)
+    assert event == {"eventID": "latest"}
+    assert _lists(session) == []
+
+
+def test_hedges_a_slow_latest_event(executor):
+    session = Session(delay=0.3)
+    core.fetch_latest_event("http://sentry.test/api/0", "t", "1", session, hedge_delay=0.05)
+    assert len(_lists(session)) == 1
+
+
+def test_without_fallback_only_the_latest_event_is_requested():
+    session = Session(delay=0.1)
+    event = core.fetch_latest_event("http://sentry.test/api/0", "t", "1", session, hedge_delay=0.01, fallback=False)
+    assert event == {"eventID": "latest"}
+    assert _lists(session) == []
+
+
+def test_deadline_reached_while_queued(executor):
+    release = threading.Event()
+    for _ in range(WORKERS):
+        executor.submit(release.wait)
+    try:
+        session = Session()
+        start = time.monotonic()
+        with pytest.raises(core.DeadlineExceeded):
+            core.fetch_latest_event("http://sentry.test/api/0", "t", "1", session, deadline=start + 0.1)
+        assert time.monotonic() - start < 1
+    finally:
+        release.set()
+    executor.shutdown()
+    assert session.urls == []
@@ -0,0 +1,72 @@
+import threading
+import time
+
+from export_sentry_issue.core import _iter_records
+from export_sentry_issue.pipeline import DeadlineExceeded, Pipeline, Progress, Stage
+
+from conftest import make_issue
+
+
+def _slow_on(slow, release):
+    def fn(item):
+        if item in slow:
+            release.wait(5)
+        return item.upper()
+    return fn
+
+
+def test_results_in_input_order():
+    stages = [Stage("fetch", lambda item: (time.sleep(0.01 * (5 - int(item))), item)[1], workers=4),
+              Stage("render", lambda item: f"<{item}>")]
+    results = list(Pipeline(stages).run([str(i) for i in range(5)]))
+    assert results == [(str(i), f"<{i}>", None) for i in range(5)]
+
+
+def test_failed_items_skip_later_stages():
+    def fetch(item):
+        if item == "b":
+            raise ValueError("missing")
+        return item
+
+    rendered = []
+    stages = [Stage("fetch", fetch), Stage("render", lambda item: rendered.append(item) or item)]
+    results = list(Pipeline(stages).run(["a", "b", "c"]))
+    assert [(item, type(error)) for item, _, error in results] == [("a", type(None)), ("b", ValueError), ("c", type(None))]
+    assert rendered == ["a", "c"]
+
+
+def test_deadline_yields_finished_items_and_leaves_the_rest_unfinished():
+    release = threading.Event()
+    progress = Progress()
+    pipeline = Pipeline([Stage("fetch", _slow_on({"c"}, release), workers=2)], progress=progress)
+    start = time.monotonic()
+    try:
+        results = list(pipeline.run(["a", "b", "c", "d", "e"], deadline=start + 0.3))
+    finally:
+        release.set()
+
+    assert time.monotonic() - start < 2
+    assert [(item, value) for item, value, error in results[:2]] == [("a", "A"), ("b", "B")]
+    assert results[2][:2] == ("c", None) and isinstance(results[2][2], DeadlineExceeded)
+    # Items done after the slow one are still yielded, in input order
+    assert [item for item, _, _ in results] == ["a", "b", "c", "d", "e"]
+    assert all(error is None or isinstance(error, DeadlineExceeded) for _, _, error in results)
+    assert progress.done == sum(error is None for _, _, error in results)
+
+
+def test_deadline_marks_issues_unfinished():
+    release = threading.Event()
+    slow = _slow_on({"3"}, release)
+
+    def load(issue_id):
+        slow(issue_id)
+        return make_issue(issue_id), None
+
+    try:
+        results = list(_iter_records(["1", "2", "3", "4"], load, deadline=time.monotonic() + 0.3,
+                                     workers={"fetch": 1}))
+    finally:
+        release.set()
+    assert [(result.issue_id, result.status) for result in results] == [
+        ("1", "exported"), ("2", "exported"), ("3", "unfinished"), ("4", "unfinished")]
+    assert all(isinstance(result.error, DeadlineExceeded) for result in results[2:])
@@ -0,0 +1,68 @@
+import pytest
+
+from export_sentry_issue.routing import normalize_host, parse_issue_urls, profile_location, route_issue_urls
+
+
+@pytest.mark.parametrize("host, expected", [
+    ("sentry.io", "sentry.io"),
+    ("acme.sentry.io", "sentry.io"),
+    ("us.sentry.io", "sentry.io"),
+    ("DE.Sentry.IO", "sentry.io"),
+    ("sentry.example.com", "sentry.example.com"),
+    ("notsentry.io", "notsentry.io"),
+])
+def test_saas_subdomains_fold_into_sentry_io(host, expected):
+    assert normalize_host(host) == expected
+
+
+def test_parse_issue_urls_in_order():
+    text = (
+        "see https://acme.sentry.io/issues/3/ and "
+        "https://de.sentry.io/organizations/acme/issues/1/, "
+        "https://sentry.example.com/organizations/eng/issues/2/"
+    )
+    assert parse_issue_urls(text) == [
+        ("sentry.io", "acme", "3"),
+        ("sentry.io", "acme", "1"),
+        ("sentry.example.com", "eng", "2"),
+    ]
+
+
+def test_profile_location():
+    assert profile_location("https://us.sentry.io/api/0/projects/acme/web/issues/") == ("sentry.io", "acme")
+    assert profile_location("https://sentry.example.com/api/0/organizations/eng/") == ("sentry.example.com", "eng")
+    assert profile_location("https://sentry.example.com") == ("sentry.example.com", None)
+    assert profile_location(None) == (None, None)
+
+
+def test_route_by_host_and_org():
+    profiles = {
+        "acme": {"base_url": "https://us.sentry.io/api/0/projects/acme/web/issues/"},
+        "globex": {"base_url": "https://sentry.io/api/0/projects/globex/api/issues/"},
+        "corp": {"base_url": "https://sentry.example.com/api/0/projects/eng/api/issues/"},
+        "broken": {"base_url": None},
+    }
+    urls = [
+        ("sentry.io", "globex", "1"),
+        ("sentry.io", "acme", "2"),
+        # No profile for this org: any profile on the host serves it
+        ("sentry.io", "initech", "3"),
+        ("sentry.example.com", "ops", "4"),
+        ("sentry.other.com", "eng", "5"),
+    ]
+    routed, unrouted = route_issue_urls(urls, profiles)
+    assert routed == {"globex": [0], "acme": [1, 2], "corp": [3]}
+    assert unrouted == [4]
+    # Some URLs matched, so the default profile does not take the rest
+    assert route_issue_urls(urls, {**profiles, "default": profiles["corp"]}, "default")[1] == [4]
+
+
+def test_unmatched_urls_fall_back_to_the_default_profile():
+    default = {"default": {"base_url": "https://sentry.example.com/api/0/projects/eng/api/issues/"}}
+    urls = [("sentry.other.com", "eng", "1"), ("sentry.example.com", "ops", "2"), ("sentry.io", "acme", "3")]
+    # The only profile serves every URL
+    assert route_issue_urls(urls, default, "default") == ({"default": [0, 1, 2]}, [])
+
+    profiles = {**default, "corp": {"base_url": "https://sentry.corp.com/api/0/projects/eng/api/issues/"}}
+    assert route_issue_urls(urls[::2], profiles, "default") == ({"default": [0, 1]}, [])
+    assert route_issue_urls(urls[::2], profiles) == ({}, [0, 1])
@@ -0,0 +1,42 @@
+from export_sentry_issue.scrub import REPLACEMENT, Scrubber
+from export_sentry_issue.search import SearchIndex
+
+from conftest import make_event, make_issue
+
+ISSUE = make_issue(
+    '1', 'bad password=hunter2 for bob@example.com', 'AuthError', title='Login failed for bob@example.com', count='3',
+)
+EVENT = make_event(
+    '1', 'token=s3cr3t rejected', 'AuthError', frames=[{'filename': 'app/auth.py', 'function': 'login'}],
+    tags=[{'key': 'release', 'value': 'app@1.2.3'}, {'key': 'session', 'value': 'abc123'}],
+)
+EVENT['entries'].append({'type': 'breadcrumbs', 'data': {'values': [
+    {'category': 'auth', 'message': 'login attempt by bob@example.com'},
+]}})
+
+
+def _index(tmp_path, scrubber):
+    index = SearchIndex(tmp_path / "index.sqlite3", scrubber)
+    index.add_issue(ISSUE, EVENT, "issues.txt")
+    return index
+
+
+def test_scrubbed_index_does_not_return_secrets(tmp_path):
+    with _index(tmp_path, Scrubber()) as index:
+        assert index.search("bob@example.com") == []
+        assert index.search("hunter2") == []
+        assert index.search("s3cr3t") == []
+        assert index.search("abc123") == []
+        results = index.search("login")
+        assert [result['issue_id'] for result in results] == ['1']
+        assert results[0]['title'] == f'Login failed for {REPLACEMENT}'
+        for result in index.search("rejected") + index.search("attempt"):
+            assert "bob@" not in result['snippet'] and "s3cr3t" not in result['snippet']
+        # Releases and frames stay searchable
+        assert index.search("app@1.2.3")
+        assert index.search("auth.py")
+
+
+def test_index_without_scrubber_keeps_raw_text(tmp_path):
+    with _index(tmp_path, None) as index:
+        assert [result['issue_id'] for result in index.search("hunter2")] == ['1']
@@ -0,0 +1,75 @@
+import hashlib
+import json
+
+import pytest
+
+from export_sentry_issue import core, shards
+from export_sentry_issue.core import export_issues_from_archive
+from export_sentry_issue.shards import MANIFEST_FILE, issue_file_path
+
+IDS = ['1', '2', '3']
+
+
+def _export(archive, output_dir, ids, resume=False):
+    export_issues_from_archive(str(archive), ids, output_dir=str(output_dir), resume=resume, progress=None)
+    return json.loads((output_dir / MANIFEST_FILE).read_text())
+
+
+def test_one_file_per_issue_with_manifest(archive, tmp_path):
+    output_dir = tmp_path / "out"
+    manifest = _export(archive, output_dir, IDS + ['99'])
+
+    assert [entry['id'] for entry in manifest['issues']] == IDS
+    for entry in manifest['issues']:
+        data = issue_file_path(output_dir, entry['id']).read_bytes()
+        assert f"bad input {entry['id']}".encode() in data
+        assert entry['file'] == f"issue_{entry['id']}.txt"
+        assert (entry['bytes'], entry['sha256']) == (len(data), hashlib.sha256(data).hexdigest())
+    assert [failure['id'] for failure in manifest['failed']] == ['99']
+    assert manifest['unfinished'] == []
+    assert not list(output_dir.glob("*.tmp"))
+
+
+def test_resume_keeps_existing_files(archive, tmp_path):
+    output_dir = tmp_path / "out"
+    _export(archive, output_dir, IDS[:2])
+    first = issue_file_path(output_dir, '1')
+    first.write_text("kept\n")
+
+    manifest = _export(archive, output_dir, IDS, resume=True)
+    assert first.read_text() == "kept\n"
+    assert [entry['id'] for entry in manifest['issues']] == IDS
+    assert manifest['issues'][0]['sha256'] == hashlib.sha256(b"kept\n").hexdigest()
+
+
+def test_repeated_ids_are_written_once(archive, tmp_path):
+    output_dir = tmp_path / "out"
+    manifest = _export(archive, output_dir, ['1', '2', '1'])
+    assert [entry['id'] for entry in manifest['issues']] == ['1', '2']
+    assert manifest['failed'] == []
+
+
+def test_failed_writes_are_listed_in_the_manifest(archive, tmp_path, monkeypatch):
+    def write_issue_file(path, text):
+        if path.name == "issue_2.txt":
+            raise OSError("disk full")
+        return shards.write_issue_file(path, text)
+
+    monkeypatch.setattr(core, "write_issue_file", write_issue_file)
+    output_dir = tmp_path / "out"
+    manifest = _export(archive, output_dir, IDS)
+    assert [entry['id'] for entry in manifest['issues']] == ['1', '3']
+    assert manifest['failed'] == [{'id': '2', 'error': "Error processing Issue 2: disk full"}]
+
+
+def test_interrupted_export_still_writes_the_manifest(archive, tmp_path):
+    def interrupt(tracker, issue_id):
+        if issue_id == '2':
+            raise KeyboardInterrupt
+
+    output_dir = tmp_path / "out"
+    with pytest.raises(KeyboardInterrupt):
+        export_issues_from_archive(str(archive), IDS, output_dir=str(output_dir), progress=interrupt)
+    manifest = json.loads((output_dir / MANIFEST_FILE).read_text())
+    assert [entry['id'] for entry in manifest['issues']] == ['1']
+    assert manifest['unfinished'] == ['2', '3']
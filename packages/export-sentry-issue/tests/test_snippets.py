@@ -0,0 +1,37 @@
+from export_sentry_issue.models import Frame
+from export_sentry_issue.snippets import SnippetStore, get_snippet_store
+
+
+def _frame(code, lineno=10, filename='app/views.py', in_app=True):
+    return Frame(filename, 'handle', lineno, in_app, None, [[lineno, line] for line in code])
+
+
+def test_repeated_snippets_refer_back_to_the_first():
+    store = SnippetStore()
+    label, first = store.add(_frame(["x = 1"]))
+    assert first and len(label) == 16
+    assert store.add(_frame(["x = 1"])) == (label, False)
+    # Same place, different code: a new snippet
+    other, first = store.add(_frame(["x = 2"]))
+    assert first and other != label
+
+
+def test_labels_do_not_depend_on_the_store():
+    frame = _frame(["def handle(request):", "    return view(request)"])
+    assert SnippetStore().add(frame) == SnippetStore().add(frame)
+
+
+def test_in_app_only_leaves_out_library_frames():
+    store = get_snippet_store("in-app")
+    assert store.add(_frame(["x = 1"], in_app=False)) == (None, False)
+    assert store.add(_frame(["x = 1"]))[1]
+    assert get_snippet_store("all") is None
+
+
+def test_forget_drops_later_snippets():
+    store = SnippetStore()
+    label, _ = store.add(_frame(["x = 1"]))
+    store.add(_frame(["x = 2"]))
+    store.forget(1)
+    assert store.add(_frame(["x = 1"])) == (label, False)
+    assert store.add(_frame(["x = 2"]))[1]
@@ -0,0 +1,65 @@
+import pytest
+
+from export_sentry_issue import trends
+from export_sentry_issue.trends import compute_trends, rank_trends
+
+from conftest import make_issue
+
+
+def _issue(issue_id, hourly=None, daily=None):
+    issue = make_issue(issue_id)
+    if hourly is not None:
+        issue['stats'] = {
+            '24h': [[1760832000 + 3600 * i, count] for i, count in enumerate(hourly)],
+            '30d': [[1758240000 + 86400 * i, count] for i, count in enumerate(daily or [])],
+        }
+    return issue
+
+
+ISSUES = [
+    # Steady: 2 events an hour, the same last week as this week
+    _issue('1', [2] * 24, [14] * 30),
+    # Spike: quiet, then 40 events in the last hour; new this week
+    _issue('2', [1] * 23 + [40], [0] * 23 + [5] * 7),
+    # Busy but flat, and down by half on last week
+    _issue('3', [5] * 24, [0] * 16 + [20] * 7 + [10] * 7),
+    # No stats buckets
+    _issue('4'),
+]
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(trends, "np", None)
+    return request.param
+
+
+def test_rollups(backend):
+    steady, spike, busy, empty = compute_trends(ISSUES)
+
+    assert (steady.events_24h, steady.rate, steady.spike, steady.change) == (48, 2.0, False, 0.0)
+    assert (spike.events_24h, spike.last_hour, spike.spike) == (63, 40, True)
+    assert spike.spike_score == pytest.approx(39.0)
+    assert (spike.this_week, spike.last_week, spike.change) == (35, 0, None)
+    assert (busy.this_week, busy.last_week, busy.change) == (70, 140, -0.5)
+    assert not empty.has_stats and empty.events_24h == 0 and not empty.spike
+
+
+def test_short_stats_are_padded():
+    trend, = compute_trends([_issue('1', [3, 3], [7])])
+    assert (trend.events_24h, trend.last_hour, trend.this_week, trend.last_week) == (6, 3, 7, 0)
+
+
+def test_spikes_rank_first():
+    ranked = rank_trends(compute_trends(ISSUES))
+    assert [trend.issue_id for trend in ranked] == ['2', '3', '1', '4']
+
+
+def test_a_quiet_issue_needs_enough_events_to_spike():
+    # Far above a flat baseline, but only 3 events
+    trend, = compute_trends([_issue('1', [0] * 23 + [3], [0] * 30)])
+    assert trend.spike_score >= trends.SPIKE_THRESHOLD
+    assert not trend.spike
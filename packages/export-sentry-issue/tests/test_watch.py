@@ -0,0 +1,125 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from export_sentry_issue import watch
+from export_sentry_issue.watch import IssueWatcher, RollingOutput, next_interval
+
+from conftest import make_issue
+
+START = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+def _issue(issue_id, last_seen, first_seen='2026-10-01T00:00:00Z', **fields):
+    return make_issue(issue_id, firstSeen=first_seen, lastSeen=last_seen, **fields)
+
+
+class FakeIssuesList:
+    """Serves pages of the issues list, answering 304 while the ETag matches"""
+
+    def __init__(self, monkeypatch):
+        self.pages = []
+        self.version = 0
+        self.calls = []
+        monkeypatch.setattr(watch, "get_project_issues", self)
+
+    def publish(self, *pages):
+        self.pages = list(pages)
+        self.version += 1
+
+    def __call__(self, base_url, token, cursor, query, etag, session):
+        self.calls.append((cursor, etag))
+        etag_now = f'"v{self.version}"'
+        if etag == etag_now:
+            return None, None, etag_now
+        page = int(cursor or 0)
+        next_cursor = str(page + 1) if page + 1 < len(self.pages) else None
+        return self.pages[page], next_cursor, etag_now
+
+
+@pytest.fixture
+def issues_list(monkeypatch):
+    return FakeIssuesList(monkeypatch)
+
+
+def _reported(changed):
+    return [(issue['id'], reason) for issue, reason in changed]
+
+
+def test_unchanged_list_is_answered_by_etag(issues_list):
+    watcher = IssueWatcher("https://sentry.example.com", "t", since=START)
+    issues_list.publish([_issue('1', '2026-10-19T01:00:00Z', first_seen='2026-10-19T01:00:00Z')])
+
+    assert _reported(watcher.poll()) == [('1', "New issue")]
+    assert issues_list.calls[-1] == (None, None)
+    assert watcher.poll() == []
+    assert issues_list.calls[-1] == (None, '"v1"')
+    assert (watcher.requests, watcher.unchanged) == (2, 1)
+
+
+def test_poll_stops_at_issues_seen_before(issues_list):
+    watcher = IssueWatcher("https://sentry.example.com", "t", since=START)
+    issues_list.publish(
+        [_issue('1', '2026-10-19T03:00:00Z'), _issue('2', '2026-10-19T02:00:00Z')],
+        [_issue('3', '2026-10-18T23:00:00Z')],
+        [_issue('4', '2026-10-18T22:00:00Z')],
+    )
+    watcher.poll()
+    # The second page reaches an issue last seen before the high water mark
+    assert [cursor for cursor, _ in issues_list.calls] == [None, '1']
+    assert watcher.high_water == datetime(2026, 10, 19, 3, tzinfo=timezone.utc)
+
+
+def test_poll_reads_at_most_max_pages(issues_list, monkeypatch):
+    monkeypatch.setattr(watch, "MAX_PAGES", 2)
+    watcher = IssueWatcher("https://sentry.example.com", "t", since=START)
+    issues_list.publish(*[[_issue(str(i), f'2026-10-19T0{9 - i}:00:00Z')] for i in range(5)])
+    watcher.poll()
+    assert len(issues_list.calls) == 2
+
+
+def test_regression_is_reported_once(issues_list):
+    watcher = IssueWatcher("https://sentry.example.com", "t", since=START)
+    issues_list.publish([_issue('1', '2026-10-19T01:00:00Z', status='resolved')])
+    assert watcher.poll() == []
+
+    # Still marked regressed while more events arrive
+    for hour in (2, 3, 4):
+        issues_list.publish([_issue('1', f'2026-10-19T0{hour}:00:00Z', substatus='regressed')])
+        changed = _reported(watcher.poll())
+        assert changed == ([('1', "Regression")] if hour == 2 else [])
+
+    # Resolved and regressed again: reported again
+    issues_list.publish([_issue('1', '2026-10-19T05:00:00Z', status='resolved')])
+    watcher.poll()
+    issues_list.publish([_issue('1', '2026-10-19T06:00:00Z', substatus='regressed')])
+    assert _reported(watcher.poll()) == [('1', "Regression")]
+
+
+def test_next_interval_backs_off_until_a_change():
+    assert next_interval(15, changed=False) == 22.5
+    assert next_interval(250, changed=False) == watch.MAX_INTERVAL
+    assert next_interval(300, changed=True) == watch.MIN_INTERVAL
+    assert next_interval(10, changed=False, minimum=5, maximum=12) == 12
+
+
+def test_rolling_output_rotates_backups(tmp_path):
+    path = tmp_path / "watch.txt"
+    output = RollingOutput(str(path), max_bytes=10, backups=2)
+    for text in ("first\n", "second\n", "third\n", "fourth\n"):
+        output.write(text)
+
+    assert path.read_text() == "fourth\n"
+    assert (tmp_path / "watch.txt.1").read_text() == "third\n"
+    assert (tmp_path / "watch.txt.2").read_text() == "second\n"
+    assert not (tmp_path / "watch.txt.3").exists()
+
+
+def test_rolling_output_without_backups_starts_over(tmp_path):
+    path = tmp_path / "watch.txt"
+    output = RollingOutput(str(path), max_bytes=8, backups=0)
+    output.write("abc\n")
+    output.write("def\n")
+    output.write("ghi\n")
+    assert path.read_text() == "ghi\n"
+    assert list(tmp_path.iterdir()) == [path]